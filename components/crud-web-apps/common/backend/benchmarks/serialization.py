@@ -0,0 +1,119 @@
+"""
+Benchmark of the per-object cost of api.serialize and api.deserialize.
+
+Compares creating a new ApiClient for every call, which the backend used to
+do, with the shared serializer of crud_backend.api.utils, for lists of Pods
+and Events.
+
+Usage:
+    python benchmarks/serialization.py [--objects 1000] [--repeat 5]
+"""
+import argparse
+import datetime
+import timeit
+
+from kubernetes import client
+
+from kubeflow.kubeflow.crud_backend.api import utils
+
+NOW = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def make_pod(i):
+    return client.V1Pod(
+        api_version="v1",
+        kind="Pod",
+        metadata=client.V1ObjectMeta(
+            name="notebook-%d-0" % i,
+            namespace="kubeflow-user",
+            uid="uid-%d" % i,
+            labels={"notebook-name": "notebook-%d" % i,
+                    "statefulset": "notebook-%d" % i},
+            creation_timestamp=NOW,
+        ),
+        spec=client.V1PodSpec(containers=[
+            client.V1Container(
+                name="notebook-%d" % i,
+                image="kubeflownotebookswg/jupyter-scipy:v1.8.0",
+                ports=[client.V1ContainerPort(container_port=8888,
+                                              name="notebook-port")],
+                resources=client.V1ResourceRequirements(
+                    requests={"cpu": "500m", "memory": "1Gi"},
+                ),
+                volume_mounts=[client.V1VolumeMount(
+                    name="workspace", mount_path="/home/jovyan",
+                )],
+            ),
+        ]),
+        status=client.V1PodStatus(
+            phase="Running",
+            pod_ip="10.0.0.%d" % (i % 255),
+            start_time=NOW,
+            conditions=[client.V1PodCondition(
+                type="Ready", status="True", last_transition_time=NOW,
+            )],
+        ),
+    )
+
+
+def make_event(i):
+    return client.CoreV1Event(
+        metadata=client.V1ObjectMeta(name="event-%d" % i,
+                                     namespace="kubeflow-user"),
+        involved_object=client.V1ObjectReference(
+            kind="Notebook", name="notebook-%d" % i,
+        ),
+        reason="Created",
+        message="Created Pod notebook-%d-0" % i,
+        type="Normal",
+        count=1,
+        first_timestamp=NOW,
+        last_timestamp=NOW,
+    )
+
+
+def new_client_serialize(obj):
+    return client.ApiClient().sanitize_for_serialization(obj)
+
+
+def new_client_deserialize(json_obj, klass):
+    return client.ApiClient()._ApiClient__deserialize(json_obj, klass)
+
+
+def measure(func, objects, repeat):
+    """Return the best per-object time, in microseconds."""
+    total = min(timeit.repeat(lambda: [func(obj) for obj in objects],
+                              number=1, repeat=repeat))
+    return total / len(objects) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--objects", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    datasets = [
+        ("V1Pod", [make_pod(i) for i in range(args.objects)]),
+        ("CoreV1Event", [make_event(i) for i in range(args.objects)]),
+    ]
+
+    header = ("kind", "operation", "new client", "shared")
+    print("%-12s %-12s %14s %14s" % header)
+    for klass, objects in datasets:
+        before = measure(new_client_serialize, objects, args.repeat)
+        after = measure(utils.serialize, objects, args.repeat)
+        print("%-12s %-12s %11.1f us %11.1f us"
+              % (klass, "serialize", before, after))
+
+        json_objects = [utils.serialize(obj) for obj in objects]
+        before = measure(lambda obj: new_client_deserialize(obj, klass),
+                         json_objects, args.repeat)
+        after = measure(lambda obj: utils.deserialize(obj, klass),
+                        json_objects, args.repeat)
+        print("%-12s %-12s %11.1f us %11.1f us"
+              % (klass, "deserialize", before, after))
+
+
+if __name__ == "__main__":
+    main()
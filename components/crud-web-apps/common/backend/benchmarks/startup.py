@@ -0,0 +1,52 @@
+"""
+Benchmark of the boot of a worker, the import of the backend and its apps.
+
+Each run imports the given module in a new interpreter, as a gunicorn worker
+does, and reports the time of the import and the maximum RSS of the process.
+The import needs no cluster, the kube config is loaded on the first call to
+the API Server.
+
+Usage:
+    python benchmarks/startup.py [--module kubeflow.kubeflow.crud_backend]
+                                 [--repeat 5]
+"""
+import argparse
+import subprocess
+import sys
+
+SCRIPT = """
+import resource
+import time
+
+start = time.perf_counter()
+import %s  # noqa
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(elapsed, rss)
+"""
+
+
+def measure(module):
+    """Return the import time, in seconds, and the maximum RSS, in KiB."""
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT % module], check=True,
+        capture_output=True, text=True,
+    ).stdout.split()
+    return float(output[0]), int(output[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--module", default="kubeflow.kubeflow.crud_backend")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.repeat)]
+    print("%-40s %10s %10s" % ("module", "import", "max rss"))
+    print("%-40s %7.0f ms %7.1f MB"
+          % (args.module, min(t for t, _ in runs) * 1e3,
+             min(rss for _, rss in runs) / 1024))
+
+
+if __name__ == "__main__":
+    main()
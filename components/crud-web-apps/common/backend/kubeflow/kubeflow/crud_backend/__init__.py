@@ -2,10 +2,13 @@ import logging
 
 from flask import Flask
 
+from . import concurrency
 from .authn import bp as authn_bp
 from .config import BackendMode
 from .csrf import bp as csrf_bp
+from .deadlines import bp as deadlines_bp
 from .errors import bp as errors_bp
+from .json_provider import JSONProvider
 from .metrics import enable_metrics
 from .probes import bp as probes_bp
 from .routes import bp as base_routes_bp
@@ -14,21 +17,31 @@ from .serving import bp as serving_bp
 LOG_FORMAT = "%(asctime)s | %(name)s | %(levelname)s | %(message)s"
 
 
-def create_app(name, static_folder, config):
+def create_app(name, static_folder, config, json_provider=JSONProvider):
+    """
+    json_provider: The class of the app's JSON provider, which encodes the
+                   responses of the api.success_response
+    """
     logging.basicConfig(format=LOG_FORMAT, level=config.LOG_LEVEL)
     log = logging.getLogger(__name__)
 
     app = Flask(name, static_folder=static_folder)
     app.config.from_object(config)
+    app.json = json_provider(app)
+    app.json.compact = not config.JSONIFY_PRETTYPRINT_REGULAR
 
     if (config.ENV == BackendMode.DEVELOPMENT.value
             or config.ENV == BackendMode.DEVELOPMENT_FULL.value):  # noqa: W503
         log.warn("RUNNING IN DEVELOPMENT MODE")
 
+    if concurrency.is_cooperative():
+        log.info("Running with the gevent monkey patches")
+
     # Register all the blueprints
     app.register_blueprint(authn_bp)
     app.register_blueprint(errors_bp)
     app.register_blueprint(csrf_bp)
+    app.register_blueprint(deadlines_bp)
     app.register_blueprint(probes_bp)
     app.register_blueprint(serving_bp)
     app.register_blueprint(base_routes_bp)
@@ -0,0 +1,112 @@
+"""
+Lists of the objects of several namespaces.
+
+When a user selects `All namespaces` in the dashboard, the apps can request
+the objects of all the namespaces at once, instead of one request per
+namespace. The `namespaces` parameter of the aggregated endpoints is a comma
+separated list of namespaces. If it is missing, the objects of all the
+namespaces in which the user can list them are returned.
+
+The lists of the namespaces are processed concurrently, each with the usual
+api functions and authorization checks, and are merged in a single list,
+which can be filtered, sorted and paged like the list of one namespace. The
+authorization of the user to list the resource in each namespace is checked
+in the same concurrent call, and the namespaces in which the user can't list
+it are left out. The namespaces whose list failed are returned in the
+`errors` field of the response instead of failing the whole request.
+"""
+import logging
+
+from flask import request
+from kubernetes.client.rest import ApiException
+from werkzeug.exceptions import BadRequest, HTTPException
+
+from . import api, authn, authz, concurrency, snapshots
+from .errors import utils as error_utils
+
+log = logging.getLogger(__name__)
+
+NAMESPACES_PARAM = "namespaces"
+ALL_NAMESPACES = "*"
+
+
+def get_namespaces():
+    """
+    Return the namespaces of the request. Without the `namespaces` parameter,
+    these are all the namespaces of the cluster.
+    """
+    param = request.args.get(NAMESPACES_PARAM, ALL_NAMESPACES)
+    if param == ALL_NAMESPACES:
+        return api.list_namespace_names()
+
+    namespaces = sorted({ns for ns in param.split(",") if ns})
+    if not namespaces:
+        raise BadRequest("Invalid '%s' parameter" % NAMESPACES_PARAM)
+
+    return namespaces
+
+
+def list_namespaces(namespaces, list_items, resource):
+    """
+    Call list_items(namespace) for each namespace in which the user can list
+    the resource, concurrently, in the context of the current request. Return
+    these namespaces, their merged items and a dict with the error of each
+    namespace that failed.
+    """
+    group, version, plural = resource
+    user = authn.get_username()
+
+    def list_namespace(namespace):
+        if not authz.is_authorized(user, "list", group, version, plural,
+                                   namespace):
+            return None
+
+        try:
+            return list_items(namespace), None
+        except HTTPException as e:
+            return [], {"status": e.code, "log": e.description}
+        except ApiException as e:
+            log.error("Couldn't list the objects of namespace %s: %s",
+                      namespace, e)
+            return [], {"status": e.status,
+                        "log": error_utils.parse_error_message(e)}
+
+    results = concurrency.gather(*[
+        lambda namespace=namespace: list_namespace(namespace)
+        for namespace in namespaces
+    ])
+
+    authorized = []
+    items = []
+    errors = {}
+    for namespace, result in zip(namespaces, results):
+        if result is None:
+            continue
+
+        namespace_items, error = result
+        authorized.append(namespace)
+        items.extend(namespace_items)
+        if error is not None:
+            errors[namespace] = error
+
+    return authorized, items, errors
+
+
+def list_response(data_field, resource, list_items, key_func):
+    """
+    Return the response of an aggregated list endpoint.
+
+    resource: The (group, version, resource) of the listed objects, for the
+              authorization of the user in each namespace
+    list_items: Returns the processed items of a namespace, as the list
+                endpoint of the namespace
+    key_func: Returns the unique key of an item in its namespace
+    """
+    namespaces, items, errors = list_namespaces(get_namespaces(), list_items,
+                                                resource)
+
+    return snapshots.list_response(
+        data_field, items, (data_field, NAMESPACES_PARAM) + tuple(namespaces),
+        lambda item: "%s/%s" % (item["namespace"], key_func(item)),
+        namespaces=namespaces, errors=errors,
+    )
@@ -0,0 +1,92 @@
+"""Tests for the lists of several namespaces."""
+
+import unittest
+from unittest import mock
+
+from flask import Flask
+from kubernetes.client.rest import ApiException
+from werkzeug.exceptions import BadRequest, Forbidden
+
+from . import aggregation, snapshots
+
+RESOURCE = ("kubeflow.org", "v1beta1", "notebooks")
+
+
+def _list_items(namespace):
+    if namespace == "forbidden":
+        raise Forbidden("Not allowed")
+    if namespace == "broken":
+        error = ApiException(status=500, reason="Internal Server Error")
+        error.body = '{"message": "etcdserver: request timed out"}'
+        raise error
+
+    return [{"name": "nb", "namespace": namespace}]
+
+
+@mock.patch.object(aggregation.authz, "is_authorized",
+                   lambda user, verb, group, version, resource, ns:
+                   ns != "other")
+@mock.patch.object(aggregation.api, "list_namespace_names",
+                   lambda: ["team-a", "other", "team-b"])
+class AggregationTest(unittest.TestCase):
+
+    def setUp(self):
+        snapshots.history = snapshots.SnapshotHistory(maxsize=8, versions=4)
+        self.app = Flask(__name__)
+
+    def _get(self, query_string=None):
+        with self.app.test_request_context("/", query_string=query_string):
+            return aggregation.list_response(
+                "notebooks", RESOURCE, _list_items, lambda nb: nb["name"]
+            ).get_json()
+
+    def test_all_accessible_namespaces(self):
+        resp = self._get()
+
+        self.assertEqual(resp["namespaces"], ["team-a", "team-b"])
+        self.assertEqual([nb["namespace"] for nb in resp["notebooks"]],
+                         ["team-a", "team-b"])
+        self.assertEqual(resp["errors"], {})
+
+    def test_failed_namespaces_are_reported(self):
+        resp = self._get({"namespaces": "team-b,forbidden,broken,other"})
+
+        self.assertEqual(resp["namespaces"], ["broken", "forbidden",
+                                              "team-b"])
+        self.assertEqual(resp["notebooks"],
+                         [{"name": "nb", "namespace": "team-b"}])
+        self.assertEqual(resp["errors"]["forbidden"]["status"], 403)
+        self.assertEqual(resp["errors"]["broken"],
+                         {"status": 500,
+                          "log": "etcdserver: request timed out"})
+
+    def test_denied_namespaces_are_not_listed(self):
+        list_items = mock.Mock(side_effect=_list_items)
+        with self.app.test_request_context("/"):
+            namespaces, _, _ = aggregation.list_namespaces(
+                ["team-a", "other"], list_items, RESOURCE
+            )
+
+        self.assertEqual(namespaces, ["team-a"])
+        list_items.assert_called_once_with("team-a")
+
+    def test_merged_list_is_sorted_and_paged(self):
+        resp = self._get({"sort": "-name", "limit": "1"})
+
+        self.assertEqual(len(resp["notebooks"]), 1)
+        self.assertIsNotNone(resp["continue"])
+
+    def test_items_are_keyed_by_namespace(self):
+        first = self._get({"since": ""})
+        delta = self._get({"since": first["version"]})
+
+        self.assertEqual(len(first["notebooks"]), 2)
+        self.assertEqual(delta["notebooks"], [])
+
+    def test_empty_namespaces_parameter(self):
+        with self.assertRaises(BadRequest):
+            self._get({"namespaces": ","})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,9 @@
-from kubernetes import client, config
-from kubernetes.config import ConfigException
+from kubernetes import client
 
-try:
-    config.load_incluster_config()
-except ConfigException:
-    config.load_kube_config()
+from .. import clients
 
-# Create the Apis
-v1_core = client.CoreV1Api()
-app_api = client.AppsV1Api()
-custom_api = client.CustomObjectsApi()
-storage_api = client.StorageV1Api()
+# The Apis, which are created on their first call
+v1_core = clients.LazyApi(client.CoreV1Api)
+app_api = clients.LazyApi(client.AppsV1Api)
+custom_api = clients.LazyApi(client.CustomObjectsApi)
+storage_api = clients.LazyApi(client.StorageV1Api)
@@ -1,13 +1,15 @@
-from .. import authz
+from .. import authz, cache, memo
 from . import custom_api
 
 
+@memo.invalidates_request_cache
 def create_custom_rsrc(group, version, kind, data, namespace):
     authz.ensure_authorized("create", group, version, kind, namespace)
     return custom_api.create_namespaced_custom_object(group, version,
                                                       namespace, kind, data)
 
 
+@memo.invalidates_request_cache
 def delete_custom_rsrc(group, version, kind, name, namespace,
                        policy="Foreground"):
     authz.ensure_authorized("delete", group, version, kind, namespace)
@@ -16,12 +18,14 @@ def delete_custom_rsrc(group, version, kind, name, namespace,
     )
 
 
+@memo.request_cached
 def list_custom_rsrc(group, version, kind, namespace):
     authz.ensure_authorized("list", group, version, kind, namespace)
-    return custom_api.list_namespaced_custom_object(group, version, namespace,
-                                                    kind)
+    return cache.list_objects(custom_api.list_namespaced_custom_object,
+                              group, version, namespace, kind)
 
 
+@memo.request_cached
 def get_custom_rsrc(group, version, kind, namespace, name):
     authz.ensure_authorized("get", group, version, kind, namespace)
 
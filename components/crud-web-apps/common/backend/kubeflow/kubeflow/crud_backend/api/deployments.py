@@ -1,7 +1,10 @@
-from .. import authz
-from . import app_api
+import functools
 
+from .. import authz, cache, memo
+from . import app_api, utils
 
+
+@memo.invalidates_request_cache
 def create_deployment(body, namespace, dry_run=False):
     authz.ensure_authorized(
         "create", "kubeflow.org", "v1beta1", "notebooks", namespace
@@ -10,6 +13,7 @@ def create_deployment(body, namespace, dry_run=False):
     return app_api.create_namespaced_deployment(namespace=namespace, body=body)
 
 
+@memo.invalidates_request_cache
 def delete_deployment(name, namespace):
     authz.ensure_authorized(
         "delete", "kubeflow.org", "v1beta1", "notebooks", namespace
@@ -18,14 +22,31 @@ def delete_deployment(name, namespace):
     return app_api.delete_namespaced_deployment(name=name, namespace=namespace)
 
 
+@memo.request_cached
+def get_deployment(name, namespace):
+    """
+    Return the Deployment from the cache, or a ModelView of it read in raw
+    mode.
+    """
+    authz.ensure_authorized(
+        "get", "kubeflow.org", "v1beta1", "notebooks", namespace
+    )
+    read_func = functools.partial(utils.read_view, "V1Deployment",
+                                  app_api.read_namespaced_deployment)
+    return cache.get_object(read_func, app_api.list_namespaced_deployment,
+                            name, namespace)
+
+
+@memo.request_cached
 def list_deployments(namespace):
     authz.ensure_authorized(
         "list", "kubeflow.org", "v1beta1", "notebooks", namespace
     )
 
-    return app_api.list_namespaced_deployment(namespace=namespace)
+    return cache.list_objects(app_api.list_namespaced_deployment, namespace)
 
 
+@memo.invalidates_request_cache
 def patch_deployment(name, namespace, body):
     authz.ensure_authorized(
         "patch", "kubeflow.org", "v1beta1", "notebooks", namespace
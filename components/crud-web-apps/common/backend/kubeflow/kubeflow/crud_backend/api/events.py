@@ -1,12 +1,50 @@
-from .. import authz
-from . import v1_core
+from .. import authz, cache, memo, settings, singleflight
+from . import utils, v1_core
 
 
-def list_events(namespace, field_selector):
-    authz.ensure_authorized(
-        "list", "", "v1", "events", namespace
-    )
+@memo.request_cached
+def list_events(namespace, field_selector, raw=False, limit=None,
+                continue_token=None, auth=True):
+    """
+    raw: Return the decoded JSON of the response, instead of a
+         CoreV1EventList
+    limit: The maximum number of events of the response
+    continue_token: The continue token of the previous page
+    """
+    if auth:
+        authz.ensure_authorized(
+            "list", "", "v1", "events", namespace
+        )
 
-    return v1_core.list_namespaced_event(
-        namespace=namespace, field_selector=field_selector
-    )
+    key = ("list_namespaced_event", namespace, field_selector, raw, limit,
+           continue_token)
+    return singleflight.do(key, _list_events, namespace, field_selector, raw,
+                           utils.page_kwargs(limit, continue_token))
+
+
+def _list_events(namespace, field_selector, raw, kwargs):
+    if raw:
+        return utils.read_raw(v1_core.list_namespaced_event,
+                              namespace=namespace,
+                              field_selector=field_selector, **kwargs)
+
+    return cache.strip_list(v1_core.list_namespaced_event(
+        namespace=namespace, field_selector=field_selector, **kwargs
+    ))
+
+
+def iter_events(namespace, field_selector):
+    """
+    Yield the raw events one page at a time, so that all the events are not
+    held in memory at once.
+    """
+    continue_token = None
+    while True:
+        page = list_events(namespace, field_selector, raw=True,
+                           limit=settings.LIST_PAGE_SIZE or None,
+                           continue_token=continue_token)
+        yield from page.get("items") or []
+
+        continue_token = (page.get("metadata") or {}).get("continue")
+        if not continue_token:
+            return
@@ -1,7 +1,17 @@
-from .. import authz
+from .. import authz, cache, memo
 from . import v1_core
 
 
+@memo.request_cached
 @authz.needs_authorization("list", "core", "v1", "namespaces")
 def list_namespaces():
     return v1_core.list_namespace()
+
+
+# NOTE: This function is only used from the backend, to find the namespaces
+# in which a user can list the objects of an app. The user may not be allowed
+# to list the namespaces, so it does not check the authorization of the user.
+@memo.request_cached
+def list_namespace_names():
+    namespaces = cache.list_objects(v1_core.list_namespace)
+    return [ns.metadata.name for ns in namespaces.items]
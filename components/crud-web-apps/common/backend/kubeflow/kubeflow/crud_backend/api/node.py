@@ -1,9 +1,12 @@
+from .. import memo
 from . import v1_core
 
 
+@memo.request_cached
 def list_nodes():
     return v1_core.list_node()
 
 
+@memo.request_cached
 def get_node(node_name):
     return v1_core.read_node(node_name)
@@ -1,7 +1,8 @@
-from .. import authz
+from .. import authz, cache, memo
 from . import custom_api, events, utils
 
 
+@memo.request_cached
 def get_notebook(notebook, namespace):
     authz.ensure_authorized(
         "get", "kubeflow.org", "v1beta1", "notebooks", namespace
@@ -11,6 +12,7 @@ def get_notebook(notebook, namespace):
     )
 
 
+@memo.invalidates_request_cache
 def create_notebook(notebook, namespace, dry_run=False):
     authz.ensure_authorized(
         "create", "kubeflow.org", "v1beta1", "notebooks", namespace
@@ -21,15 +23,18 @@ def create_notebook(notebook, namespace, dry_run=False):
         dry_run="All" if dry_run else None)
 
 
+@memo.request_cached
 def list_notebooks(namespace):
     authz.ensure_authorized(
         "list", "kubeflow.org", "v1beta1", "notebooks", namespace
     )
-    return custom_api.list_namespaced_custom_object(
+    return cache.list_objects(
+        custom_api.list_namespaced_custom_object,
         "kubeflow.org", "v1beta1", namespace, "notebooks"
     )
 
 
+@memo.invalidates_request_cache
 def delete_notebook(notebook, namespace):
     authz.ensure_authorized(
         "delete", "kubeflow.org", "v1beta1", "notebooks", namespace
@@ -44,6 +49,7 @@ def delete_notebook(notebook, namespace):
     )
 
 
+@memo.invalidates_request_cache
 def patch_notebook(notebook, namespace, body):
     authz.ensure_authorized(
         "patch", "kubeflow.org", "v1beta1", "notebooks", namespace
@@ -54,8 +60,24 @@ def patch_notebook(notebook, namespace, body):
     )
 
 
-def list_notebook_events(notebook, namespace):
+def list_notebook_events(notebook, namespace, raw=False, limit=None,
+                         continue_token=None):
 
     field_selector = utils.events_field_selector("Notebook", notebook)
 
-    return events.list_events(namespace, field_selector)
+    return events.list_events(namespace, field_selector, raw=raw,
+                              limit=limit, continue_token=continue_token)
+
+
+def list_notebooks_events(namespace, raw=False):
+    """Return the events of all the Notebooks in the namespace."""
+    field_selector = utils.events_field_selector("Notebook")
+
+    return events.list_events(namespace, field_selector, raw=raw)
+
+
+def iter_notebooks_events(namespace):
+    """Yield the raw events of all the Notebooks, one page at a time."""
+    field_selector = utils.events_field_selector("Notebook")
+
+    return events.iter_events(namespace, field_selector)
@@ -1,17 +1,17 @@
 from kubernetes import client
 from kubernetes.stream import stream
 
-from .. import authz
+from .. import authz, cache, memo
 from . import v1_core
 
 
+@memo.request_cached
 def list_pods(namespace, auth=True, label_selector=None):
     if auth:
         authz.ensure_authorized("list", "", "v1", "pods", namespace)
 
-    return v1_core.list_namespaced_pod(
-        namespace=namespace,
-        label_selector=label_selector)
+    return cache.list_objects(v1_core.list_namespaced_pod, namespace,
+                              label_selector=label_selector)
 
 
 def get_pod_logs(namespace, pod, container, auth=True):
@@ -23,6 +23,7 @@ def get_pod_logs(namespace, pod, container, auth=True):
     )
 
 
+@memo.invalidates_request_cache
 def exec_pod_command(namespace, pod, container, command, auth=True):
     if auth:
         authz.ensure_authorized("create", "", "v1", "pods/exec", namespace)
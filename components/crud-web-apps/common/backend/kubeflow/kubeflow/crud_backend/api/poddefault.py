@@ -1,9 +1,11 @@
-from .. import authz
+from .. import authz, cache, memo
 from . import custom_api
 
 
+@memo.request_cached
 def list_poddefaults(namespace):
     authz.ensure_authorized("list", "kubeflow.org", "v1alpha1", "poddefaults",
                             namespace)
-    return custom_api.list_namespaced_custom_object("kubeflow.org", "v1alpha1",
-                                                    namespace, "poddefaults")
+    return cache.list_objects(custom_api.list_namespaced_custom_object,
+                              "kubeflow.org", "v1alpha1", namespace,
+                              "poddefaults")
@@ -1,7 +1,8 @@
-from .. import authz
+from .. import authz, cache, memo
 from . import v1_core, utils, events
 
 
+@memo.invalidates_request_cache
 def create_pvc(pvc, namespace, dry_run=False):
     authz.ensure_authorized(
         "create", "", "v1", "persistentvolumeclaims", namespace
@@ -11,6 +12,7 @@ def create_pvc(pvc, namespace, dry_run=False):
         namespace, pvc, dry_run="All" if dry_run else None)
 
 
+@memo.invalidates_request_cache
 def delete_pvc(pvc, namespace):
     authz.ensure_authorized(
         "delete", "", "v1", "persistentvolumeclaims", namespace
@@ -18,28 +20,40 @@ def delete_pvc(pvc, namespace):
     return v1_core.delete_namespaced_persistent_volume_claim(pvc, namespace)
 
 
+@memo.request_cached
 def list_pvcs(namespace):
     authz.ensure_authorized(
         "list", "", "v1", "persistentvolumeclaims", namespace
     )
-    return v1_core.list_namespaced_persistent_volume_claim(namespace)
+    return cache.list_objects(
+        v1_core.list_namespaced_persistent_volume_claim, namespace
+    )
 
 
-def get_pvc(pvc, namespace):
+@memo.request_cached
+def get_pvc(pvc, namespace, raw=False):
     authz.ensure_authorized(
         "get", "", "v1", "persistentvolumeclaims", namespace
     )
+    if raw:
+        return utils.read_raw(v1_core.read_namespaced_persistent_volume_claim,
+                              pvc, namespace)
+
     return v1_core.read_namespaced_persistent_volume_claim(pvc, namespace)
 
 
-def list_pvc_events(namespace, pvc_name):
+def list_pvc_events(namespace, pvc_name, raw=False, limit=None,
+                    continue_token=None, auth=True):
 
     field_selector = utils.events_field_selector(
         "PersistentVolumeClaim", pvc_name)
 
-    return events.list_events(namespace, field_selector)
+    return events.list_events(namespace, field_selector, raw=raw,
+                              limit=limit, continue_token=continue_token,
+                              auth=auth)
 
 
+@memo.invalidates_request_cache
 def patch_pvc(name, namespace, pvc, auth=True):
     if auth:
         authz.ensure_authorized("patch", "", "v1", "persistentvolumeclaims",
@@ -1,7 +1,8 @@
-from .. import authz
+from .. import authz, memo
 from . import v1_core
 
 
+@memo.request_cached
 def get_secret(namespace, name, auth=True):
     if auth:
         authz.ensure_authorized("get", "", "v1", "secrets", namespace)
@@ -9,6 +10,7 @@ def get_secret(namespace, name, auth=True):
     return v1_core.read_namespaced_secret(name, namespace)
 
 
+@memo.invalidates_request_cache
 def create_secret(namespace, secret, auth=True):
     if auth:
         authz.ensure_authorized("create", "", "v1", "secrets", namespace)
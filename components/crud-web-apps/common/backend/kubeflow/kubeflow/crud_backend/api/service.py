@@ -1,7 +1,8 @@
-from .. import authz
+from .. import authz, cache, memo
 from . import v1_core
 
 
+@memo.request_cached
 def get_service(namespace, service_name, auth=True):
     if auth:
         authz.ensure_authorized("get", "", "v1", "services", namespace)
@@ -9,6 +10,7 @@ def get_service(namespace, service_name, auth=True):
     return v1_core.read_namespaced_service(name=service_name, namespace=namespace)
 
 
+@memo.invalidates_request_cache
 def create_service(namespace, body, auth=True):
     if auth:
         authz.ensure_authorized("create", "", "v1", "services", namespace)
@@ -16,13 +18,15 @@ def create_service(namespace, body, auth=True):
     return v1_core.create_namespaced_service(namespace=namespace, body=body)
 
 
+@memo.request_cached
 def list_services(namespace, auth=True):
     if auth:
         authz.ensure_authorized("list", "", "v1", "services", namespace)
 
-    return v1_core.list_namespaced_service(namespace=namespace)
+    return cache.list_objects(v1_core.list_namespaced_service, namespace)
 
 
+@memo.invalidates_request_cache
 def patch_service(namespace, service_name, body, auth=True):
     if auth:
         authz.ensure_authorized("patch", "", "v1", "services", namespace)
@@ -34,6 +38,7 @@ def patch_service(namespace, service_name, body, auth=True):
     )
 
 
+@memo.invalidates_request_cache
 def delete_service(namespace, service_name, auth=True):
     if auth:
         authz.ensure_authorized("delete", "", "v1", "services", namespace)
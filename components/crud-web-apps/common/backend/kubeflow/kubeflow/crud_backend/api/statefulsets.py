@@ -1,7 +1,10 @@
-from .. import authz
-from . import app_api
+import functools
 
+from .. import authz, cache, memo
+from . import app_api, utils
 
+
+@memo.invalidates_request_cache
 def create_statefulset(body, namespace):
     authz.ensure_authorized(
         "create", "kubeflow.org", "v1beta1", "notebooks", namespace
@@ -11,6 +14,7 @@ def create_statefulset(body, namespace):
     )
 
 
+@memo.invalidates_request_cache
 def delete_statefulset(name, namespace):
     authz.ensure_authorized(
         "delete", "kubeflow.org", "v1beta1", "notebooks", namespace
@@ -20,13 +24,31 @@ def delete_statefulset(name, namespace):
     )
 
 
+@memo.request_cached
+def get_statefulset(name, namespace):
+    """
+    Return the StatefulSet from the cache, or a ModelView of it read in raw
+    mode.
+    """
+    authz.ensure_authorized(
+        "get", "kubeflow.org", "v1beta1", "notebooks", namespace
+    )
+    read_func = functools.partial(utils.read_view, "V1StatefulSet",
+                                  app_api.read_namespaced_stateful_set)
+    return cache.get_object(read_func, app_api.list_namespaced_stateful_set,
+                            name, namespace)
+
+
+@memo.request_cached
 def list_statefulsets(namespace):
     authz.ensure_authorized(
         "list", "kubeflow.org", "v1beta1", "notebooks", namespace
     )
-    return app_api.list_namespaced_stateful_set(namespace=namespace)
+    return cache.list_objects(app_api.list_namespaced_stateful_set,
+                              namespace)
 
 
+@memo.invalidates_request_cache
 def patch_statefulset(name, namespace, body):
     authz.ensure_authorized(
         "patch", "kubeflow.org", "v1beta1", "notebooks", namespace
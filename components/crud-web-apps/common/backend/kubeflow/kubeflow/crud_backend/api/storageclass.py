@@ -1,3 +1,4 @@
+from .. import memo
 from . import storage_api
 
 
@@ -7,5 +8,6 @@ from . import storage_api
 # does not use a ClusterRoleBinding, thus we can't currently give this
 # permission to a user. The backend does not expose any endpoint that would
 # allow an unauthorized user to list the storage classes using this function.
+@memo.request_cached
 def list_storageclasses():
     return storage_api.list_storage_class()
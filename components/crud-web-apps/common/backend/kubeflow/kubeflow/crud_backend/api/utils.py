@@ -1,17 +1,82 @@
-from flask import jsonify
+import datetime
+import hashlib
+import json
+import threading
+
+from dateutil import parser as date_parser
+from flask import current_app, jsonify, request
 from kubernetes import client
 
-from .. import authn
+from .. import authn, cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The types of the openapi_types of the models that are not models
+NATIVE_TYPES = ["str", "int", "long", "float", "bool", "object", "date",
+                "datetime"]
 
 
-def success_response(data_field=None, data=None):
+def success_response(data_field=None, data=None, etag=None, **fields):
+    """
+    etag: A strong ETag that identifies the data, i.e. from
+          resource_versions_etag. If it is not set, the ETag of a GET
+          response is the hash of its content.
+    fields: Additional top level fields of the response
+    """
     user = authn.get_username()
     resp = {"status": 200, "success": True, "user": user}
+    resp.update(fields)
     if data_field is None and data is None:
-        return jsonify(resp)
+        return conditional_response(resp, etag)
 
     resp[data_field] = data
-    return jsonify(resp)
+    return conditional_response(resp, etag)
+
+
+def conditional_response(resp, etag=None):
+    """
+    Return the JSON response with an ETag, or 304 Not Modified if the ETag
+    matches the If-None-Match header of a GET request. The clients have to
+    revalidate the response each time they use it.
+    """
+    if request.method not in ["GET", "HEAD"]:
+        return jsonify(resp)
+
+    if etag is not None and request.if_none_match.contains(etag):
+        # Don't encode a response that the client already has
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(resp)
+        if etag is None:
+            etag = content_hash(response.get_data())
+
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    response.cache_control.private = True
+    return response.make_conditional(request)
+
+
+def content_hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def resource_versions_etag(*collections):
+    """
+    Return an ETag for a response which is computed only from the given K8s
+    list responses, based on their resourceVersions, or None if a list has
+    no resourceVersion.
+    """
+    parts = [authn.get_username() or ""]
+    for collection in collections:
+        resource_version = cache.get_resource_version(collection)
+        if resource_version is None:
+            return None
+        parts.append(resource_version)
+
+    return content_hash("\0".join(parts).encode())
 
 
 def failed_response(msg, error_code):
@@ -26,10 +91,85 @@ def failed_response(msg, error_code):
     return resp, error_code
 
 
-def events_field_selector(kind, name):
+def events_field_selector(kind, name=None):
+    if name is None:
+        return "involvedObject.kind=%s" % kind
+
     return "involvedObject.kind=%s,involvedObject.name=%s" % (kind, name)
 
 
+class Serializer(object):
+    """
+    Converts between K8s library objects and JSON objects, reusing a single
+    ApiClient instead of creating a new one, with its Configuration and
+    connection pool, for every conversion. It never connects to the API
+    Server, so it doesn't need the kube config of the clients.
+    """
+
+    # Values that are already valid JSON and need no conversion
+    JSON_SCALARS = (str, int, float, bool, type(None))
+
+    def __init__(self):
+        self._api_client = None
+        self._lock = threading.Lock()
+
+    @property
+    def api_client(self):
+        if self._api_client is None:
+            with self._lock:
+                if self._api_client is None:
+                    self._api_client = client.ApiClient()
+
+        return self._api_client
+
+    def deserialize(self, json_obj, klass):
+        return self.api_client._ApiClient__deserialize(json_obj, klass)
+
+    def serialize(self, obj):
+        """
+        Same output as ApiClient.sanitize_for_serialization, with shortcuts
+        for the plain values of dicts and lists.
+        """
+        if isinstance(obj, self.JSON_SCALARS) or isinstance(obj, bytes):
+            return obj
+
+        if isinstance(obj, dict):
+            return {key: val if type(val) in self.JSON_SCALARS
+                    else self.serialize(val)
+                    for key, val in obj.items()}
+
+        if isinstance(obj, list):
+            return [val if type(val) in self.JSON_SCALARS
+                    else self.serialize(val)
+                    for val in obj]
+
+        if isinstance(obj, tuple):
+            return tuple(self.serialize(val) for val in obj)
+
+        if isinstance(obj, (datetime.datetime, datetime.date)):
+            return obj.isoformat()
+
+        if isinstance(obj, ModelView):
+            return self.serialize(obj._json_obj)
+
+        # OpenAPI model, keep only the attributes that are set
+        attribute_map = obj.attribute_map
+        result = {}
+        for attr in obj.openapi_types:
+            val = getattr(obj, attr)
+            if val is None:
+                continue
+            result[attribute_map[attr]] = (
+                val if type(val) in self.JSON_SCALARS
+                else self.serialize(val)
+            )
+
+        return result
+
+
+serializer = Serializer()
+
+
 def deserialize(json_obj, klass):
     """Convert a JSON object to a lib class object.
 
@@ -37,7 +177,7 @@ def deserialize(json_obj, klass):
     klass: The string name of the class i.e. V1Pod, V1Volume etc
     """
     try:
-        return client.ApiClient()._ApiClient__deserialize(json_obj, klass)
+        return serializer.deserialize(json_obj, klass)
     except ValueError as e:
         raise ValueError("Failed to deserialize input into '%s': %s"
                          % (klass, str(e)))
@@ -45,4 +185,129 @@ def deserialize(json_obj, klass):
 
 def serialize(obj):
     """Convert a K8s library object to JSON."""
-    return client.ApiClient().sanitize_for_serialization(obj)
+    return serializer.serialize(obj)
+
+
+def page_kwargs(limit=None, continue_token=None):
+    """Return the pagination arguments of a K8s client list function."""
+    kwargs = {}
+    if limit:
+        kwargs["limit"] = limit
+    if continue_token:
+        kwargs["_continue"] = continue_token
+
+    return kwargs
+
+
+def load_json(data):
+    """Decode the JSON bytes of an API Server response."""
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def read_raw(func, *args, **kwargs):
+    """
+    Call a K8s client function and return the decoded JSON of the response,
+    without constructing the typed objects of the library.
+
+    func: The K8s client function, i.e. CoreV1Api.list_namespaced_event
+    """
+    resp = func(*args, _preload_content=False, **kwargs)
+    try:
+        obj = load_json(resp.data)
+    finally:
+        resp.release_conn()
+
+    if isinstance(obj.get("items"), list):
+        return cache.strip_list(obj)
+
+    return cache.strip_object(obj)
+
+
+class ModelView(object):
+    """
+    Read-only view of the JSON of a K8s object, with the attributes of the
+    typed object, i.e. pod.metadata.creation_timestamp. Code written for the
+    typed objects can use views of the raw responses, while only the fields
+    that are accessed are converted.
+
+    json_obj: The JSON object of the K8s object
+    klass: The string name of the class i.e. V1Pod, V1Volume etc
+    """
+
+    __slots__ = ["_json_obj", "_model"]
+
+    def __init__(self, json_obj, klass):
+        self._json_obj = json_obj
+        self._model = getattr(client.models, klass)
+
+    def __getattr__(self, attr):
+        model = object.__getattribute__(self, "_model")
+        if attr not in model.openapi_types:
+            raise AttributeError("'%s' has no attribute '%s'"
+                                 % (model.__name__, attr))
+
+        json_obj = object.__getattribute__(self, "_json_obj")
+        return _view_value(json_obj.get(model.attribute_map[attr]),
+                           model.openapi_types[attr])
+
+    def __repr__(self):
+        return "%s(%r)" % (self._model.__name__, self._json_obj)
+
+    def to_dict(self):
+        """Same output as the to_dict of the typed object."""
+        return {attr: _to_dict(getattr(self, attr))
+                for attr in self._model.openapi_types}
+
+
+def _view_value(value, klass):
+    if value is None:
+        return None
+
+    if klass.startswith("list["):
+        item_klass = klass[len("list["):-1]
+        return [_view_value(item, item_klass) for item in value]
+
+    if klass.startswith("dict("):
+        value_klass = klass[klass.index(",") + 1:-1].strip()
+        return {key: _view_value(item, value_klass)
+                for key, item in value.items()}
+
+    if klass == "datetime":
+        return date_parser.parse(value)
+
+    if klass == "date":
+        return date_parser.parse(value).date()
+
+    if klass in NATIVE_TYPES:
+        return value
+
+    return ModelView(value, klass)
+
+
+def _to_dict(value):
+    if isinstance(value, list):
+        return [_to_dict(item) for item in value]
+
+    if isinstance(value, dict):
+        return {key: _to_dict(item) for key, item in value.items()}
+
+    if isinstance(value, ModelView):
+        return value.to_dict()
+
+    return value
+
+
+def view(json_obj, klass):
+    """Return a ModelView of the JSON object, or None."""
+    if json_obj is None:
+        return None
+
+    return ModelView(json_obj, klass)
+
+
+def read_view(klass, func, *args, **kwargs):
+    """Read an object in raw mode and return a ModelView of it."""
+    return view(read_raw(func, *args, **kwargs), klass)
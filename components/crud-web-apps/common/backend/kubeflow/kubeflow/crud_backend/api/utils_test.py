@@ -0,0 +1,148 @@
+"""Tests for the shared serializer."""
+
+import datetime
+import unittest
+from unittest import mock
+
+from flask import Flask
+from kubernetes import client
+
+from . import utils
+
+
+def _pod():
+    return client.V1Pod(
+        api_version="v1",
+        kind="Pod",
+        metadata=client.V1ObjectMeta(
+            name="nb-0",
+            namespace="team-a",
+            labels={"notebook-name": "nb"},
+            creation_timestamp=datetime.datetime(
+                2024, 1, 1, tzinfo=datetime.timezone.utc),
+        ),
+        spec=client.V1PodSpec(containers=[
+            client.V1Container(
+                name="nb",
+                image="jupyter",
+                ports=[client.V1ContainerPort(container_port=8888)],
+            ),
+        ]),
+        status=client.V1PodStatus(phase="Running", pod_ip="10.0.0.1"),
+    )
+
+
+class SerializerTest(unittest.TestCase):
+
+    def test_serialize_matches_the_api_client(self):
+        pod = _pod()
+
+        self.assertEqual(
+            utils.serialize([pod, {"pod": pod}, ("a", 1)]),
+            client.ApiClient().sanitize_for_serialization(
+                [pod, {"pod": pod}, ("a", 1)]
+            ),
+        )
+
+    def test_plain_dicts_are_copied(self):
+        obj = {"metadata": {"name": "nb"}, "items": [1, "a", None]}
+
+        result = utils.serialize(obj)
+
+        self.assertEqual(result, obj)
+        self.assertIsNot(result["metadata"], obj["metadata"])
+
+    def test_deserialize_round_trip(self):
+        pod = utils.deserialize(utils.serialize(_pod()), "V1Pod")
+
+        self.assertEqual(pod, _pod())
+
+    def test_the_api_client_is_reused(self):
+        utils.deserialize({"name": "a"}, "V1ObjectMeta")
+        api_client = utils.serializer.api_client
+        utils.deserialize({"name": "b"}, "V1ObjectMeta")
+
+        self.assertIs(utils.serializer.api_client, api_client)
+
+
+class RawModeTest(unittest.TestCase):
+
+    def test_read_raw_decodes_the_response(self):
+        resp = mock.Mock(data=b'{"items": [{"metadata": {"name": "a"}}]}')
+        list_func = mock.Mock(return_value=resp)
+
+        result = utils.read_raw(list_func, "team-a", field_selector="x")
+
+        list_func.assert_called_once_with("team-a", field_selector="x",
+                                          _preload_content=False)
+        self.assertEqual(result["items"][0]["metadata"]["name"], "a")
+        resp.release_conn.assert_called_once()
+
+    def test_view_has_the_attributes_of_the_typed_object(self):
+        pod_json = utils.serialize(_pod())
+
+        pod = utils.view(pod_json, "V1Pod")
+
+        self.assertEqual(pod.status.pod_ip, "10.0.0.1")
+        self.assertEqual(pod.spec.containers[0].ports[0].container_port,
+                         8888)
+        self.assertEqual(pod.metadata.creation_timestamp,
+                         _pod().metadata.creation_timestamp)
+        self.assertIsNone(pod.metadata.deletion_timestamp)
+        self.assertEqual(pod.metadata.to_dict(), _pod().metadata.to_dict())
+        self.assertEqual(utils.serialize(pod), pod_json)
+        with self.assertRaises(AttributeError):
+            pod.missing
+
+
+class ConditionalResponseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+
+    def test_get_response_has_a_content_etag(self):
+        with self.app.test_request_context("/api/config"):
+            resp = utils.success_response("config", {"a": 1})
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertIsNotNone(resp.get_etag()[0])
+        self.assertFalse(resp.get_etag()[1])
+        self.assertTrue(resp.cache_control.no_cache)
+
+    def test_matching_etag_returns_not_modified(self):
+        with self.app.test_request_context("/api/config"):
+            etag = utils.success_response("config", {"a": 1}).get_etag()[0]
+
+        headers = {"If-None-Match": '"%s"' % etag}
+        with self.app.test_request_context("/api/config", headers=headers):
+            resp = utils.success_response("config", {"a": 1})
+            changed = utils.success_response("config", {"a": 2})
+
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(changed.status_code, 200)
+
+    def test_resource_versions_etag_skips_the_encoding(self):
+        pods = client.V1PodList(
+            metadata=client.V1ListMeta(resource_version="10"), items=[],
+        )
+        with self.app.test_request_context("/"):
+            etag = utils.resource_versions_etag(pods, {"metadata": {
+                "resourceVersion": "20"}})
+
+        headers = {"If-None-Match": '"%s"' % etag}
+        with self.app.test_request_context("/", headers=headers), \
+                mock.patch.object(utils, "jsonify") as jsonify:
+            resp = utils.success_response("pods", [], etag=etag)
+
+        self.assertEqual(resp.status_code, 304)
+        jsonify.assert_not_called()
+
+    def test_other_methods_have_no_etag(self):
+        with self.app.test_request_context("/", method="POST"):
+            resp = utils.success_response()
+
+        self.assertIsNone(resp.get_etag()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,25 +1,33 @@
 import functools
 import logging
+import threading
 
+from cachetools import TLRUCache
 from kubernetes import client
-from kubernetes import config as k8s_config
 from kubernetes.client.rest import ApiException
-from kubernetes.config import ConfigException
 from werkzeug.exceptions import Forbidden, Unauthorized
 
-from . import authn, config, settings
+from . import authn, clients, config, memo, metrics, settings
 
 log = logging.getLogger(__name__)
 
-try:
-    # Load configuration inside the Pod
-    k8s_config.load_incluster_config()
-except ConfigException:
-    # Load configuration for testing
-    k8s_config.load_kube_config()
-
 # The API object for submitting SubjecAccessReviews
-authz_api = client.AuthorizationV1Api()
+authz_api = clients.LazyApi(client.AuthorizationV1Api)
+
+
+def _decision_ttu(key, allowed, now):
+    if allowed:
+        return now + settings.AUTHZ_CACHE_ALLOW_TTL
+
+    return now + settings.AUTHZ_CACHE_DENY_TTL
+
+
+# Cache with the latest SubjectAccessReview decisions. Positive and negative
+# decisions expire after different TTLs and the least recently used ones are
+# evicted when the cache is full.
+decisions_cache = TLRUCache(maxsize=settings.AUTHZ_CACHE_SIZE,
+                            ttu=_decision_ttu)
+decisions_lock = threading.Lock()
 
 
 def create_subject_access_review(user, verb, namespace, group, version,
@@ -65,6 +73,46 @@ def is_authorized(user, verb, group, version, resource, namespace=None,
                     " deployment.")
         raise Unauthorized(description="No user credentials were found!")
 
+    key = (user, verb, group, version, resource, subresource, namespace)
+    return memo.get_or_call("authz", key, get_decision, user, verb, group,
+                            version, resource, namespace, subresource)
+
+
+def get_decision(user, verb, group, version, resource, namespace=None,
+                 subresource=None):
+    """
+    Return the decision of a SubjectAccessReview, either from the decisions
+    cache or by submitting a new one.
+    """
+    if not settings.AUTHZ_CACHE_ENABLED:
+        return bool(submit_subject_access_review(user, verb, group, version,
+                                                 resource, namespace,
+                                                 subresource))
+
+    key = (user, verb, group, version, resource, subresource, namespace)
+    with decisions_lock:
+        allowed = decisions_cache.get(key)
+
+    if allowed is not None:
+        metrics.AUTHZ_CACHE_REQUESTS.labels(result="hit").inc()
+        return allowed
+
+    metrics.AUTHZ_CACHE_REQUESTS.labels(result="miss").inc()
+    allowed = submit_subject_access_review(user, verb, group, version,
+                                           resource, namespace, subresource)
+    if allowed is not None:
+        with decisions_lock:
+            decisions_cache[key] = allowed
+
+    return bool(allowed)
+
+
+def submit_subject_access_review(user, verb, group, version, resource,
+                                 namespace=None, subresource=None):
+    """
+    Submit a SubjectAccessReview to the K8s API and return its decision, or
+    None if the response didn't have a status.
+    """
     sar = create_subject_access_review(user, verb, namespace, group, version,
                                        resource, subresource)
     try:
@@ -77,7 +125,7 @@ def is_authorized(user, verb, group, version, resource, namespace=None,
         return obj.status.allowed
     else:
         log.error("SubjectAccessReview doesn't have status.")
-        return False
+        return None
 
 
 def generate_unauthorized_message(user, verb, group, version, resource,
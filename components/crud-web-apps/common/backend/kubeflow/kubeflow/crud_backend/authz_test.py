@@ -0,0 +1,60 @@
+"""Tests for the SubjectAccessReview decisions cache."""
+
+import unittest
+from unittest import mock
+
+from . import authz
+
+
+@mock.patch.object(authz.config, "dev_mode_enabled",
+                   mock.Mock(return_value=False))
+@mock.patch.object(authz.settings, "DISABLE_AUTH", False)
+@mock.patch.object(authz, "submit_subject_access_review")
+class DecisionsCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        authz.decisions_cache.clear()
+
+    def test_repeated_checks_are_served_from_the_cache(self, submit):
+        submit.return_value = True
+
+        for _ in range(3):
+            self.assertTrue(authz.is_authorized(
+                "user", "list", "", "v1", "pods", namespace="team-a"))
+
+        submit.assert_called_once()
+
+    def test_decisions_are_cached_per_namespace(self, submit):
+        submit.side_effect = [True, False]
+
+        self.assertTrue(authz.is_authorized(
+            "user", "list", "", "v1", "pods", namespace="team-a"))
+        self.assertFalse(authz.is_authorized(
+            "user", "list", "", "v1", "pods", namespace="team-b"))
+        self.assertEqual(submit.call_count, 2)
+
+    def test_denials_expire_before_approvals(self, submit):
+        self.assertLess(authz._decision_ttu(None, False, 0),
+                        authz._decision_ttu(None, True, 0))
+
+    def test_reviews_without_status_are_not_cached(self, submit):
+        submit.return_value = None
+
+        self.assertFalse(authz.is_authorized(
+            "user", "get", "", "v1", "pods", namespace="team-a"))
+        self.assertFalse(authz.is_authorized(
+            "user", "get", "", "v1", "pods", namespace="team-a"))
+        self.assertEqual(submit.call_count, 2)
+
+    @mock.patch.object(authz.settings, "AUTHZ_CACHE_ENABLED", False)
+    def test_cache_can_be_disabled(self, submit):
+        submit.return_value = True
+
+        authz.is_authorized("user", "list", "", "v1", "pods", "team-a")
+        authz.is_authorized("user", "list", "", "v1", "pods", "team-a")
+
+        self.assertEqual(submit.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+"""
+Circuit breaker of the requests to the API Server.
+
+When the API Server is degraded every request of a worker waits for it, and
+times out or fails, so the workers pile up blocked requests that the users
+will retry anyway. After APP_K8S_BREAKER_THRESHOLD consecutive failures,
+i.e. 5xx or 429 responses and connection errors, the breaker opens and the
+requests fail immediately with a 503 for APP_K8S_BREAKER_COOLDOWN seconds.
+Then a single request is let through, whose success closes the breaker.
+The calls that time out because their request ran out of its deadline, see
+the deadlines module, are not failures of the API Server.
+
+The collections that are served by the cache, see the cache module, keep
+serving their last state while the breaker is open.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from kubernetes.client.rest import ApiException
+from urllib3.exceptions import HTTPError
+
+from . import deadlines, metrics, settings
+
+log = logging.getLogger(__name__)
+
+# Responses of a degraded API Server
+FAILURE_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(ApiException):
+    """The request was not sent, because the API Server is degraded."""
+
+    def __init__(self, retry_in):
+        super().__init__(status=503, reason="Service Unavailable")
+        self.body = json.dumps({
+            "message": "The API Server is unavailable, retrying in %ds"
+                       % max(retry_in, 1),
+        })
+
+
+def is_failure(error):
+    if isinstance(error, CircuitOpenError):
+        return False
+
+    if isinstance(error, ApiException):
+        return error.status in FAILURE_STATUSES
+
+    return isinstance(error, HTTPError)
+
+
+def deadline_passed():
+    left = deadlines.remaining()
+    return left is not None and left <= 0
+
+
+class Breaker(object):
+    """
+    threshold: Consecutive failures that open the breaker, 0 disables it
+    cooldown: Seconds after which an open breaker lets a request through
+    """
+
+    def __init__(self, threshold, cooldown, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+    def allow(self):
+        """
+        Return True if a request can be sent, or the seconds until the next
+        one can, if the breaker is open.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+
+            retry_in = self._opened_at + self.cooldown - self.clock()
+            if retry_in > 0 or self._trial:
+                return max(retry_in, 0)
+
+            # Half open, the result of this request closes or reopens it
+            self._trial = True
+            return True
+
+    def record(self, ok):
+        """
+        Record the result of a request, or None if the request didn't reach
+        the API Server.
+        """
+        with self._lock:
+            self._trial = False
+            if ok is None:
+                return
+
+            if ok:
+                self._failures = 0
+                if self._opened_at is not None:
+                    log.info("The API Server recovered, closing the breaker")
+                    self._opened_at = None
+                    metrics.K8S_CLIENT_BREAKER_OPEN.set(0)
+                return
+
+            self._failures += 1
+            if self._opened_at is not None or (
+                    self._failures >= self.threshold):
+                if self._opened_at is None:
+                    log.error("%s consecutive failures of the API Server, "
+                              "opening the breaker", self._failures)
+                self._opened_at = self.clock()
+                metrics.K8S_CLIENT_BREAKER_OPEN.set(1)
+
+    @contextmanager
+    def guard(self):
+        """Fail fast if the breaker is open, and record the result."""
+        allowed = self.allow()
+        if allowed is not True:
+            raise CircuitOpenError(allowed)
+
+        ok = None
+        try:
+            yield
+            ok = True
+        except Exception as e:
+            if isinstance(e, (ApiException, HTTPError)):
+                ok = not is_failure(e)
+            if isinstance(e, HTTPError) and deadline_passed():
+                # The call was cut short by the deadline of its request
+                ok = None
+            raise
+        finally:
+            self.record(ok)
+
+
+def new_breaker():
+    return Breaker(settings.K8S_BREAKER_THRESHOLD,
+                   settings.K8S_BREAKER_COOLDOWN)
+
+
+breaker = new_breaker()
+
+
+def _reset_after_fork():
+    global breaker
+
+    breaker = new_breaker()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@contextmanager
+def guard():
+    """Send a request to the API Server through the breaker of the worker."""
+    if breaker.threshold <= 0:
+        yield
+        return
+
+    with breaker.guard():
+        yield
@@ -0,0 +1,102 @@
+"""Tests for the circuit breaker of the requests to the API Server."""
+
+import unittest
+from unittest import mock
+
+from kubernetes.client.rest import ApiException
+from urllib3.exceptions import ReadTimeoutError
+
+from . import breaker
+from .errors import utils as error_utils
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class BreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.breaker = breaker.Breaker(threshold=2, cooldown=30,
+                                       clock=self.clock)
+
+    def send_failing(self, status=503):
+        with self.assertRaises(ApiException):
+            with self.breaker.guard():
+                raise ApiException(status=status)
+
+    def test_opens_after_consecutive_failures(self):
+        self.send_failing()
+        self.send_failing()
+
+        with self.assertRaises(breaker.CircuitOpenError) as cm:
+            with self.breaker.guard():
+                pass
+
+        self.assertEqual(cm.exception.status, 503)
+        self.assertIn("retrying in 30s",
+                      error_utils.parse_error_message(cm.exception))
+
+    def time_out(self):
+        with self.assertRaises(ReadTimeoutError):
+            with self.breaker.guard():
+                raise ReadTimeoutError(None, "/api", "Read timed out")
+
+    def test_timeouts_are_failures(self):
+        self.time_out()
+        self.time_out()
+
+        self.assertTrue(self.breaker.is_open)
+
+    @mock.patch.object(breaker.deadlines, "remaining", return_value=-0.01)
+    def test_timeouts_of_the_deadline_are_not_failures(self, remaining):
+        self.time_out()
+        self.time_out()
+
+        self.assertFalse(self.breaker.is_open)
+
+    def test_client_errors_are_not_failures(self):
+        self.send_failing(status=404)
+        self.send_failing(status=404)
+
+        with self.breaker.guard():
+            pass
+
+    def test_success_resets_the_failures(self):
+        self.send_failing()
+        with self.breaker.guard():
+            pass
+        self.send_failing()
+
+        self.assertFalse(self.breaker.is_open)
+
+    def test_closes_after_a_successful_trial(self):
+        self.send_failing()
+        self.send_failing()
+        self.clock.now = 31
+
+        with self.breaker.guard():
+            # Only the trial request is let through
+            self.assertIsNot(self.breaker.allow(), True)
+
+        self.assertFalse(self.breaker.is_open)
+
+    def test_reopens_after_a_failed_trial(self):
+        self.send_failing()
+        self.send_failing()
+        self.clock.now = 31
+
+        self.send_failing()
+
+        self.assertTrue(self.breaker.is_open)
+        self.assertEqual(self.breaker.allow(), 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
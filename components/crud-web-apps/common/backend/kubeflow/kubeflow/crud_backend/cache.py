@@ -0,0 +1,633 @@
+"""
+Watch-backed shared object cache.
+
+The frontends poll the list endpoints every few seconds, for every open tab.
+Instead of sending a LIST to the API Server for each of these requests, the
+backend can keep an Informer for each collection that is being read. An
+Informer performs an initial LIST, then keeps its in-memory copy up to date
+with a WATCH that resumes from the last seen resourceVersion. If the API
+Server responds with 410 Gone, because the resourceVersion is too old, the
+Informer re-lists the collection.
+
+Informers are created lazily, the first time a collection is read, and are
+stopped after they have not been read for APP_CACHE_IDLE_TIMEOUT seconds.
+Until the initial LIST of an Informer succeeds, the collection is read from
+the API Server. If the app isn't allowed to list or watch the collection,
+it is read from the API Server for APP_CACHE_FAILURE_COOLDOWN seconds before
+a new Informer is started.
+
+The cache only replaces the call to the API Server. The functions in the
+`api` module still run the authorization checks for every call, before
+reading from the cache.
+"""
+import copy
+import inspect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+from . import deadlines, settings, singleflight, throttle
+
+log = logging.getLogger(__name__)
+
+LAST_APPLIED_ANNOTATION = "kubectl.kubernetes.io/last-applied-configuration"
+
+HTTP_STATUS_NOT_FOUND = 404
+HTTP_STATUS_GONE = 410
+# Errors for which retrying the watch will not help, i.e. the ServiceAccount
+# of the app is missing the list/watch permissions
+FATAL_STATUSES = [401, 403, 404]
+RETRY_BACKOFF_SECONDS = [1, 2, 5, 10, 30]
+
+_informers = {}
+_informers_lock = threading.Lock()
+_local = threading.local()
+
+# Counters of the changes of the cached collections of each namespace, for
+# the clients that wait for changes, i.e. the event streams
+_generations = {}
+_changes = threading.Condition()
+
+
+class Informer(object):
+    """
+    Keeps an up to date copy of a collection of K8s objects.
+
+    list_func: The K8s client function for listing the collection, i.e.
+               CoreV1Api.list_namespaced_pod
+    args: The positional arguments for the list_func, i.e. the namespace
+    """
+
+    def __init__(self, list_func, *args):
+        self.list_func = list_func
+        self.args = args
+        self.name = "%s%s" % (list_func.__name__, args)
+        self.namespace = namespace_arg(list_func, args)
+
+        self._objects = {}
+        self._snapshot = None
+        self._template = None
+        self._return_type = None
+        self._resource_version = None
+
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        # Set once the initial LIST either succeeded or failed
+        self._attempted = threading.Event()
+        self._failed = False
+        self._failed_at = None
+        self._stopped = False
+        self._last_read = time.monotonic()
+        self._thread = None
+
+    @property
+    def alive(self):
+        return not self._failed and not self._stopped
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=self.name,
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+
+    def wait_for_sync(self, timeout):
+        """
+        Wait for the first attempt of the initial LIST, and return True if
+        the collection is synced.
+        """
+        self._attempted.wait(timeout)
+        return self._synced.is_set()
+
+    def failed_recently(self):
+        """Return True if the Informer can't list/watch, since the cooldown."""
+        if not self._failed:
+            return False
+
+        elapsed = time.monotonic() - self._failed_at
+        return elapsed < settings.CACHE_FAILURE_COOLDOWN
+
+    def list(self):
+        """
+        Return a list response object, of the same type as the one the
+        list_func returns, which contains the current state of the
+        collection. The items are sorted by namespace and name, like the
+        responses of the API Server.
+
+        The typed objects are shared between the callers and must not be
+        modified. Custom resources are plain dicts, which are copied.
+        """
+        self._last_read = time.monotonic()
+
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = [
+                    obj for _, obj in sorted(self._objects.items())
+                ]
+            items = self._snapshot
+            resource_version = self._resource_version
+            template = self._template
+
+        if isinstance(template, dict):
+            resp = dict(template)
+            resp["metadata"] = dict(template.get("metadata") or {},
+                                    resourceVersion=resource_version)
+            resp["items"] = copy.deepcopy(items)
+            return resp
+
+        resp = copy.copy(template)
+        resp.metadata = copy.copy(template.metadata)
+        resp.metadata.resource_version = resource_version
+        resp.items = list(items)
+        return resp
+
+    def get(self, namespace, name):
+        """
+        Return the object with the given namespace and name, or None if it
+        is not in the collection. Custom resources are copied.
+        """
+        self._last_read = time.monotonic()
+
+        with self._lock:
+            obj = self._objects.get((namespace or "", name))
+
+        if isinstance(obj, dict):
+            return copy.deepcopy(obj)
+
+        return obj
+
+    def _run(self):
+        retries = 0
+        while not self._stopped:
+            if self._idle():
+                log.info("Stopping idle informer %s", self.name)
+                self.stop()
+                break
+
+            try:
+                if self._resource_version is None:
+                    self._relist()
+
+                self._watch()
+                retries = 0
+            except ApiException as e:
+                if e.status == HTTP_STATUS_GONE:
+                    log.info("Watch for %s expired. Re-listing.", self.name)
+                    self._resource_version = None
+                    continue
+
+                if e.status in FATAL_STATUSES:
+                    log.error("Informer %s can't list/watch: %s",
+                              self.name, e)
+                    self._failed_at = time.monotonic()
+                    self._failed = True
+                    break
+
+                log.error("Informer %s failed: %s", self.name, e)
+                self._attempted.set()
+                retries = self._backoff(retries)
+            except Exception as e:
+                log.exception("Informer %s failed: %s", self.name, e)
+                self._attempted.set()
+                retries = self._backoff(retries)
+
+        self._attempted.set()
+
+    def _backoff(self, retries):
+        delay = RETRY_BACKOFF_SECONDS[min(retries,
+                                          len(RETRY_BACKOFF_SECONDS) - 1)]
+        time.sleep(delay)
+        return retries + 1
+
+    def _idle(self):
+        idle_time = time.monotonic() - self._last_read
+        return idle_time > settings.CACHE_IDLE_TIMEOUT
+
+    def _relist(self):
+        # The requests wait for the initial LIST, see get_informer
+        read_priority = throttle.READ
+        if self._attempted.is_set():
+            read_priority = throttle.BACKGROUND
+
+        with throttle.reads_as(read_priority):
+            resp = list_all_pages(self.list_func, *self.args)
+        items = get_items(resp)
+        objects = {object_key(obj): obj for obj in items}
+
+        if isinstance(resp, dict):
+            template = {k: v for k, v in resp.items() if k != "items"}
+            return_type = None
+        else:
+            template = copy.copy(resp)
+            template.items = []
+            return_type = type(resp).__name__[:-len("List")]
+
+        with self._lock:
+            self._objects = objects
+            self._snapshot = None
+            self._template = template
+            self._return_type = return_type
+            self._resource_version = get_resource_version(resp)
+
+        log.debug("Informer %s listed %s objects", self.name, len(objects))
+        self._synced.set()
+        self._attempted.set()
+        notify_change(self.namespace)
+
+    def _watch(self):
+        w = watch.Watch(return_type=self._return_type)
+        stream = w.stream(self.list_func, *self.args,
+                          resource_version=self._resource_version,
+                          timeout_seconds=settings.CACHE_WATCH_TIMEOUT,
+                          allow_watch_bookmarks=True)
+
+        for event in stream:
+            if self._stopped:
+                w.stop()
+                break
+
+            self._handle_event(event)
+
+            if self._idle():
+                w.stop()
+                break
+
+    def _handle_event(self, event):
+        event_type = event["type"]
+        if event_type == "BOOKMARK":
+            self._resource_version = get_resource_version(
+                event["raw_object"]
+            )
+            return
+
+        obj = strip_object(event["object"])
+        key = object_key(obj)
+        with self._lock:
+            if event_type == "DELETED":
+                self._objects.pop(key, None)
+            else:
+                self._objects[key] = obj
+
+            self._snapshot = None
+            self._resource_version = get_resource_version(obj)
+
+        notify_change(self.namespace)
+
+
+def namespace_arg(list_func, args):
+    """Return the namespace argument of a list function, if it has one."""
+    try:
+        params = list(inspect.signature(list_func).parameters)
+    except (TypeError, ValueError):
+        return None
+
+    if "namespace" in params and params.index("namespace") < len(args):
+        return args[params.index("namespace")]
+
+    return None
+
+
+def get_items(resp):
+    if isinstance(resp, dict):
+        return resp.get("items") or []
+
+    return resp.items or []
+
+
+def set_items(resp, items):
+    if isinstance(resp, dict):
+        resp["items"] = items
+    else:
+        resp.items = items
+
+
+def get_continue(resp):
+    """Return the continue token of a list response."""
+    if isinstance(resp, dict):
+        return (resp.get("metadata") or {}).get("continue")
+
+    return getattr(resp.metadata, "_continue", None)
+
+
+def list_all_pages(list_func, *args, **kwargs):
+    """
+    LIST a collection in pages of APP_LIST_PAGE_SIZE items, so that the API
+    Server and the backend never handle the whole collection in a single
+    response, and return a list response with the items of all the pages.
+    """
+    if settings.LIST_PAGE_SIZE <= 0:
+        return strip_list(list_func(*args, **kwargs))
+
+    resp = list_func(*args, limit=settings.LIST_PAGE_SIZE, **kwargs)
+    items = list(get_items(resp))
+    continue_token = get_continue(resp)
+    while continue_token:
+        try:
+            page = list_func(*args, limit=settings.LIST_PAGE_SIZE,
+                             _continue=continue_token, **kwargs)
+        except ApiException as e:
+            if e.status != HTTP_STATUS_GONE:
+                raise
+
+            # The snapshot of the first page expired, list without pages
+            log.info("Continue token of %s expired. Listing again.",
+                     list_func.__name__)
+            return strip_list(list_func(*args, **kwargs))
+
+        items.extend(get_items(page))
+        continue_token = get_continue(page)
+
+    set_items(resp, strip_items(items))
+    # The response has all the items, and the resourceVersion of the first
+    # page, which is the one that all the pages are consistent with
+    if isinstance(resp, dict):
+        resp.get("metadata", {}).pop("continue", None)
+    elif resp.metadata is not None:
+        resp.metadata._continue = None
+
+    return resp
+
+
+def strip_object(obj):
+    """
+    Drop the managedFields and the last-applied-configuration annotation of
+    an object, in place. The apps never read them, and they are often more
+    than half of the size of an object.
+    """
+    if not settings.STRIP_MANAGED_FIELDS:
+        return obj
+
+    if isinstance(obj, dict):
+        metadata = obj.get("metadata") or {}
+        metadata.pop("managedFields", None)
+        annotations = metadata.get("annotations") or {}
+    else:
+        metadata = getattr(obj, "metadata", None)
+        if metadata is None:
+            return obj
+        metadata.managed_fields = None
+        annotations = metadata.annotations or {}
+
+    annotations.pop(LAST_APPLIED_ANNOTATION, None)
+    return obj
+
+
+def strip_items(items):
+    return [strip_object(obj) for obj in items]
+
+
+def strip_list(resp):
+    """Strip the items of a list response, see strip_object."""
+    set_items(resp, strip_items(get_items(resp)))
+    return resp
+
+
+def get_metadata_field(obj, field, attr):
+    if isinstance(obj, dict):
+        return (obj.get("metadata") or {}).get(field)
+
+    return getattr(obj.metadata, attr, None)
+
+
+def get_resource_version(obj):
+    return get_metadata_field(obj, "resourceVersion", "resource_version")
+
+
+def object_key(obj):
+    return (get_metadata_field(obj, "namespace", "namespace") or "",
+            get_metadata_field(obj, "name", "name"))
+
+
+def get_labels(obj):
+    return get_metadata_field(obj, "labels", "labels") or {}
+
+
+def parse_label_selector(label_selector):
+    """
+    Convert an equality based label selector to a list of requirements of
+    the form (key, operator, value). Return None if the selector uses set
+    based requirements, which the cache does not evaluate.
+    """
+    requirements = []
+    for term in label_selector.split(","):
+        term = term.strip()
+        if not term:
+            continue
+
+        if "(" in term or " in " in term or " notin " in term:
+            return None
+
+        if "!=" in term:
+            key, value = term.split("!=", 1)
+            requirements.append((key.strip(), "!=", value.strip()))
+        elif "==" in term:
+            key, value = term.split("==", 1)
+            requirements.append((key.strip(), "=", value.strip()))
+        elif "=" in term:
+            key, value = term.split("=", 1)
+            requirements.append((key.strip(), "=", value.strip()))
+        elif term.startswith("!"):
+            requirements.append((term[1:].strip(), "!", None))
+        else:
+            requirements.append((term, "exists", None))
+
+    return requirements
+
+
+def labels_match(labels, requirements):
+    for key, operator, value in requirements:
+        if operator == "=" and labels.get(key) != value:
+            return False
+        if operator == "!=" and labels.get(key) == value:
+            return False
+        if operator == "exists" and key not in labels:
+            return False
+        if operator == "!" and key in labels:
+            return False
+
+    return True
+
+
+def filter_by_labels(resp, requirements):
+    items = [obj for obj in get_items(resp)
+             if labels_match(get_labels(obj), requirements)]
+    set_items(resp, items)
+
+    return resp
+
+
+def generation(namespace):
+    """Return the number of changes of the namespace's collections."""
+    with _changes:
+        return _generations.get(namespace, 0)
+
+
+def notify_change(namespace):
+    with _changes:
+        _generations[namespace] = _generations.get(namespace, 0) + 1
+        _changes.notify_all()
+
+
+def wait_for_change(namespace, since, timeout):
+    """
+    Wait until a collection of the namespace changes after the generation
+    since, or the timeout expires. Return the current generation.
+    """
+    with _changes:
+        _changes.wait_for(lambda: _generations.get(namespace, 0) != since,
+                          timeout)
+        return _generations.get(namespace, 0)
+
+
+def is_watched(namespace):
+    """
+    Return True if a synced Informer watches a collection of the namespace,
+    i.e. if its changes are notified to wait_for_change.
+    """
+    if not settings.CACHE_ENABLED:
+        return False
+
+    with _informers_lock:
+        informers = list(_informers.values())
+
+    for informer in informers:
+        if informer.namespace != namespace or not informer.alive:
+            continue
+
+        if informer.wait_for_sync(0):
+            return True
+
+    return False
+
+
+def get_informer(list_func, *args):
+    """
+    Return a running and synced Informer for the collection, or None if the
+    collection can't be served from the cache.
+    """
+    key = (list_func.__name__, args)
+    with _informers_lock:
+        informer = _informers.get(key)
+        if informer is None or not informer.alive:
+            if informer is not None and informer.failed_recently():
+                # The app can't watch this collection, retry after a cooldown
+                return None
+
+            informer = Informer(list_func, *args)
+            _informers[key] = informer
+            informer.start()
+
+    # The request doesn't wait for the Informer past its own deadline
+    timeout = settings.CACHE_SYNC_TIMEOUT
+    remaining = deadlines.remaining()
+    if remaining is not None:
+        timeout = max(min(timeout, remaining), 0)
+
+    if not informer.wait_for_sync(timeout):
+        log.warning("Informer %s has not synced yet.", informer.name)
+        return None
+
+    if not informer.alive:
+        return None
+
+    return informer
+
+
+def list_directly(list_func, *args, **kwargs):
+    """
+    LIST the collection from the API Server. Identical concurrent LISTs
+    share a single request, see the singleflight module.
+    """
+    key = ("list", list_func.__name__, args, tuple(sorted(kwargs.items())))
+    return singleflight.do(key, list_all_pages, list_func, *args, **kwargs)
+
+
+def list_objects(list_func, *args, label_selector=None):
+    """
+    Return the collection from the shared cache. If the cache is disabled, or
+    the collection can't be cached, the list_func is called directly.
+
+    list_func: The K8s client function for listing the collection
+    args: The positional arguments for the list_func, i.e. the namespace
+    label_selector: An equality based label selector for filtering the items
+    """
+    kwargs = {}
+    if label_selector is not None:
+        kwargs["label_selector"] = label_selector
+
+    if not settings.CACHE_ENABLED:
+        return list_directly(list_func, *args, **kwargs)
+
+    requirements = []
+    if label_selector:
+        requirements = parse_label_selector(label_selector)
+        if requirements is None:
+            return list_directly(list_func, *args, **kwargs)
+
+    informer = get_informer(list_func, *args)
+    if informer is None:
+        return list_directly(list_func, *args, **kwargs)
+
+    resp = informer.list()
+    if requirements:
+        resp = filter_by_labels(resp, requirements)
+
+    return resp
+
+
+@contextmanager
+def read_through():
+    """
+    Read the objects of get_object from the API Server, instead of the
+    Informers and the in-flight reads, i.e. for building a patch which must
+    have the current resourceVersion of the object.
+    """
+    previous = getattr(_local, "read_through", False)
+    _local.read_through = True
+    try:
+        yield
+    finally:
+        _local.read_through = previous
+
+
+def get_object(read_func, list_func, name, namespace):
+    """
+    Return a single object from the Informer of its collection, if one is
+    already running, or read it from the API Server. An Informer is not
+    started only for reading a single object.
+
+    read_func: The K8s client function for reading the object, i.e.
+               AppsV1Api.read_namespaced_stateful_set
+    list_func: The K8s client function for listing the collection
+    """
+    if getattr(_local, "read_through", False):
+        return read_func(name, namespace)
+
+    if settings.CACHE_ENABLED:
+        with _informers_lock:
+            informer = _informers.get((list_func.__name__, (namespace,)))
+
+        synced = informer is not None and informer.wait_for_sync(0)
+        if synced and informer.alive:
+            obj = informer.get(namespace, name)
+            if obj is None:
+                raise ApiException(status=HTTP_STATUS_NOT_FOUND,
+                                   reason="Not Found")
+            return obj
+
+    key = ("read", list_func.__name__, name, namespace)
+    return singleflight.do(key, read_func, name, namespace)
+
+
+def stop_all():
+    """Stop all the running Informers."""
+    with _informers_lock:
+        for informer in _informers.values():
+            informer.stop()
+
+        _informers.clear()
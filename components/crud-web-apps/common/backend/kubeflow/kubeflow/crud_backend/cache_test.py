@@ -0,0 +1,377 @@
+"""Tests for the watch-backed object cache."""
+
+import unittest
+from unittest import mock
+
+from kubernetes import client
+
+from . import cache
+
+
+def _notebook(name, resource_version, labels=None):
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": "team-a",
+            "resourceVersion": resource_version,
+            "labels": labels or {},
+        },
+    }
+
+
+def list_namespaced_notebooks(namespace, **kwargs):
+    return {
+        "apiVersion": "kubeflow.org/v1beta1",
+        "kind": "NotebookList",
+        "metadata": {"resourceVersion": "10"},
+        "items": [_notebook("b", "9"), _notebook("a", "8", {"app": "a"})],
+    }
+
+
+class InformerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.informer = cache.Informer(list_namespaced_notebooks, "team-a")
+        self.informer._relist()
+
+    def test_relist_returns_sorted_items(self):
+        resp = self.informer.list()
+
+        self.assertEqual(
+            [nb["metadata"]["name"] for nb in resp["items"]], ["a", "b"]
+        )
+        self.assertEqual(resp["metadata"]["resourceVersion"], "10")
+        self.assertEqual(resp["kind"], "NotebookList")
+
+    def test_watch_events_update_the_collection(self):
+        self.informer._handle_event({
+            "type": "ADDED", "object": _notebook("c", "11"),
+        })
+        self.informer._handle_event({
+            "type": "DELETED", "object": _notebook("a", "12"),
+        })
+
+        resp = self.informer.list()
+
+        self.assertEqual(
+            [nb["metadata"]["name"] for nb in resp["items"]], ["b", "c"]
+        )
+        self.assertEqual(resp["metadata"]["resourceVersion"], "12")
+
+    def test_bookmark_only_moves_the_resource_version(self):
+        self.informer._handle_event({
+            "type": "BOOKMARK",
+            "object": {},
+            "raw_object": {"metadata": {"resourceVersion": "20"}},
+        })
+
+        self.assertEqual(self.informer._resource_version, "20")
+        self.assertEqual(len(self.informer.list()["items"]), 2)
+
+    def test_namespace_of_custom_resources(self):
+        custom_api = client.CustomObjectsApi()
+
+        informer = cache.Informer(custom_api.list_namespaced_custom_object,
+                                  "kubeflow.org", "v1", "team-a", "notebooks")
+
+        self.assertEqual(informer.namespace, "team-a")
+
+    def test_changes_wake_up_the_waiting_clients(self):
+        generation = cache.generation("team-a")
+
+        self.informer._handle_event({
+            "type": "MODIFIED", "object": _notebook("a", "13"),
+        })
+
+        self.assertEqual(cache.wait_for_change("team-a", generation, 0),
+                         generation + 1)
+
+    def test_callers_get_copies_of_custom_resources(self):
+        self.informer.list()["items"][0]["label"] = "changed"
+
+        self.assertNotIn("label", self.informer.list()["items"][0])
+
+    def test_typed_list_keeps_its_type(self):
+        pods = client.V1PodList(
+            metadata=client.V1ListMeta(resource_version="5"),
+            items=[client.V1Pod(metadata=client.V1ObjectMeta(
+                name="pod", namespace="team-a", resource_version="5"))],
+        )
+        list_namespaced_pod = mock.Mock(return_value=pods,
+                                        __name__="list_namespaced_pod")
+        informer = cache.Informer(list_namespaced_pod, "team-a")
+        informer._relist()
+
+        resp = informer.list()
+
+        self.assertIsInstance(resp, client.V1PodList)
+        self.assertEqual(informer._return_type, "V1Pod")
+        self.assertEqual(resp.items[0].metadata.name, "pod")
+
+
+class LabelSelectorTest(unittest.TestCase):
+
+    def test_equality_based_selectors(self):
+        requirements = cache.parse_label_selector("app=a,tier!=db,owner")
+
+        self.assertTrue(cache.labels_match(
+            {"app": "a", "owner": "me"}, requirements))
+        self.assertFalse(cache.labels_match(
+            {"app": "a", "tier": "db", "owner": "me"}, requirements))
+        self.assertFalse(cache.labels_match({"app": "a"}, requirements))
+
+    def test_set_based_selectors_are_not_cached(self):
+        self.assertIsNone(cache.parse_label_selector("app in (a, b)"))
+
+
+class ListObjectsTest(unittest.TestCase):
+
+    @mock.patch.object(cache.settings, "CACHE_ENABLED", False)
+    @mock.patch.object(cache.settings, "LIST_PAGE_SIZE", 500)
+    def test_disabled_cache_calls_the_api(self):
+        list_func = mock.Mock(__name__="list_namespaced_pod",
+                              return_value={"metadata": {}, "items": []})
+
+        cache.list_objects(list_func, "team-a", label_selector="app=a")
+
+        list_func.assert_called_once_with("team-a", limit=500,
+                                          label_selector="app=a")
+
+    @mock.patch.object(cache, "get_informer")
+    def test_label_selector_is_evaluated_on_the_cache(self, get_informer):
+        informer = cache.Informer(list_namespaced_notebooks, "team-a")
+        informer._relist()
+        get_informer.return_value = informer
+
+        resp = cache.list_objects(list_namespaced_notebooks, "team-a",
+                                  label_selector="app=a")
+
+        self.assertEqual(
+            [nb["metadata"]["name"] for nb in resp["items"]], ["a"]
+        )
+
+
+@mock.patch.object(cache.settings, "LIST_PAGE_SIZE", 2)
+class ListAllPagesTest(unittest.TestCase):
+
+    def _pages(self, *pages):
+        resps = []
+        for i, names in enumerate(pages):
+            token = "page-%d" % (i + 1) if i < len(pages) - 1 else None
+            resps.append({"metadata": {"continue": token},
+                          "items": [_notebook(n, "1") for n in names]})
+
+        return mock.Mock(__name__="list_namespaced_notebooks",
+                         side_effect=resps)
+
+    def test_pages_are_merged(self):
+        list_func = self._pages(["a", "b"], ["c", "d"], ["e"])
+
+        resp = cache.list_all_pages(list_func, "team-a")
+
+        self.assertEqual([nb["metadata"]["name"] for nb in resp["items"]],
+                         ["a", "b", "c", "d", "e"])
+        list_func.assert_called_with("team-a", limit=2, _continue="page-2")
+        self.assertIsNone(cache.get_continue(resp))
+
+    def test_expired_token_lists_without_pages(self):
+        list_func = self._pages(["a", "b"])
+        full = {"metadata": {}, "items": [_notebook("a", "2")]}
+        list_func.side_effect = [
+            {"metadata": {"continue": "page-1"}, "items": []},
+            cache.ApiException(status=410),
+            full,
+        ]
+
+        resp = cache.list_all_pages(list_func, "team-a")
+
+        self.assertIs(resp, full)
+        list_func.assert_called_with("team-a")
+
+    def test_typed_list_responses(self):
+        first = client.V1PodList(
+            metadata=client.V1ListMeta(_continue="page-1"),
+            items=[client.V1Pod(metadata=client.V1ObjectMeta(name="a"))],
+        )
+        second = client.V1PodList(
+            metadata=client.V1ListMeta(),
+            items=[client.V1Pod(metadata=client.V1ObjectMeta(name="b"))],
+        )
+        list_func = mock.Mock(__name__="list_namespaced_pod",
+                              side_effect=[first, second])
+
+        resp = cache.list_all_pages(list_func, "team-a")
+
+        self.assertEqual([pod.metadata.name for pod in resp.items],
+                         ["a", "b"])
+
+
+class StripObjectTest(unittest.TestCase):
+
+    def test_custom_resources(self):
+        obj = _notebook("a", "1")
+        obj["metadata"]["managedFields"] = [{"manager": "kubectl"}]
+        obj["metadata"]["annotations"] = {
+            cache.LAST_APPLIED_ANNOTATION: "{}", "owner": "alice",
+        }
+
+        cache.strip_object(obj)
+
+        self.assertNotIn("managedFields", obj["metadata"])
+        self.assertEqual(obj["metadata"]["annotations"], {"owner": "alice"})
+
+    def test_typed_objects(self):
+        pod = client.V1Pod(metadata=client.V1ObjectMeta(
+            name="a",
+            managed_fields=[client.V1ManagedFieldsEntry(manager="kubectl")],
+            annotations={cache.LAST_APPLIED_ANNOTATION: "{}"},
+        ))
+
+        cache.strip_object(pod)
+
+        self.assertIsNone(pod.metadata.managed_fields)
+        self.assertEqual(pod.metadata.annotations, {})
+
+    @mock.patch.object(cache.settings, "STRIP_MANAGED_FIELDS", False)
+    def test_stripping_can_be_disabled(self):
+        obj = {"metadata": {"managedFields": []}}
+
+        self.assertIn("managedFields", cache.strip_object(obj)["metadata"])
+
+    def test_watch_events_are_stripped(self):
+        informer = cache.Informer(list_namespaced_notebooks, "team-a")
+        informer._relist()
+        obj = _notebook("c", "11")
+        obj["metadata"]["managedFields"] = [{"manager": "kubectl"}]
+
+        informer._handle_event({"type": "ADDED", "object": obj})
+
+        self.assertNotIn("managedFields",
+                         informer.get("team-a", "c")["metadata"])
+
+
+def list_failing(namespace, **kwargs):
+    raise cache.ApiException(status=500, reason="Internal Server Error")
+
+
+class GetInformerTest(unittest.TestCase):
+
+    def tearDown(self):
+        cache.stop_all()
+
+    @mock.patch.object(cache.settings, "CACHE_SYNC_TIMEOUT", 10)
+    def test_failed_initial_list_falls_back_immediately(self):
+        started = cache.time.monotonic()
+
+        self.assertIsNone(cache.get_informer(list_failing, "team-a"))
+        self.assertLess(cache.time.monotonic() - started, 5)
+
+    @mock.patch.object(cache.settings, "CACHE_SYNC_TIMEOUT", 10)
+    @mock.patch.object(cache.deadlines, "remaining", return_value=0.1)
+    @mock.patch.object(cache.Informer, "start")
+    def test_sync_is_not_awaited_past_the_deadline(self, start, remaining):
+        started = cache.time.monotonic()
+
+        self.assertIsNone(
+            cache.get_informer(list_namespaced_notebooks, "team-a")
+        )
+        self.assertLess(cache.time.monotonic() - started, 5)
+
+    def test_initial_list_is_sent_as_a_read(self):
+        priorities = []
+
+        def list_func(namespace, **kwargs):
+            priorities.append(cache.throttle.priority("GET"))
+            return list_namespaced_notebooks(namespace, **kwargs)
+
+        informer = cache.Informer(list_func, "team-a")
+        informer._relist()
+        informer._relist()
+
+        self.assertEqual(priorities,
+                         [cache.throttle.READ, cache.throttle.BACKGROUND])
+
+    def _forbidden_informer(self):
+        informer = cache.Informer(list_namespaced_notebooks, "team-a")
+        informer._failed = True
+        informer._failed_at = cache.time.monotonic()
+        cache._informers[("list_namespaced_notebooks", ("team-a",))] = \
+            informer
+        return informer
+
+    def test_forbidden_collections_are_read_directly(self):
+        self._forbidden_informer()
+
+        self.assertIsNone(
+            cache.get_informer(list_namespaced_notebooks, "team-a")
+        )
+
+    @mock.patch.object(cache.settings, "CACHE_FAILURE_COOLDOWN", 0)
+    @mock.patch.object(cache.Informer, "start")
+    def test_forbidden_collections_are_retried_after_a_cooldown(self, start):
+        forbidden = self._forbidden_informer()
+
+        with mock.patch.object(cache.Informer, "wait_for_sync",
+                               return_value=True):
+            informer = cache.get_informer(list_namespaced_notebooks,
+                                          "team-a")
+
+        self.assertIsNotNone(informer)
+        self.assertIsNot(informer, forbidden)
+        start.assert_called_once_with()
+
+
+class IsWatchedTest(unittest.TestCase):
+
+    def tearDown(self):
+        cache._informers.clear()
+
+    def test_namespaces_of_the_synced_informers(self):
+        informer = cache.Informer(list_namespaced_notebooks, "team-a")
+        cache._informers[("list_namespaced_notebooks", ("team-a",))] = \
+            informer
+        self.assertFalse(cache.is_watched("team-a"))
+
+        informer._relist()
+        self.assertTrue(cache.is_watched("team-a"))
+        self.assertFalse(cache.is_watched("team-b"))
+
+    @mock.patch.object(cache.settings, "CACHE_ENABLED", False)
+    def test_disabled_cache(self):
+        self.assertFalse(cache.is_watched("team-a"))
+
+
+class GetObjectTest(unittest.TestCase):
+
+    def tearDown(self):
+        cache._informers.clear()
+
+    def test_reads_the_object_without_a_running_informer(self):
+        read_func = mock.Mock(return_value="obj")
+
+        obj = cache.get_object(read_func, list_namespaced_notebooks,
+                               "a", "team-a")
+
+        self.assertEqual(obj, "obj")
+        read_func.assert_called_once_with("a", "team-a")
+
+    def test_uses_the_running_informer(self):
+        informer = cache.Informer(list_namespaced_notebooks, "team-a")
+        informer._relist()
+        cache._informers[("list_namespaced_notebooks", ("team-a",))] = \
+            informer
+        read_func = mock.Mock()
+
+        obj = cache.get_object(read_func, list_namespaced_notebooks,
+                               "a", "team-a")
+
+        self.assertEqual(obj["metadata"]["name"], "a")
+        read_func.assert_not_called()
+        with self.assertRaises(cache.ApiException) as ctx:
+            cache.get_object(read_func, list_namespaced_notebooks,
+                             "missing", "team-a")
+        self.assertEqual(ctx.exception.status, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
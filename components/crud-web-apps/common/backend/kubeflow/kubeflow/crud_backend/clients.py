@@ -0,0 +1,212 @@
+"""
+The K8s clients of the backend.
+
+Every ApiClient of the K8s library has its own pool of HTTP connections to
+the API Server, so creating an API object, i.e. client.CustomObjectsApi(),
+for a call opens a new pool, and a new TLS connection. All the modules get
+their API objects from the registry instead, which creates them once, on a
+single ApiClient whose pool is shared by all the calls of the worker:
+
+    custom_api = clients.get_api(client.CustomObjectsApi)
+
+Nothing is created when the modules are imported. The kube config is loaded,
+and the ApiClient created, on the first call to the API Server, so importing
+the apps needs no cluster and the app can be preloaded by gunicorn before it
+forks the workers. The module level API objects, i.e. api.v1_core, are lazy
+proxies to the objects of the registry. A forked worker drops the ApiClient
+of its parent, whose connections it must not share, and creates its own.
+
+The size of the pool is the connection_pool_maxsize of the configuration.
+The library's default, 5 connections per CPU, is enough for the sync
+workers, but a gevent worker handles hundreds of requests concurrently and
+its greenlets would open, and discard, a new connection for every call once
+the pool is in use. The pool is sized with APP_K8S_CONNECTION_POOL_SIZE, or
+for the connections of the gevent worker.
+"""
+import logging
+import os
+import socket
+import threading
+
+from kubernetes import client
+from urllib3 import Retry
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import HTTPError
+
+from . import (breaker, concurrency, deadlines, metrics, retry, settings,
+               throttle)
+
+log = logging.getLogger(__name__)
+
+_config_loaded = False
+_api_client = None
+_apis = {}
+_lock = threading.Lock()
+
+
+def connection_pool_size():
+    if settings.K8S_CONNECTION_POOL_SIZE > 0:
+        return settings.K8S_CONNECTION_POOL_SIZE
+
+    if concurrency.is_cooperative():
+        return settings.WORKER_CONNECTIONS
+
+    return None
+
+
+def load_config():
+    """
+    Load the configuration of the K8s clients, and the settings of their
+    connection pools. It applies to the clients created afterwards.
+    """
+    from kubernetes import config
+    from kubernetes.config import ConfigException
+
+    try:
+        # Load configuration inside the Pod
+        config.load_incluster_config()
+    except ConfigException:
+        # Load configuration for testing
+        config.load_kube_config()
+
+    configuration = client.Configuration.get_default_copy()
+    # Only the connections are retried by the pool, for all the requests.
+    # The ApiClient retries the reads, see the retry module
+    configuration.retries = Retry(total=settings.K8S_CLIENT_RETRIES,
+                                  read=0, status=0,
+                                  backoff_factor=settings.K8S_RETRY_BACKOFF)
+
+    pool_size = connection_pool_size()
+    if pool_size is not None:
+        configuration.connection_pool_maxsize = pool_size
+        log.info("Using up to %s connections to the API Server", pool_size)
+
+    client.Configuration.set_default(configuration)
+
+
+def keepalive_socket_options():
+    """
+    The options of the sockets of the pool, which probe the idle connections
+    so that the pool doesn't hand out connections that the network dropped.
+    """
+    options = list(HTTPConnection.default_socket_options)
+    if settings.K8S_KEEPALIVE_IDLE <= 0:
+        return options
+
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE,
+                        settings.K8S_KEEPALIVE_IDLE))
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL,
+                        settings.K8S_KEEPALIVE_INTERVAL))
+
+    return options
+
+
+class ApiClient(client.ApiClient):
+    """
+    ApiClient whose requests go through the retries, the circuit breaker and
+    the rate limiter of the worker.
+    """
+
+    def request(self, method, *args, **kwargs):
+        return retry.call(method, self._send, *args, **kwargs)
+
+    def _send(self, method, *args, **kwargs):
+        kwargs["_request_timeout"] = deadlines.request_timeout(
+            kwargs.get("_request_timeout"),
+            kwargs.get("_preload_content", True),
+        )
+        try:
+            with breaker.guard(), throttle.limit(method):
+                return super().request(method, *args, **kwargs)
+        except HTTPError:
+            # The call timed out because the request ran out of its budget
+            deadlines.check()
+            raise
+
+
+def get_api_client():
+    """Return the ApiClient, and connection pool, shared by all the APIs."""
+    global _api_client, _config_loaded
+
+    with _lock:
+        if not _config_loaded:
+            load_config()
+            _config_loaded = True
+
+        if _api_client is None:
+            _api_client = ApiClient()
+            pool_manager = _api_client.rest_client.pool_manager
+            pool_manager.connection_pool_kw["socket_options"] = (
+                keepalive_socket_options()
+            )
+
+        return _api_client
+
+
+def get_api(api_class):
+    """
+    Return the API object of the class, i.e. client.CoreV1Api, on the shared
+    ApiClient.
+    """
+    api_client = get_api_client()
+    with _lock:
+        api = _apis.get(api_class)
+        if api is None:
+            api = _apis[api_class] = api_class(api_client)
+
+        return api
+
+
+class LazyApi(object):
+    """
+    Proxy to the API object of the registry, which is created on the first
+    access to one of its attributes.
+    """
+
+    def __init__(self, api_class):
+        self.api_class = api_class
+
+    def __getattr__(self, name):
+        # Introspection, i.e. by mock.patch, must not create the API object
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        return getattr(get_api(self.api_class), name)
+
+    def __repr__(self):
+        return "<LazyApi %s>" % self.api_class.__name__
+
+
+def _reset_after_fork():
+    global _api_client, _lock
+
+    # The lock may have been held by another thread of the parent
+    _lock = threading.Lock()
+    _api_client = None
+    _apis.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def connection_pools():
+    """Return the urllib3 connection pools of the shared ApiClient."""
+    if _api_client is None:
+        return []
+
+    pools = _api_client.rest_client.pool_manager.pools
+    result = []
+    for key in pools.keys():
+        try:
+            result.append(pools[key])
+        except KeyError:
+            # The pool was evicted in the meantime
+            continue
+
+    return result
+
+
+metrics.register_connection_pools(connection_pools)
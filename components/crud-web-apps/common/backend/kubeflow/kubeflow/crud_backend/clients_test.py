@@ -0,0 +1,155 @@
+"""Tests for the registry of the K8s clients."""
+
+import os
+import socket
+import subprocess
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from kubernetes import client
+
+from . import clients, metrics, settings
+
+# The directory of the kubeflow package
+BACKEND_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "..")
+)
+
+
+def mock_config(test):
+    """Create the clients without loading a kube config."""
+    patcher = mock.patch.object(clients, "load_config")
+    patcher.start()
+    test.addCleanup(patcher.stop)
+
+
+class RegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        mock_config(self)
+
+    def test_api_objects_are_created_once(self):
+        self.assertIs(clients.get_api(client.CustomObjectsApi),
+                      clients.get_api(client.CustomObjectsApi))
+
+    def test_api_objects_share_the_api_client(self):
+        core_api = clients.get_api(client.CoreV1Api)
+        custom_api = clients.get_api(client.CustomObjectsApi)
+
+        self.assertIs(core_api.api_client, clients.get_api_client())
+        self.assertIs(custom_api.api_client, core_api.api_client)
+
+    def test_pool_probes_idle_connections(self):
+        pool_manager = clients.get_api_client().rest_client.pool_manager
+        options = pool_manager.connection_pool_kw["socket_options"]
+
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), options)
+
+    @mock.patch.object(settings, "K8S_KEEPALIVE_IDLE", 0)
+    def test_keepalive_can_be_disabled(self):
+        options = clients.keepalive_socket_options()
+
+        self.assertNotIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+                         options)
+
+
+class LoadConfigTest(unittest.TestCase):
+
+    def setUp(self):
+        default = client.Configuration.get_default_copy()
+        self.addCleanup(client.Configuration.set_default, default)
+
+    @mock.patch("kubernetes.config.load_kube_config")
+    @mock.patch("kubernetes.config.load_incluster_config")
+    def test_pool_only_retries_the_connections(self, load_incluster,
+                                               load_kube):
+        clients.load_config()
+
+        # The reads are retried by the retry module
+        retries = client.Configuration.get_default_copy().retries
+        self.assertEqual(retries.total, settings.K8S_CLIENT_RETRIES)
+        self.assertEqual(retries.read, 0)
+        self.assertEqual(retries.status, 0)
+
+
+class LazyApiTest(unittest.TestCase):
+
+    def setUp(self):
+        mock_config(self)
+
+    def test_proxies_the_api_of_the_registry(self):
+        lazy_api = clients.LazyApi(client.CoreV1Api)
+        core_api = clients.get_api(client.CoreV1Api)
+
+        self.assertEqual(lazy_api.list_namespaced_pod,
+                         core_api.list_namespaced_pod)
+
+    def test_apps_are_imported_without_a_cluster(self):
+        env = dict(os.environ, KUBECONFIG=os.devnull)
+        env.pop("KUBERNETES_SERVICE_HOST", None)
+        script = (
+            "from kubeflow.kubeflow.crud_backend import api, authz, clients\n"
+            "assert clients._api_client is None\n"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=BACKEND_DIR, env=env,
+            capture_output=True, text=True, timeout=60,
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "os.fork is not available")
+class ForkTest(unittest.TestCase):
+
+    def setUp(self):
+        mock_config(self)
+
+    def test_forked_worker_creates_its_own_api_client(self):
+        parent_client = clients.get_api_client()
+        read_fd, write_fd = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            shared = clients.get_api_client() is parent_client
+            os.write(write_fd, b"shared" if shared else b"own")
+            os._exit(0)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd, "rb") as pipe:
+            result = pipe.read()
+        os.waitpid(pid, 0)
+
+        self.assertEqual(result, b"own")
+        self.assertIs(clients.get_api_client(), parent_client)
+
+
+class ConnectionPoolCollectorTest(unittest.TestCase):
+
+    def test_collects_the_usage_of_the_pools(self):
+        idle = SimpleNamespace(maxsize=4, queue=[None, None, "conn", "conn"])
+        pools = [
+            SimpleNamespace(pool=idle, num_connections=3, num_requests=10),
+            SimpleNamespace(pool=None, num_connections=1, num_requests=2),
+        ]
+        collector = metrics.ConnectionPoolCollector(lambda: pools)
+
+        values = {
+            family.name: family.samples[0].value
+            for family in collector.collect()
+        }
+
+        self.assertEqual(values, {
+            "k8s_client_pool_max_connections": 4,
+            "k8s_client_pool_idle_connections": 2,
+            "k8s_client_pool_connections": 4,
+            "k8s_client_pool_requests": 12,
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Concurrent execution of the independent reads of a route.
+
+A route usually needs several collections of a namespace, i.e. the Notebooks,
+the Pods and the StatefulSets, which do not depend on each other. Instead of
+reading them one after the other, the route can declare them together:
+
+    notebooks, pods = concurrency.gather(
+        lambda: api.list_notebooks(namespace),
+        lambda: api.list_pods(namespace),
+    )
+
+The latency of the route is then the latency of the slowest read, instead of
+the sum of all of them. The calls run in a thread pool that is shared by all
+the requests of the worker, with APP_FANOUT_MAX_WORKERS threads, each in a
+copy of the context of the request. With the gevent worker class the threads
+are greenlets.
+
+The calls that are made from a thread of the pool run sequentially, so that
+the nested calls can't exhaust the pool and wait for each other. If the
+request runs out of its deadline, see the deadlines module, gather stops
+waiting and cancels the calls that have not started.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from flask import copy_current_request_context, has_request_context
+
+from . import deadlines, settings
+
+log = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def is_cooperative():
+    """Return True if the worker runs with the gevent monkey patches."""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+
+    return monkey.is_module_patched("threading")
+
+
+def get_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.FANOUT_MAX_WORKERS,
+                thread_name_prefix="fanout",
+            )
+
+        return _executor
+
+
+def _reset_after_fork():
+    global _executor, _executor_lock
+
+    # The threads of the pool are not copied in a forked worker
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _in_pool(func):
+    def run():
+        _local.in_pool = True
+        try:
+            return func()
+        finally:
+            _local.in_pool = False
+
+    return run
+
+
+def _runs_inline(calls):
+    """Return True if the calls should run one after the other."""
+    if len(calls) < 2 or settings.FANOUT_MAX_WORKERS <= 0:
+        return True
+
+    return getattr(_local, "in_pool", False)
+
+
+def _submit(calls):
+    executor = get_executor()
+    futures = []
+    for call in calls:
+        if has_request_context():
+            # Each thread needs its own copy of the request context
+            call = copy_current_request_context(call)
+        futures.append(executor.submit(_in_pool(call)))
+
+    return futures
+
+
+def _wait_for(futures):
+    """Wait for the futures and return their results and their errors."""
+    results = []
+    errors = []
+    for future in futures:
+        try:
+            results.append(future.result(timeout=deadlines.remaining()))
+        except FutureTimeoutError:
+            # The reads that have not started yet are not needed anymore
+            for pending in futures:
+                pending.cancel()
+            raise deadlines.exceeded()
+        except Exception as e:
+            results.append(None)
+            errors.append(e)
+
+    return results, errors
+
+
+def gather(*calls):
+    """
+    Run the calls concurrently and return their results, in the order of the
+    calls. If any of the calls fails, the error of the first one is raised,
+    after all of them have finished.
+
+    calls: Functions without arguments, i.e. lambdas
+    """
+    if _runs_inline(calls):
+        return [call() for call in calls]
+
+    # The first call runs in the current thread, while it waits
+    futures = _submit(calls[1:])
+    try:
+        results = [calls[0]()]
+        errors = []
+    except Exception as e:
+        results = [None]
+        errors = [e]
+
+    others, other_errors = _wait_for(futures)
+    results.extend(others)
+    errors.extend(other_errors)
+    if errors:
+        raise errors[0]
+
+    return results
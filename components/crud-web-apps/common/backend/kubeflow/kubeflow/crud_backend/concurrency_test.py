@@ -0,0 +1,103 @@
+"""Tests for the concurrent reads of the routes."""
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from flask import Flask, request
+
+from . import concurrency, deadlines
+
+
+class GatherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+
+    def test_calls_run_concurrently(self):
+        # Each call waits for all the others to start
+        barrier = threading.Barrier(3, timeout=5)
+
+        def read(value):
+            barrier.wait()
+            return value
+
+        results = concurrency.gather(
+            lambda: read("notebooks"), lambda: read("pods"),
+            lambda: read("statefulsets"),
+        )
+
+        self.assertEqual(results, ["notebooks", "pods", "statefulsets"])
+
+    def test_calls_run_in_the_request_context(self):
+        with self.app.test_request_context("/?namespace=team-a"):
+            results = concurrency.gather(
+                lambda: request.args["namespace"],
+                lambda: request.args["namespace"],
+            )
+
+        self.assertEqual(results, ["team-a", "team-a"])
+
+    def test_first_error_is_raised_after_all_calls(self):
+        finished = []
+
+        def fail(error):
+            raise error
+
+        with self.assertRaises(KeyError):
+            concurrency.gather(
+                lambda: finished.append("first"),
+                lambda: fail(KeyError("missing")),
+                lambda: fail(ValueError("invalid")),
+                lambda: finished.append("last"),
+            )
+
+        self.assertEqual(sorted(finished), ["first", "last"])
+
+    def test_nested_calls_run_sequentially(self):
+        def nested():
+            return concurrency.gather(
+                lambda: threading.current_thread().name,
+                lambda: threading.current_thread().name,
+            )
+
+        _, names = concurrency.gather(lambda: None, nested)
+
+        self.assertEqual(names[0], names[1])
+
+    def test_pending_calls_are_cancelled_after_the_deadline(self):
+        release = threading.Event()
+        started = []
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+
+        def read(name):
+            started.append(name)
+            release.wait(5)
+
+        with self.app.test_request_context("/"), \
+                mock.patch.object(concurrency, "_executor", executor):
+            request.environ[deadlines.DEADLINE_KEY] = (
+                deadlines.time.monotonic() + 0.1
+            )
+            with self.assertRaises(deadlines.DeadlineExceeded):
+                concurrency.gather(
+                    lambda: None,
+                    lambda: read("pods"), lambda: read("statefulsets"),
+                    lambda: read("events"),
+                )
+        release.set()
+
+        self.assertNotIn("events", started)
+
+    @mock.patch.object(concurrency.settings, "FANOUT_MAX_WORKERS", 0)
+    def test_disabled(self):
+        results = concurrency.gather(lambda: threading.current_thread(),
+                                     lambda: threading.current_thread())
+
+        self.assertEqual(results, [threading.current_thread()] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -40,7 +40,8 @@ class Config(object):
     ENV = "generic"
     DEBUG = False
     STATIC_DIR = "./static/"
-    JSONIFY_PRETTYPRINT_REGULAR = True
+    # The JSON responses are compact, except in development mode
+    JSONIFY_PRETTYPRINT_REGULAR = False
     LOG_LEVEL = logging.INFO
     PREFIX = "/"
     METRICS: bool = True
@@ -55,6 +56,7 @@ class Config(object):
 class DevConfig(Config):
     ENV = BackendMode.DEVELOPMENT_FULL.value
     DEBUG = True
+    JSONIFY_PRETTYPRINT_REGULAR = True
     LOG_LEVEL = logging.DEBUG
 
     def __init__(self):
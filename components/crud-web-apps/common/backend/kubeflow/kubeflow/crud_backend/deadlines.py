@@ -0,0 +1,143 @@
+"""
+Deadlines of the requests, and the timeouts of their calls to the API Server.
+
+Each request gets a deadline when it starts, with the budget of its route
+class:
+
+    read        GET requests (APP_READ_DEADLINE)
+    write       POST, PATCH and DELETE requests (APP_WRITE_DEADLINE)
+    aggregate   The all-namespaces lists (APP_AGGREGATE_DEADLINE)
+
+A route gets another class with the route_class decorator. The deadline is
+kept in the environ of the request, which the threads of the concurrent
+reads share, and every call to the API Server of the request gets the
+remaining budget as its _request_timeout. Once the budget is gone the calls,
+the retries and the waits for the rate limit fail with a 504, and the reads
+of the route that have not started yet are cancelled. The event streams
+renew the deadline for each update.
+
+The calls outside of a request, i.e. of the informers, get a timeout of
+APP_K8S_REQUEST_TIMEOUT seconds, except for the watches.
+"""
+import logging
+import time
+
+from flask import Blueprint, current_app, has_request_context, request
+from werkzeug.exceptions import GatewayTimeout
+
+from . import metrics, settings
+
+bp = Blueprint("deadlines", __name__)
+log = logging.getLogger(__name__)
+
+READ = "read"
+WRITE = "write"
+AGGREGATE = "aggregate"
+
+DEADLINE_KEY = "kubeflow.deadline"
+EXCEEDED_KEY = "kubeflow.deadline_exceeded"
+
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class DeadlineExceeded(GatewayTimeout):
+    description = "The request took too long to complete."
+
+
+def get_budgets():
+    return {
+        READ: settings.READ_DEADLINE,
+        WRITE: settings.WRITE_DEADLINE,
+        AGGREGATE: settings.AGGREGATE_DEADLINE,
+    }
+
+
+def route_class(name):
+    """Decorator which sets the route class, and budget, of a route."""
+    if name not in get_budgets():
+        raise ValueError("Unknown route class '%s'" % name)
+
+    def decorator(func):
+        func.deadline_class = name
+        return func
+
+    return decorator
+
+
+def get_route_class():
+    if request.endpoint in current_app.view_functions:
+        view = current_app.view_functions[request.endpoint]
+        name = getattr(view, "deadline_class", None)
+        if name is not None:
+            return name
+
+    return READ if request.method in READ_METHODS else WRITE
+
+
+@bp.before_app_request
+def renew():
+    """Start a new deadline for the current request."""
+    budget = get_budgets()[get_route_class()]
+    request.environ[DEADLINE_KEY] = (
+        time.monotonic() + budget if budget > 0 else None
+    )
+
+
+def remaining():
+    """Return the seconds left for the current request, or None."""
+    if not has_request_context():
+        return None
+
+    deadline = request.environ.get(DEADLINE_KEY)
+    if deadline is None:
+        return None
+
+    return deadline - time.monotonic()
+
+
+def exceeded():
+    """Return the error of the current request, which is counted once."""
+    if has_request_context() and not request.environ.get(EXCEEDED_KEY):
+        request.environ[EXCEEDED_KEY] = True
+        route = request.url_rule.rule if request.url_rule else "none"
+        log.warning("Request %s %s exceeded its deadline",
+                    request.method, request.path)
+        metrics.REQUEST_DEADLINES_EXCEEDED.labels(route=route).inc()
+
+    return DeadlineExceeded()
+
+
+def check():
+    """
+    Raise if the deadline of the current request passed, or return the
+    seconds left, or None.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise exceeded()
+
+    return left
+
+
+def request_timeout(timeout=None, preload=True):
+    """
+    Return the _request_timeout of a call to the API Server.
+
+    timeout: The _request_timeout of the caller, a number or a (connect,
+             read) tuple
+    preload: False for the streaming calls, i.e. the watches
+    """
+    left = check()
+    if left is None:
+        if (timeout is None and preload
+                and settings.K8S_REQUEST_TIMEOUT > 0):  # noqa: W503
+            return settings.K8S_REQUEST_TIMEOUT
+        return timeout
+
+    if timeout is None:
+        return left
+
+    if isinstance(timeout, tuple):
+        return tuple(min(t, left) for t in timeout)
+
+    return min(timeout, left)
@@ -0,0 +1,100 @@
+"""Tests for the deadlines of the requests."""
+
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+from . import deadlines, metrics, settings
+
+
+@mock.patch.object(settings, "READ_DEADLINE", 30)
+@mock.patch.object(settings, "WRITE_DEADLINE", 60)
+@mock.patch.object(settings, "AGGREGATE_DEADLINE", 90)
+class RouteClassTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.register_blueprint(deadlines.bp)
+
+        @self.app.route("/items", methods=["GET", "POST"])
+        def items():
+            return {"remaining": deadlines.remaining()}
+
+        @self.app.route("/all-items")
+        @deadlines.route_class(deadlines.AGGREGATE)
+        def all_items():
+            return {"remaining": deadlines.remaining()}
+
+    def remaining(self, method, path):
+        resp = self.app.test_client().open(path, method=method)
+        return resp.get_json()["remaining"]
+
+    def test_reads(self):
+        self.assertAlmostEqual(self.remaining("GET", "/items"), 30, delta=1)
+
+    def test_writes(self):
+        self.assertAlmostEqual(self.remaining("POST", "/items"), 60, delta=1)
+
+    def test_decorated_routes(self):
+        self.assertAlmostEqual(self.remaining("GET", "/all-items"), 90,
+                               delta=1)
+
+    def test_unknown_route_class(self):
+        with self.assertRaises(ValueError):
+            deadlines.route_class("slow")
+
+    def test_disabled(self):
+        with mock.patch.object(settings, "READ_DEADLINE", 0):
+            self.assertIsNone(self.remaining("GET", "/items"))
+
+
+class RequestTimeoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+
+    def set_remaining(self, seconds):
+        environ = deadlines.request.environ
+        environ[deadlines.DEADLINE_KEY] = (
+            deadlines.time.monotonic() + seconds
+        )
+
+    @mock.patch.object(settings, "K8S_REQUEST_TIMEOUT", 60)
+    def test_calls_outside_of_a_request(self):
+        self.assertEqual(deadlines.request_timeout(), 60)
+        self.assertEqual(deadlines.request_timeout(5), 5)
+        # The watches wait for the events
+        self.assertIsNone(deadlines.request_timeout(preload=False))
+
+    def test_calls_get_the_remaining_budget(self):
+        with self.app.test_request_context("/"):
+            self.set_remaining(10)
+
+            self.assertAlmostEqual(deadlines.request_timeout(), 10, delta=1)
+            self.assertEqual(deadlines.request_timeout(5), 5)
+            self.assertEqual(deadlines.request_timeout((2, 30))[0], 2)
+            self.assertLessEqual(deadlines.request_timeout((2, 30))[1], 10)
+
+    def test_calls_fail_after_the_deadline(self):
+        with self.app.test_request_context("/"):
+            self.set_remaining(-1)
+
+            with self.assertRaises(deadlines.DeadlineExceeded) as cm:
+                deadlines.request_timeout()
+
+        self.assertEqual(cm.exception.code, 504)
+
+    def test_exceeded_requests_are_counted_once(self):
+        counter = metrics.REQUEST_DEADLINES_EXCEEDED.labels(route="none")
+        before = counter._value.get()
+
+        with self.app.test_request_context("/"):
+            deadlines.exceeded()
+            deadlines.exceeded()
+
+        self.assertEqual(counter._value.get(), before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
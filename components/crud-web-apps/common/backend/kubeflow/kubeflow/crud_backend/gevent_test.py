@@ -0,0 +1,95 @@
+"""Tests for the backend in a gevent worker."""
+
+import os
+import subprocess
+import sys
+import textwrap
+import unittest
+
+try:
+    import gevent  # noqa: F401
+except ImportError:
+    gevent = None
+
+# The directory of the kubeflow package
+BACKEND_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "..")
+)
+
+
+def run_patched(script):
+    """
+    Run the script in a new interpreter, after the monkey patches of gevent,
+    as the gevent worker of gunicorn does before it loads the app.
+    """
+    script = "from gevent import monkey\nmonkey.patch_all()\n" + (
+        textwrap.dedent(script)
+    )
+    return subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR,
+        capture_output=True, text=True, timeout=60,
+    )
+
+
+@unittest.skipIf(gevent is None, "gevent is not installed")
+class GeventTest(unittest.TestCase):
+
+    def assertSucceeds(self, script):
+        result = run_patched(script)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_worker_is_cooperative(self):
+        self.assertSucceeds("""
+            from kubeflow.kubeflow.crud_backend import concurrency
+            assert concurrency.is_cooperative()
+        """)
+
+    def test_reads_of_a_route_run_in_greenlets(self):
+        self.assertSucceeds("""
+            import time
+
+            import gevent
+            from kubeflow.kubeflow.crud_backend import concurrency
+
+            def read():
+                time.sleep(0.2)
+                return gevent.getcurrent()
+
+            start = time.monotonic()
+            results = concurrency.gather(read, read, read, read)
+
+            assert time.monotonic() - start < 0.5
+            assert all(isinstance(g, gevent.Greenlet) for g in results[1:])
+        """)
+
+    def test_connection_pools_are_sized_for_the_worker(self):
+        self.assertSucceeds("""
+            import os
+            os.environ["APP_WORKER_CONNECTIONS"] = "300"
+
+            from unittest import mock
+
+            from kubernetes import client, config
+            from kubeflow.kubeflow.crud_backend import api
+
+            with mock.patch.object(config, "load_incluster_config"), \
+                    mock.patch.object(config, "load_kube_config"):
+                pool = api.v1_core.api_client.rest_client.pool_manager
+            assert pool.connection_pool_kw["maxsize"] == 300
+            assert client.Configuration.get_default_copy(
+            ).connection_pool_maxsize == 300
+        """)
+
+    def test_pool_size_setting_takes_precedence(self):
+        self.assertSucceeds("""
+            import os
+            os.environ["APP_K8S_CONNECTION_POOL_SIZE"] = "50"
+
+            from kubeflow.kubeflow.crud_backend import clients
+
+            assert clients.connection_pool_size() == 50
+        """)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+JSON encoding of the responses.
+
+The responses of the list endpoints can be several hundred KB of objects
+with their full metadata. If orjson is installed the responses are encoded
+with it, which is considerably faster than the json module of the standard
+library, otherwise Flask's default encoder is used.
+
+Both encoders convert datetimes to ISO 8601 strings, like the timestamps in
+the K8s objects, and K8s library objects to their JSON representation. The
+output is compact, unless the app runs in debug (development) mode.
+"""
+import datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+from . import api
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def default(obj):
+    """Convert the objects that the JSON encoders do not support."""
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+
+    if isinstance(obj, api.ModelView) or hasattr(obj, "openapi_types"):
+        return api.serialize(obj)
+
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+
+    return DefaultJSONProvider.default(obj)
+
+
+class JSONProvider(DefaultJSONProvider):
+    """JSON provider of the apps, which uses orjson when it is installed."""
+
+    default = staticmethod(default)
+    # The keys are only sorted in the pretty-printed output, for readability
+    sort_keys = False
+
+    def pretty(self):
+        return ((self.compact is None and self._app.debug)
+                or self.compact is False)  # noqa: W503
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+
+        return self.dump_bytes(obj, pretty=False).decode()
+
+    def dump_bytes(self, obj, pretty):
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+        elif self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        data = self.dump_bytes(obj, pretty=self.pretty())
+        return self._app.response_class(data + b"\n",
+                                        mimetype=self.mimetype)
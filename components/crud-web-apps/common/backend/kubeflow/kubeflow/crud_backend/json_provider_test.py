@@ -0,0 +1,59 @@
+"""Tests for the JSON provider of the apps."""
+
+import datetime
+import json
+import unittest
+from unittest import mock
+
+from flask import Flask
+from kubernetes import client
+
+from . import json_provider
+
+NOW = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+DATA = {
+    "b": NOW,
+    "a": client.V1ObjectMeta(name="nb", creation_timestamp=NOW),
+}
+EXPECTED = {
+    "b": "2024-01-01T00:00:00+00:00",
+    "a": {"name": "nb", "creationTimestamp": "2024-01-01T00:00:00+00:00"},
+}
+
+
+class JSONProviderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.json = json_provider.JSONProvider(self.app)
+
+    def test_compact_response(self):
+        self.app.json.compact = True
+
+        with self.app.app_context():
+            resp = self.app.json.response(DATA)
+
+        self.assertEqual(json.loads(resp.data), EXPECTED)
+        self.assertNotIn(b"\n ", resp.data)
+
+    def test_pretty_response_in_development_mode(self):
+        self.app.json.compact = False
+
+        with self.app.app_context():
+            resp = self.app.json.response(DATA)
+
+        self.assertEqual(json.loads(resp.data), EXPECTED)
+        self.assertTrue(resp.data.startswith(b'{\n  "a"'))
+
+    @mock.patch.object(json_provider, "orjson", None)
+    def test_standard_library_fallback(self):
+        self.app.json.compact = True
+
+        with self.app.app_context():
+            resp = self.app.json.response(DATA)
+
+        self.assertEqual(json.loads(resp.data), EXPECTED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Request-scoped memoization.
+
+While handling a single request the backend can end up making the same
+authorization check, or the same read call to the K8s API, multiple times.
+The results of these calls are stored in the context of the current Flask
+request and are reused by the identical calls that follow, until the request
+finishes or a write call is made.
+
+Outside of a request context, i.e. in background threads, the calls are
+always executed.
+
+The results are kept in the environ of the request, like its deadline, so
+that the threads of the concurrent reads, see the concurrency module, share
+them with the thread of the request. An identical call that is made while
+the first one is still running waits for its result.
+"""
+import functools
+import inspect
+import logging
+import threading
+
+from flask import has_request_context, request
+
+from . import deadlines, metrics
+
+log = logging.getLogger(__name__)
+
+MEMO_KEY = "kubeflow.request_memo"
+
+# The result of a call that failed, or hasn't finished yet
+_MISSING = object()
+_lock = threading.Lock()
+
+
+class _Entry(object):
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = _MISSING
+
+
+def _get_memo():
+    if not has_request_context():
+        return None
+
+    with _lock:
+        return request.environ.setdefault(MEMO_KEY, {})
+
+
+def _wait(entry, kind, func, *args, **kwargs):
+    """Return the result of a call that another thread is making."""
+    if not entry.done.wait(deadlines.remaining()):
+        raise deadlines.exceeded()
+
+    if entry.result is _MISSING:
+        # The call failed, and its error was raised to its own caller
+        return func(*args, **kwargs)
+
+    metrics.REQUEST_MEMO_REQUESTS.labels(kind=kind, result="hit").inc()
+    return entry.result
+
+
+def get_or_call(kind, key, func, *args, **kwargs):
+    """
+    Return the memoized result for the key, or call func and memoize its
+    result for the rest of the request.
+
+    kind: The kind of the call, used for the metrics, i.e. "authz" or "read"
+    key: A hashable key that identifies the call
+    """
+    memo = _get_memo()
+    if memo is None:
+        return func(*args, **kwargs)
+
+    memo_key = (kind, key)
+    with _lock:
+        entry = memo.get(memo_key)
+        if entry is None:
+            entry = memo[memo_key] = _Entry()
+            leader = True
+        else:
+            leader = False
+
+    if not leader:
+        return _wait(entry, kind, func, *args, **kwargs)
+
+    metrics.REQUEST_MEMO_REQUESTS.labels(kind=kind, result="miss").inc()
+    try:
+        entry.result = func(*args, **kwargs)
+    except Exception:
+        with _lock:
+            if memo.get(memo_key) is entry:
+                del memo[memo_key]
+        raise
+    finally:
+        entry.done.set()
+
+    return entry.result
+
+
+def invalidate(kind=None):
+    """Drop the memoized results of the current request."""
+    memo = _get_memo()
+    if memo is None:
+        return
+
+    with _lock:
+        if kind is None:
+            memo.clear()
+            return
+
+        for memo_key in [k for k in memo if k[0] == kind]:
+            del memo[memo_key]
+
+
+def request_cached(func):
+    """
+    Decorator for the read functions of the api module. Identical calls, in
+    the same request, will return the same object which must not be modified
+    by the callers.
+    """
+
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # Calls with positional and keyword arguments share the same key
+        arguments = signature.bind(*args, **kwargs)
+        arguments.apply_defaults()
+        key = (func.__module__, func.__name__,
+               tuple(arguments.arguments.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        return get_or_call("read", key, func, *args, **kwargs)
+
+    return wrapper
+
+
+def invalidates_request_cache(func):
+    """
+    Decorator for the write functions of the api module. The memoized read
+    results of the request are dropped, since they might now be stale.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            invalidate("read")
+
+    return wrapper
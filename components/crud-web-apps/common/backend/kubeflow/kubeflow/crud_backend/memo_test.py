@@ -0,0 +1,86 @@
+"""Tests for the request-scoped memoization."""
+
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+from . import concurrency, memo
+
+
+class RequestMemoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.read = mock.Mock(side_effect=lambda namespace, name=None: [])
+
+        @memo.request_cached
+        def get_object(namespace, name=None):
+            return self.read(namespace, name)
+
+        @memo.invalidates_request_cache
+        def patch_object(namespace, name):
+            return None
+
+        self.get_object = get_object
+        self.patch_object = patch_object
+
+    def test_identical_reads_are_memoized_per_request(self):
+        with self.app.test_request_context():
+            first = self.get_object("team-a", "nb")
+            second = self.get_object(namespace="team-a", name="nb")
+            self.get_object("team-b", "nb")
+
+        self.assertIs(first, second)
+        self.assertEqual(self.read.call_count, 2)
+
+        with self.app.test_request_context():
+            self.get_object("team-a", "nb")
+
+        self.assertEqual(self.read.call_count, 3)
+
+    def test_writes_invalidate_the_memoized_reads(self):
+        with self.app.test_request_context():
+            self.get_object("team-a", "nb")
+            self.patch_object("team-a", "nb")
+            self.get_object("team-a", "nb")
+
+        self.assertEqual(self.read.call_count, 2)
+
+    def test_calls_outside_of_a_request_are_not_memoized(self):
+        self.get_object("team-a", "nb")
+        self.get_object("team-a", "nb")
+
+        self.assertEqual(self.read.call_count, 2)
+
+    def test_authorization_checks_are_memoized(self):
+        check = mock.Mock(return_value=True)
+        with self.app.test_request_context():
+            memo.get_or_call("authz", ("user", "list"), check)
+            memo.get_or_call("authz", ("user", "list"), check)
+            memo.invalidate("read")
+            memo.get_or_call("authz", ("user", "list"), check)
+
+        check.assert_called_once()
+
+    @mock.patch.object(concurrency.settings, "FANOUT_MAX_WORKERS", 2)
+    def test_concurrent_reads_share_the_memo(self):
+        with self.app.test_request_context():
+            results = concurrency.gather(
+                lambda: self.get_object("team-a", "nb"),
+                lambda: self.get_object("team-a", "nb"),
+                lambda: self.get_object("team-a", "nb"),
+            )
+            self.get_object("team-a", "nb")
+
+            concurrency.gather(lambda: memo.invalidate("read"),
+                               lambda: None)
+            self.get_object("team-a", "nb")
+
+        self.assertEqual(self.read.call_count, 2)
+        self.assertIs(results[0], results[1])
+        self.assertIs(results[1], results[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,10 +2,92 @@ import logging
 import sys
 
 from flask import Flask
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
 from prometheus_flask_exporter import PrometheusMetrics
 
 log = logging.getLogger(__name__)
 
+AUTHZ_CACHE_REQUESTS = Counter(
+    "authz_cache_requests_total",
+    "Authorization decisions looked up in the SubjectAccessReview cache",
+    ["result"],
+)
+REQUEST_MEMO_REQUESTS = Counter(
+    "request_memo_requests_total",
+    "Authorization checks and K8s reads looked up in the request's memo",
+    ["kind", "result"],
+)
+SINGLEFLIGHT_CALLS = Counter(
+    "singleflight_calls_total",
+    "K8s reads that were sent to the API Server (leader) or that shared an "
+    "identical in-flight read (coalesced)",
+    ["result"],
+)
+
+K8S_CLIENT_THROTTLE_SECONDS = Histogram(
+    "k8s_client_throttle_seconds",
+    "Time the requests to the API Server waited for the client-side rate "
+    "limit, by priority (write, read or background)",
+    ["priority"],
+    buckets=(0, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+K8S_CLIENT_RETRIES = Counter(
+    "k8s_client_retries_total",
+    "Requests to the API Server that were sent again, by the status of the "
+    "failed attempt",
+    ["status"],
+)
+REQUEST_DEADLINES_EXCEEDED = Counter(
+    "request_deadlines_exceeded_total",
+    "Requests that ran out of their deadline, by route",
+    ["route"],
+)
+K8S_CLIENT_BREAKER_OPEN = Gauge(
+    "k8s_client_breaker_open",
+    "1 while the circuit breaker of the API Server requests is open",
+)
+
+
+class ConnectionPoolCollector(object):
+    """Usage of the connection pools of the K8s clients, when scraped."""
+
+    def __init__(self, get_pools):
+        self.get_pools = get_pools
+
+    def collect(self):
+        size = GaugeMetricFamily(
+            "k8s_client_pool_max_connections",
+            "Maximum connections kept in the pools of the K8s clients",
+        )
+        idle = GaugeMetricFamily(
+            "k8s_client_pool_idle_connections",
+            "Open connections waiting in the pools of the K8s clients",
+        )
+        opened = CounterMetricFamily(
+            "k8s_client_pool_connections",
+            "Connections, and TLS handshakes, opened by the K8s clients",
+        )
+        requests = CounterMetricFamily(
+            "k8s_client_pool_requests",
+            "Requests sent through the pools of the K8s clients",
+        )
+
+        pools = self.get_pools()
+        size.add_metric([], sum(pool.pool.maxsize for pool in pools
+                                if pool.pool is not None))
+        idle.add_metric([], sum(1 for pool in pools if pool.pool is not None
+                                for conn in list(pool.pool.queue)
+                                if conn is not None))
+        opened.add_metric([], sum(pool.num_connections for pool in pools))
+        requests.add_metric([], sum(pool.num_requests for pool in pools))
+
+        return [size, idle, opened, requests]
+
+
+def register_connection_pools(get_pools):
+    REGISTRY.register(ConnectionPoolCollector(get_pools))
+
 
 def _get_backend_version() -> str:
     """Get the backend version.
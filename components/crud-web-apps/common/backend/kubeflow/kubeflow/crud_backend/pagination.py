@@ -0,0 +1,80 @@
+"""
+The `limit` and `continue` parameters of the list endpoints.
+
+The endpoints which return K8s objects as they are, i.e. the Events, pass
+the parameters to the API Server and return its continue token. The
+endpoints which return processed lists, i.e. the Notebooks, page the
+processed items, with an opaque continue token that holds the offset of the
+next page.
+"""
+import base64
+import binascii
+import json
+
+from flask import request
+from werkzeug.exceptions import BadRequest
+
+from . import api, settings
+
+LIMIT_PARAM = "limit"
+CONTINUE_PARAM = "continue"
+
+
+def get_page_params():
+    """Return the limit and the continue token of the request, or None."""
+    limit = request.args.get(LIMIT_PARAM)
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = -1
+
+        if limit <= 0:
+            raise BadRequest("'%s' must be a positive integer" % LIMIT_PARAM)
+
+        if settings.LIST_PAGE_SIZE > 0:
+            limit = min(limit, settings.LIST_PAGE_SIZE)
+
+    return limit, request.args.get(CONTINUE_PARAM) or None
+
+
+def encode_token(offset):
+    data = json.dumps({"offset": offset}).encode()
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_token(token):
+    try:
+        offset = json.loads(base64.urlsafe_b64decode(token.encode()))["offset"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        offset = None
+
+    if not isinstance(offset, int) or offset < 0:
+        raise BadRequest("Invalid '%s' token" % CONTINUE_PARAM)
+
+    return offset
+
+
+def paginate(items, limit, token=None):
+    """
+    Return a page of the processed items and the continue token of the next
+    page, or None if it is the last page.
+    """
+    offset = decode_token(token) if token else 0
+    if limit is None:
+        return items[offset:], None
+
+    end = offset + limit
+    return items[offset:end], encode_token(end) if end < len(items) else None
+
+
+def raw_list_response(data_field, resp):
+    """
+    Return the items of a raw list response of the API Server, along with
+    its continue token.
+    """
+    metadata = resp.get("metadata") or {}
+    return api.success_response(
+        data_field, resp.get("items") or [],
+        **{CONTINUE_PARAM: metadata.get("continue") or None}
+    )
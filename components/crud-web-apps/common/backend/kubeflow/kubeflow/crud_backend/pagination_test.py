@@ -0,0 +1,53 @@
+"""Tests for the limit and continue parameters of the list endpoints."""
+
+import unittest
+from unittest import mock
+
+from flask import Flask
+from werkzeug.exceptions import BadRequest
+
+from . import pagination
+
+
+class GetPageParamsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+
+    def _params(self, query_string):
+        with self.app.test_request_context("/", query_string=query_string):
+            return pagination.get_page_params()
+
+    def test_no_parameters(self):
+        self.assertEqual(self._params({}), (None, None))
+
+    @mock.patch.object(pagination.settings, "LIST_PAGE_SIZE", 100)
+    def test_limit_is_capped_to_the_page_size(self):
+        self.assertEqual(self._params({"limit": "10", "continue": "abc"}),
+                         (10, "abc"))
+        self.assertEqual(self._params({"limit": "1000"}), (100, None))
+
+    def test_invalid_limit(self):
+        for limit in ["0", "-1", "ten"]:
+            with self.assertRaises(BadRequest):
+                self._params({"limit": limit})
+
+
+class PaginateTest(unittest.TestCase):
+
+    def test_last_page_has_no_token(self):
+        page, token = pagination.paginate([1, 2, 3], 2)
+        last, last_token = pagination.paginate([1, 2, 3], 2, token)
+
+        self.assertEqual(page, [1, 2])
+        self.assertEqual(last, [3])
+        self.assertIsNone(last_token)
+
+    def test_invalid_token(self):
+        for token in ["not-base64!", pagination.encode_token(-1)]:
+            with self.assertRaises(BadRequest):
+                pagination.paginate([1, 2, 3], 2, token)
+
+
+if __name__ == "__main__":
+    unittest.main()
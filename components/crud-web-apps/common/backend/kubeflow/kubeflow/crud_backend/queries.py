@@ -0,0 +1,163 @@
+"""
+Filtering, searching and sorting of the processed lists.
+
+The list endpoints accept the following query parameters, which are
+evaluated on the items as the endpoint returns them, before the pagination:
+
+    status=ready,error   The phase of the status is one of the values
+    owner=user@kf.org    The owner is one of the values
+    serverType=jupyter   The server type is one of the values
+    image=scipy          The image contains the value
+    name=nb              The name contains the value, case insensitive
+    sort=-age            Sort by age, name or last_activity. The `-` prefix
+                         sorts in descending order, i.e. the newest first
+
+The items which do not have a field, i.e. the PVCs have no owner, never
+match a filter on it, and are sorted after the items which have it.
+
+The `fields` parameter selects the fields of the items in the response,
+i.e. fields=name,status.phase,metadata.labels, after the filters, sorting
+and pagination have been applied on the whole items.
+"""
+import datetime as dt
+
+from flask import request
+from werkzeug.exceptions import BadRequest
+
+SORT_PARAM = "sort"
+FIELDS_PARAM = "fields"
+
+
+def _field(*path):
+    def get(item):
+        for key in path:
+            if not isinstance(item, dict):
+                return None
+            item = item.get(key)
+        return item
+
+    return get
+
+
+def _one_of(get):
+    def match(item, value):
+        return get(item) in value.split(",")
+
+    return match
+
+
+def _contains(get, ignore_case=False):
+    def match(item, value):
+        field = get(item)
+        if not isinstance(field, str):
+            return False
+        if ignore_case:
+            return value.lower() in field.lower()
+        return value in field
+
+    return match
+
+
+FILTERS = {
+    "status": _one_of(_field("status", "phase")),
+    "owner": _one_of(_field("owner")),
+    "serverType": _one_of(_field("serverType")),
+    "image": _contains(_field("image")),
+    "name": _contains(_field("name"), ignore_case=True),
+}
+
+SORT_FIELDS = {
+    "age": _field("age"),
+    "name": _field("name"),
+    "last_activity": _field("last_activity"),
+}
+
+
+def sort_value(value):
+    """
+    The timestamps of the items are either datetimes or strings, as in the
+    K8s objects, which are compared as strings in the same format.
+    """
+    if isinstance(value, dt.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(dt.timezone.utc)
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    return value
+
+
+def get_query():
+    """
+    Return the filter and sort parameters of the request, as a sorted tuple
+    of (name, value) pairs, which also identifies the filtered list.
+    """
+    query = tuple(sorted(
+        (name, request.args[name]) for name in FILTERS
+        if request.args.get(name)
+    ))
+
+    sort = request.args.get(SORT_PARAM)
+    if sort:
+        if sort.lstrip("-") not in SORT_FIELDS:
+            raise BadRequest("'%s' must be one of: %s"
+                             % (SORT_PARAM, ", ".join(SORT_FIELDS)))
+        query += ((SORT_PARAM, sort),)
+
+    return query
+
+
+def apply(items, query):
+    """Return the items which match the query, in the order of the query."""
+    sort = None
+    for name, value in query:
+        if name == SORT_PARAM:
+            sort = value
+            continue
+
+        match = FILTERS[name]
+        items = [item for item in items if match(item, value)]
+
+    if sort is None:
+        return list(items)
+
+    get = SORT_FIELDS[sort.lstrip("-")]
+    reverse = sort.startswith("-")
+    present = [item for item in items if get(item) not in (None, "")]
+    missing = [item for item in items if get(item) in (None, "")]
+    present.sort(key=lambda item: sort_value(get(item)), reverse=reverse)
+
+    return present + missing
+
+
+def get_fields():
+    """Return the field paths of the `fields` parameter, or None."""
+    fields = request.args.get(FIELDS_PARAM)
+    if not fields:
+        return None
+
+    paths = [tuple(path.split(".")) for path in fields.split(",") if path]
+    if not paths or any("" in path for path in paths):
+        raise BadRequest("Invalid '%s' parameter" % FIELDS_PARAM)
+
+    return paths
+
+
+def project(item, fields):
+    """Return a copy of the item with only the given field paths."""
+    if fields is None:
+        return item
+
+    projected = {}
+    for path in fields:
+        value = item
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = projected
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+
+    return projected
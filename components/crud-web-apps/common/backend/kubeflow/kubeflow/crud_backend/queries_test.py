@@ -0,0 +1,99 @@
+"""Tests for the filtering and sorting of the processed lists."""
+
+import datetime as dt
+import unittest
+
+from flask import Flask
+from werkzeug.exceptions import BadRequest
+
+from . import queries
+
+
+def _item(name, phase, owner=None, age="2024-01-01T00:00:00Z", **fields):
+    item = {"name": name, "status": {"phase": phase}, "age": age,
+            "owner": owner}
+    item.update(fields)
+    return item
+
+
+class QueryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.items = [
+            _item("Notebook-a", "ready", "alice", "2024-01-03T00:00:00Z",
+                  image="jupyter-scipy:v1", last_activity=""),
+            _item("notebook-b", "error", "bob", "2024-01-01T00:00:00Z",
+                  image="codeserver:v1",
+                  last_activity="2024-01-05T00:00:00Z"),
+            _item("container-c", "error", "alice",
+                  dt.datetime(2024, 1, 2, tzinfo=dt.timezone.utc),
+                  image="nginx", last_activity=None),
+        ]
+
+    def _names(self, query_string):
+        with self.app.test_request_context("/", query_string=query_string):
+            query = queries.get_query()
+        return [item["name"] for item in queries.apply(self.items, query)]
+
+    def test_no_query_keeps_the_items(self):
+        self.assertEqual(self._names({}),
+                         ["Notebook-a", "notebook-b", "container-c"])
+
+    def test_filters_are_combined(self):
+        self.assertEqual(self._names({"status": "error", "owner": "alice"}),
+                         ["container-c"])
+        self.assertEqual(self._names({"status": "ready,error",
+                                      "name": "NOTEBOOK"}),
+                         ["Notebook-a", "notebook-b"])
+        self.assertEqual(self._names({"image": "scipy"}), ["Notebook-a"])
+
+    def test_items_without_the_field_do_not_match(self):
+        self.assertEqual(self._names({"serverType": "jupyter"}), [])
+
+    def test_sort_by_age_with_mixed_timestamps(self):
+        self.assertEqual(self._names({"sort": "age"}),
+                         ["notebook-b", "container-c", "Notebook-a"])
+        self.assertEqual(self._names({"sort": "-age"}),
+                         ["Notebook-a", "container-c", "notebook-b"])
+
+    def test_items_without_the_sort_field_are_last(self):
+        self.assertEqual(self._names({"sort": "-last_activity"}),
+                         ["notebook-b", "Notebook-a", "container-c"])
+
+    def test_invalid_sort_field(self):
+        with self.assertRaises(BadRequest):
+            self._names({"sort": "cpu"})
+
+
+class ProjectTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+
+    def _fields(self, fields):
+        with self.app.test_request_context("/", query_string={
+                "fields": fields}):
+            return queries.get_fields()
+
+    def test_nested_fields_are_kept(self):
+        item = _item("nb", "ready", metadata={"labels": {"app": "nb"},
+                                              "uid": "uid-1"})
+
+        projected = queries.project(
+            item, self._fields("name,status.phase,metadata.labels,missing.x")
+        )
+
+        self.assertEqual(projected, {
+            "name": "nb",
+            "status": {"phase": "ready"},
+            "metadata": {"labels": {"app": "nb"}},
+        })
+
+    def test_invalid_fields(self):
+        with self.assertRaises(BadRequest):
+            self._fields("name,status.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""
+Retries of the requests to the API Server.
+
+The idempotent requests, i.e. the reads, that fail with a transient error of
+the API Server, a 429 or a 5xx response, or a timeout, are retried up to
+APP_K8S_RETRY_ATTEMPTS times, after an exponential backoff with jitter, or
+after the Retry-After of the response. The requests that the circuit breaker
+rejects are not retried. The connection pool of the clients only retries the
+connections that fail, for all the requests, see APP_K8S_CLIENT_RETRIES, so
+that the attempts are not multiplied.
+
+A patch that is built from an object read beforehand carries the
+resourceVersion of that object, see with_resource_version, so that the API
+Server rejects it with a 409 Conflict if the object was modified in between.
+read_modify_write then reads the object again, from the API Server instead
+of the cache which may not have seen the change yet, and builds a new patch.
+
+A request is not retried if the backoff would exceed its deadline.
+"""
+import logging
+import random
+import time
+
+from kubernetes.client.rest import ApiException
+from urllib3.exceptions import ConnectTimeoutError, HTTPError
+
+from . import breaker, cache, deadlines, memo, metrics, settings
+
+log = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+HTTP_STATUS_CONFLICT = 409
+# Status of the retries metric for the timeouts and the dropped connections
+NETWORK_ERROR = "network"
+
+
+def backoff(attempt, retry_after=None):
+    """Return the seconds to wait before the attempt, counting from 0."""
+    if retry_after is not None:
+        return min(retry_after, settings.K8S_RETRY_MAX_BACKOFF)
+
+    ceiling = min(settings.K8S_RETRY_MAX_BACKOFF,
+                  settings.K8S_RETRY_BACKOFF * 2 ** attempt)
+    return random.uniform(0, ceiling)
+
+
+def get_retry_after(error):
+    """Return the seconds of the Retry-After header of the error, or None."""
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return max(float(headers.get("Retry-After")), 0)
+    except (TypeError, ValueError):
+        # Missing, or an HTTP date, which the API Server doesn't send
+        return None
+
+
+def within_deadline(delay):
+    """Return True if the request has time left after the delay."""
+    left = deadlines.remaining()
+    return left is None or delay < left
+
+
+def is_connection_error(error):
+    """Return True if the connection pool already retried the error."""
+    return isinstance(getattr(error, "reason", error), ConnectTimeoutError)
+
+
+def is_retryable(error):
+    return breaker.is_failure(error) and not is_connection_error(error)
+
+
+def call(method, func, *args, **kwargs):
+    """Send a request to the API Server, retrying the transient errors."""
+    if method.upper() not in IDEMPOTENT_METHODS:
+        return func(method, *args, **kwargs)
+
+    attempt = 0
+    while True:
+        try:
+            return func(method, *args, **kwargs)
+        except (ApiException, HTTPError) as e:
+            if not is_retryable(e) or (
+                    attempt + 1 >= settings.K8S_RETRY_ATTEMPTS):
+                raise
+
+            delay = backoff(attempt, get_retry_after(e))
+            if not within_deadline(delay):
+                raise
+
+            log.warning("Retrying a request to the API Server in %.2fs: %s",
+                        delay, getattr(e, "reason", e))
+            status = getattr(e, "status", NETWORK_ERROR)
+            metrics.K8S_CLIENT_RETRIES.labels(status=status).inc()
+            time.sleep(delay)
+            attempt += 1
+
+
+def get_resource_version(obj):
+    """Return the resourceVersion of a dict or a typed object, or None."""
+    if isinstance(obj, dict):
+        return (obj.get("metadata") or {}).get("resourceVersion")
+
+    return getattr(getattr(obj, "metadata", None), "resource_version", None)
+
+
+def with_resource_version(body, obj):
+    """
+    Return the patch body with the resourceVersion of the object it was built
+    from, so that the API Server rejects it with a 409 Conflict if the object
+    was modified since it was read.
+    """
+    resource_version = get_resource_version(obj)
+    if resource_version is None:
+        return body
+
+    metadata = dict(body.get("metadata") or {})
+    metadata["resourceVersion"] = resource_version
+    return {**body, "metadata": metadata}
+
+
+def read_modify_write(func, *args, **kwargs):
+    """
+    Call func, which reads an object and patches it, again on a 409 Conflict.
+
+    The reads memoized for the request are dropped before each attempt, and
+    the objects are read from the API Server, so that func builds its patch
+    from the current object.
+    """
+    attempt = 0
+    while True:
+        try:
+            if attempt == 0:
+                return func(*args, **kwargs)
+
+            with cache.read_through():
+                return func(*args, **kwargs)
+        except ApiException as e:
+            if e.status != HTTP_STATUS_CONFLICT or (
+                    attempt + 1 >= settings.K8S_RETRY_ATTEMPTS):
+                raise
+
+            delay = backoff(attempt)
+            if not within_deadline(delay):
+                raise
+
+            log.info("Conflict in %s, reading the object again",
+                     func.__name__)
+            metrics.K8S_CLIENT_RETRIES.labels(status=e.status).inc()
+            time.sleep(delay)
+            memo.invalidate("read")
+            attempt += 1
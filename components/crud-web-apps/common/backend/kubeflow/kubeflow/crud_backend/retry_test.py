@@ -0,0 +1,178 @@
+"""Tests for the retries of the requests to the API Server."""
+
+import unittest
+from unittest import mock
+
+from kubernetes.client.rest import ApiException
+from urllib3.exceptions import (MaxRetryError, NewConnectionError,
+                                ReadTimeoutError)
+
+from . import breaker, cache, retry, settings
+
+
+def api_error(status, retry_after=None):
+    error = ApiException(status=status, reason="Error")
+    error.headers = {}
+    if retry_after is not None:
+        error.headers["Retry-After"] = retry_after
+    return error
+
+
+@mock.patch.object(retry.time, "sleep")
+@mock.patch.object(settings, "K8S_RETRY_ATTEMPTS", 3)
+class CallTest(unittest.TestCase):
+
+    def test_transient_errors_of_reads_are_retried(self, sleep):
+        send = mock.Mock(side_effect=[api_error(503), api_error(500), "ok"])
+
+        self.assertEqual(retry.call("GET", send, "/api"), "ok")
+        self.assertEqual(send.call_count, 3)
+        send.assert_called_with("GET", "/api")
+
+    def test_timeouts_of_reads_are_retried(self, sleep):
+        timeout = ReadTimeoutError(None, "/api", "Read timed out")
+        send = mock.Mock(side_effect=[MaxRetryError(None, "/api", timeout),
+                                      "ok"])
+
+        self.assertEqual(retry.call("GET", send, "/api"), "ok")
+        self.assertEqual(send.call_count, 2)
+
+    def test_connection_errors_are_left_to_the_pool(self, sleep):
+        refused = NewConnectionError(None, "Connection refused")
+        send = mock.Mock(side_effect=MaxRetryError(None, "/api", refused))
+
+        with self.assertRaises(MaxRetryError):
+            retry.call("GET", send)
+
+        self.assertEqual(send.call_count, 1)
+
+    def test_attempts_are_limited(self, sleep):
+        send = mock.Mock(side_effect=api_error(503))
+
+        with self.assertRaises(ApiException):
+            retry.call("GET", send)
+
+        self.assertEqual(send.call_count, 3)
+
+    def test_writes_are_not_retried(self, sleep):
+        send = mock.Mock(side_effect=api_error(503))
+
+        with self.assertRaises(ApiException):
+            retry.call("POST", send)
+
+        self.assertEqual(send.call_count, 1)
+
+    def test_client_errors_are_not_retried(self, sleep):
+        send = mock.Mock(side_effect=api_error(404))
+
+        with self.assertRaises(ApiException):
+            retry.call("GET", send)
+
+        self.assertEqual(send.call_count, 1)
+
+    def test_open_breaker_is_not_retried(self, sleep):
+        send = mock.Mock(side_effect=breaker.CircuitOpenError(10))
+
+        with self.assertRaises(breaker.CircuitOpenError):
+            retry.call("GET", send)
+
+        self.assertEqual(send.call_count, 1)
+
+    def test_retries_stop_at_the_deadline(self, sleep):
+        send = mock.Mock(side_effect=[api_error(503, retry_after="2"), "ok"])
+
+        with mock.patch.object(retry.deadlines, "remaining", return_value=1):
+            with self.assertRaises(ApiException):
+                retry.call("GET", send)
+
+        sleep.assert_not_called()
+
+    def test_retry_after_is_honored(self, sleep):
+        send = mock.Mock(side_effect=[api_error(429, retry_after="2"), "ok"])
+
+        retry.call("GET", send)
+
+        sleep.assert_called_once_with(2)
+
+
+class BackoffTest(unittest.TestCase):
+
+    @mock.patch.object(settings, "K8S_RETRY_BACKOFF", 0.2)
+    @mock.patch.object(settings, "K8S_RETRY_MAX_BACKOFF", 1)
+    def test_backoff_is_capped(self):
+        delays = [retry.backoff(attempt) for attempt in range(10)]
+
+        self.assertTrue(all(0 <= delay <= 1 for delay in delays))
+
+
+@mock.patch.object(retry.time, "sleep")
+class ReadModifyWriteTest(unittest.TestCase):
+
+    @mock.patch.object(retry.memo, "invalidate")
+    def test_conflicts_read_the_object_again(self, invalidate, sleep):
+        patch = mock.Mock(__name__="patch", side_effect=[api_error(409), "ok"])
+
+        self.assertEqual(retry.read_modify_write(patch, "nb", "team-a"), "ok")
+        patch.assert_called_with("nb", "team-a")
+        self.assertEqual(patch.call_count, 2)
+        invalidate.assert_called_once_with("read")
+
+    def test_other_errors_are_raised(self, sleep):
+        patch = mock.Mock(__name__="patch", side_effect=api_error(422))
+
+        with self.assertRaises(ApiException):
+            retry.read_modify_write(patch)
+
+        self.assertEqual(patch.call_count, 1)
+
+    @mock.patch.object(cache.settings, "CACHE_ENABLED", True)
+    def test_retries_read_past_a_stale_cache(self, sleep):
+        def list_notebooks(namespace, **kwargs):
+            return {"metadata": {"resourceVersion": "1"}, "items": [
+                {"metadata": {"name": "nb", "namespace": "team-a",
+                              "resourceVersion": "1"}},
+            ]}
+
+        informer = cache.Informer(list_notebooks, "team-a")
+        informer._relist()
+        cache._informers[("list_notebooks", ("team-a",))] = informer
+        self.addCleanup(cache._informers.clear)
+        current = {"metadata": {"name": "nb", "resourceVersion": "2"}}
+        read_func = mock.Mock(return_value=current)
+
+        def patch():
+            obj = cache.get_object(read_func, list_notebooks, "nb", "team-a")
+            if retry.get_resource_version(obj) != "2":
+                raise api_error(409)
+            return "ok"
+
+        self.assertEqual(retry.read_modify_write(patch), "ok")
+        read_func.assert_called_once_with("nb", "team-a")
+
+
+class WithResourceVersionTest(unittest.TestCase):
+
+    def test_the_version_of_a_dict_is_added(self):
+        notebook = {"metadata": {"resourceVersion": "42"}}
+        body = {"metadata": {"annotations": {"a": "b"}}, "spec": {}}
+
+        self.assertEqual(retry.with_resource_version(body, notebook), {
+            "metadata": {"annotations": {"a": "b"}, "resourceVersion": "42"},
+            "spec": {},
+        })
+        self.assertNotIn("resourceVersion", body["metadata"])
+
+    def test_the_version_of_a_typed_object_is_added(self):
+        service = mock.Mock()
+        service.metadata.resource_version = "7"
+
+        body = retry.with_resource_version({"spec": {}}, service)
+        self.assertEqual(body["metadata"], {"resourceVersion": "7"})
+
+    def test_objects_without_a_version_are_ignored(self):
+        body = {"spec": {}}
+        self.assertIs(retry.with_resource_version(body, {}), body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,3 +4,87 @@ SECURE_COOKIES = os.getenv("APP_SECURE_COOKIES", "true").lower() == "true"
 DISABLE_AUTH = os.getenv("APP_DISABLE_AUTH", "false").lower() == "true"
 USER_HEADER = os.getenv("USERID_HEADER", "kubeflow-userid")
 USER_PREFIX = os.getenv("USERID_PREFIX", ":")
+
+# Watch-backed cache for the list functions of the api module
+CACHE_ENABLED = os.getenv("APP_CACHE_ENABLED", "true").lower() == "true"
+CACHE_IDLE_TIMEOUT = int(os.getenv("APP_CACHE_IDLE_TIMEOUT", "300"))
+CACHE_SYNC_TIMEOUT = float(os.getenv("APP_CACHE_SYNC_TIMEOUT", "10"))
+CACHE_WATCH_TIMEOUT = int(os.getenv("APP_CACHE_WATCH_TIMEOUT", "300"))
+CACHE_FAILURE_COOLDOWN = float(os.getenv("APP_CACHE_FAILURE_COOLDOWN", "300"))
+
+# Cache for the decisions of the SubjectAccessReviews
+AUTHZ_CACHE_ENABLED = os.getenv(
+    "APP_AUTHZ_CACHE_ENABLED", "true"
+).lower() == "true"
+AUTHZ_CACHE_SIZE = int(os.getenv("APP_AUTHZ_CACHE_SIZE", "4096"))
+AUTHZ_CACHE_ALLOW_TTL = float(os.getenv("APP_AUTHZ_CACHE_ALLOW_TTL", "30"))
+AUTHZ_CACHE_DENY_TTL = float(os.getenv("APP_AUTHZ_CACHE_DENY_TTL", "5"))
+
+# Snapshots of the processed lists, for the event streams and delta lists
+SNAPSHOT_HISTORY_LISTS = int(os.getenv("APP_SNAPSHOT_HISTORY_LISTS", "1024"))
+SNAPSHOT_HISTORY_VERSIONS = int(
+    os.getenv("APP_SNAPSHOT_HISTORY_VERSIONS", "16")
+)
+
+# Server-Sent Events streams of the lists
+STREAM_POLL_INTERVAL = float(os.getenv("APP_STREAM_POLL_INTERVAL", "5"))
+STREAM_MIN_INTERVAL = float(os.getenv("APP_STREAM_MIN_INTERVAL", "0.5"))
+STREAM_HEARTBEAT_INTERVAL = float(
+    os.getenv("APP_STREAM_HEARTBEAT_INTERVAL", "15")
+)
+STREAM_MAX_DURATION = float(os.getenv("APP_STREAM_MAX_DURATION", "300"))
+
+# Size of the pages in which the collections are requested from the API Server
+LIST_PAGE_SIZE = int(os.getenv("APP_LIST_PAGE_SIZE", "500"))
+
+# Drop the managedFields and last-applied-configuration of the objects
+STRIP_MANAGED_FIELDS = os.getenv(
+    "APP_STRIP_MANAGED_FIELDS", "true"
+).lower() == "true"
+
+# Threads of the pool for the concurrent reads of the routes
+FANOUT_MAX_WORKERS = int(os.getenv("APP_FANOUT_MAX_WORKERS", "16"))
+
+# Identical concurrent reads share a single call to the API Server
+SINGLEFLIGHT_ENABLED = os.getenv(
+    "APP_SINGLEFLIGHT_ENABLED", "true"
+).lower() == "true"
+
+# Concurrent requests of a gevent worker, see the --worker-connections option
+# of gunicorn
+WORKER_CONNECTIONS = int(os.getenv("APP_WORKER_CONNECTIONS", "200"))
+
+# Connections of the pool of the K8s clients, 0 for the size that suits the
+# worker class
+K8S_CONNECTION_POOL_SIZE = int(
+    os.getenv("APP_K8S_CONNECTION_POOL_SIZE", "0")
+)
+
+# Retries of the K8s clients on connection errors
+K8S_CLIENT_RETRIES = int(os.getenv("APP_K8S_CLIENT_RETRIES", "3"))
+
+# TCP keep-alive of the idle connections to the API Server, 0 disables it
+K8S_KEEPALIVE_IDLE = int(os.getenv("APP_K8S_KEEPALIVE_IDLE", "60"))
+K8S_KEEPALIVE_INTERVAL = int(os.getenv("APP_K8S_KEEPALIVE_INTERVAL", "15"))
+
+# Client-side rate limit of the requests to the API Server, 0 disables it
+K8S_QPS = float(os.getenv("APP_K8S_QPS", "50"))
+K8S_BURST = int(os.getenv("APP_K8S_BURST", "100"))
+K8S_MAX_IN_FLIGHT = int(os.getenv("APP_K8S_MAX_IN_FLIGHT", "64"))
+
+# Retries of the transient errors of the API Server, and of the conflicts
+K8S_RETRY_ATTEMPTS = int(os.getenv("APP_K8S_RETRY_ATTEMPTS", "3"))
+K8S_RETRY_BACKOFF = float(os.getenv("APP_K8S_RETRY_BACKOFF", "0.2"))
+K8S_RETRY_MAX_BACKOFF = float(os.getenv("APP_K8S_RETRY_MAX_BACKOFF", "5"))
+
+# Circuit breaker of the requests to the API Server, 0 disables it
+K8S_BREAKER_THRESHOLD = int(os.getenv("APP_K8S_BREAKER_THRESHOLD", "5"))
+K8S_BREAKER_COOLDOWN = float(os.getenv("APP_K8S_BREAKER_COOLDOWN", "30"))
+
+# Seconds of the deadlines of the requests, by route class, 0 disables them
+READ_DEADLINE = float(os.getenv("APP_READ_DEADLINE", "30"))
+WRITE_DEADLINE = float(os.getenv("APP_WRITE_DEADLINE", "60"))
+AGGREGATE_DEADLINE = float(os.getenv("APP_AGGREGATE_DEADLINE", "60"))
+
+# Timeout of the calls to the API Server outside of a request
+K8S_REQUEST_TIMEOUT = float(os.getenv("APP_K8S_REQUEST_TIMEOUT", "60"))
@@ -0,0 +1,118 @@
+"""
+Coalescing of identical concurrent reads.
+
+When many users open the same namespace at the same time, i.e. after the
+backend restarts and all the open tabs reconnect, the workers send the same
+read calls to the API Server at once. The reads that are not served by the
+cache go through a singleflight group: while a call with the same key is in
+flight, the identical calls wait for it and share its result, or its error,
+instead of sending a new request.
+
+Only the call to the API Server is shared. The api functions check the
+authorization of each user before reaching it.
+
+A caller waits for the in-flight call only until the deadline of its own
+request, see the deadlines module. If the in-flight call fails because its
+request ran out of its deadline, the callers that still have time left send
+the call themselves.
+"""
+import copy
+import logging
+import threading
+
+from . import deadlines, metrics, settings
+
+log = logging.getLogger(__name__)
+
+# The result of a call whose leader was interrupted, i.e. by a timeout
+_MISSING = object()
+
+
+class _Call(object):
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = _MISSING
+        self.error = None
+        self.followers = 0
+
+
+def _copy(result):
+    if isinstance(result, dict):
+        return copy.deepcopy(result)
+
+    return result
+
+
+class Group(object):
+    """The calls that are in flight, by their key."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Call func, or wait for the in-flight call with the same key, and
+        return its result. When a result is shared, each caller gets its own
+        copy of the plain dicts, i.e. the custom resources, while the typed
+        objects are shared and must not be modified.
+
+        key: A hashable key that identifies the call, i.e. the name of the
+             K8s client function and its arguments
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.followers += 1
+
+        if not leader:
+            metrics.SINGLEFLIGHT_CALLS.labels(result="coalesced").inc()
+            if not call.done.wait(deadlines.remaining()):
+                raise deadlines.exceeded()
+
+            if isinstance(call.error, deadlines.DeadlineExceeded):
+                log.debug("In-flight call %s exceeded the deadline of its "
+                          "request", key)
+                return func(*args, **kwargs)
+
+            if call.error is not None:
+                raise call.error
+
+            if call.result is _MISSING:
+                log.debug("In-flight call %s was interrupted", key)
+                return func(*args, **kwargs)
+
+            return _copy(call.result)
+
+        metrics.SINGLEFLIGHT_CALLS.labels(result="leader").inc()
+        try:
+            call.result = func(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        # No caller can join the call anymore
+        if call.followers:
+            return _copy(call.result)
+
+        return call.result
+
+
+group = Group()
+
+
+def do(key, func, *args, **kwargs):
+    """Call func through the singleflight group of the backend."""
+    if not settings.SINGLEFLIGHT_ENABLED:
+        return func(*args, **kwargs)
+
+    return group.do(key, func, *args, **kwargs)
@@ -0,0 +1,128 @@
+"""Tests for the coalescing of identical concurrent reads."""
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+from . import singleflight
+
+
+class GroupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.group = singleflight.Group()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def _list(self, result=None, error=None):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if error is not None:
+            raise error
+        return result
+
+    def _concurrent(self, callers, *args):
+        """Run the calls while the first one is in flight."""
+        results = [None] * callers
+        errors = [None] * callers
+
+        def call(i):
+            try:
+                results[i] = self.group.do("key", self._list, *args)
+            except Exception as e:
+                errors[i] = e
+
+        leader = threading.Thread(target=call, args=(0,))
+        leader.start()
+        self.started.wait(5)
+        followers = [threading.Thread(target=call, args=(i,))
+                     for i in range(1, callers)]
+        for thread in followers:
+            thread.start()
+        while self.group._calls["key"].followers < callers - 1:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+
+        return results, errors
+
+    def test_identical_calls_share_one_request(self):
+        result = {"items": [{"metadata": {"name": "a"}}]}
+
+        results, errors = self._concurrent(3, result)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(errors, [None, None, None])
+        self.assertTrue(all(r == result for r in results))
+        # Each caller gets its own copy of the dicts
+        self.assertEqual(len({id(r) for r in results}), 3)
+
+    def test_errors_are_shared(self):
+        results, errors = self._concurrent(2, None, ValueError("boom"))
+
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(isinstance(e, ValueError) for e in errors))
+
+    def test_sequential_calls_are_not_shared(self):
+        self.release.set()
+
+        first = self.group.do("key", self._list, {"a": 1})
+        second = self.group.do("key", self._list, {"a": 1})
+
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(first, second)
+
+    def test_interrupted_leader(self):
+        # The leader of the call exits without a result or an error
+        call = singleflight._Call()
+        self.group._calls["key"] = call
+        threading.Timer(0.01, call.done.set).start()
+        self.release.set()
+
+        result = self.group.do("key", self._list, "own")
+
+        self.assertEqual(result, "own")
+        self.assertEqual(self.calls, 1)
+
+    def test_leader_deadline_is_not_shared(self):
+        list_func = self._list
+
+        def list_once(result):
+            # Only the leader runs out of its deadline
+            error = None
+            if self.calls == 0:
+                error = singleflight.deadlines.DeadlineExceeded()
+            return list_func(result, error)
+
+        self._list = list_once
+        results, errors = self._concurrent(2, "own")
+
+        self.assertIsInstance(errors[0],
+                              singleflight.deadlines.DeadlineExceeded)
+        self.assertIsNone(errors[1])
+        self.assertEqual(results[1], "own")
+        self.assertEqual(self.calls, 2)
+
+    def test_followers_wait_until_their_deadline(self):
+        self.group._calls["key"] = singleflight._Call()
+
+        with mock.patch.object(singleflight.deadlines, "remaining",
+                               return_value=0.01):
+            with self.assertRaises(singleflight.deadlines.DeadlineExceeded):
+                self.group.do("key", self._list, "own")
+
+        self.assertEqual(self.calls, 0)
+
+    @mock.patch.object(singleflight.settings, "SINGLEFLIGHT_ENABLED", False)
+    def test_disabled(self):
+        self.release.set()
+
+        self.assertEqual(singleflight.do("key", self._list, "a"), "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+"""
+Versioned snapshots of the processed lists of the apps.
+
+The list endpoints return items that are derived from several K8s
+collections, i.e. the status of a Notebook depends on its Pod and Events.
+Instead of tracking the changes of every source collection, the list is
+processed as usual and compared with a previous snapshot of it, to find the
+items that were added, modified or deleted.
+
+A snapshot only keeps the hash of each item. Its version is the hash of all
+the items, so that the same list always has the same version, in all the
+workers of the app. The latest snapshots of each list, and user, are kept in
+memory so that the clients can ask for the changes since a version they have
+seen, either with an event stream or with the `since` parameter of a list
+endpoint.
+"""
+import hashlib
+import json
+import threading
+
+from cachetools import LRUCache
+from flask import request
+
+from . import api, authn, json_provider, pagination, queries, settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ADDED = "ADDED"
+MODIFIED = "MODIFIED"
+DELETED = "DELETED"
+
+
+def item_hash(item):
+    if orjson is not None:
+        data = orjson.dumps(item, default=json_provider.default,
+                            option=orjson.OPT_SORT_KEYS
+                            | orjson.OPT_NON_STR_KEYS)  # noqa: W503
+    else:
+        data = json.dumps(item, default=json_provider.default,
+                          sort_keys=True).encode()
+
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class Snapshot(object):
+    """
+    The items of a list, and their hashes, indexed by their key.
+
+    items: The processed items of the list
+    key_func: Returns the unique key of an item, i.e. its name
+    """
+
+    def __init__(self, items, key_func):
+        self.items = {}
+        self.hashes = {}
+        for item in items:
+            key = key_func(item)
+            self.items[key] = item
+            self.hashes[key] = item_hash(item)
+
+        version = hashlib.blake2b(digest_size=16)
+        for key in sorted(self.hashes):
+            version.update(("%s=%s;" % (key, self.hashes[key])).encode())
+        self.version = version.hexdigest()
+
+    def changes_since(self, hashes):
+        """
+        Return the changes from the items with the given hashes to the items
+        of this snapshot, as a list of (type, key, item) tuples.
+        """
+        changes = []
+        for key, item in self.items.items():
+            if key not in hashes:
+                changes.append((ADDED, key, item))
+            elif hashes[key] != self.hashes[key]:
+                changes.append((MODIFIED, key, item))
+
+        for key in hashes:
+            if key not in self.items:
+                changes.append((DELETED, key, None))
+
+        return changes
+
+
+class SnapshotHistory(object):
+    """The hashes of the latest snapshots of each list."""
+
+    def __init__(self, maxsize, versions):
+        self.versions = versions
+        self._lists = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def record(self, list_key, snapshot):
+        with self._lock:
+            versions = self._lists.get(list_key)
+            if versions is None:
+                versions = {}
+                self._lists[list_key] = versions
+
+            versions.pop(snapshot.version, None)
+            versions[snapshot.version] = snapshot.hashes
+            while len(versions) > self.versions:
+                del versions[next(iter(versions))]
+
+    def get(self, list_key, version):
+        """Return the hashes of the items of a version, or None."""
+        with self._lock:
+            return self._lists.get(list_key, {}).get(version)
+
+
+history = SnapshotHistory(maxsize=settings.SNAPSHOT_HISTORY_LISTS,
+                          versions=settings.SNAPSHOT_HISTORY_VERSIONS)
+
+
+def history_key(list_key):
+    """The lists of each user are kept apart, since they are authorized."""
+    return (authn.get_username(),) + tuple(list_key)
+
+
+def take_snapshot(list_key, items, key_func):
+    snapshot = Snapshot(items, key_func)
+    history.record(history_key(list_key), snapshot)
+    return snapshot
+
+
+def list_response(data_field, items, list_key, key_func, etag=None,
+                  **fields):
+    """
+    Return the response of a list endpoint. If the request has the `since`
+    parameter the response includes the version of the list, and if the
+    version of the parameter is known only the items that changed since
+    then, along with the keys of the removed items. Otherwise the items are
+    paged with the `limit` and `continue` parameters, if any. The items are
+    filtered and sorted first, and projected to the `fields` parameter last,
+    see the queries module.
+
+    list_key: A tuple that identifies the list, i.e. ("notebooks", namespace)
+    key_func: Returns the unique key of an item, i.e. its name
+    etag: The ETag of the full list, see api.success_response
+    fields: Additional top level fields of the response
+    """
+    query = queries.get_query()
+    if query:
+        items = queries.apply(items, query)
+        # Each filtered list has its own versions
+        list_key = tuple(list_key) + query
+
+    projection = queries.get_fields()
+
+    def projected(items):
+        return [queries.project(item, projection) for item in items]
+
+    if "since" not in request.args:
+        limit, token = pagination.get_page_params()
+        if limit is None and token is None:
+            return api.success_response(data_field, projected(items),
+                                        etag=etag, **fields)
+
+        page, next_token = pagination.paginate(items, limit, token)
+        fields[pagination.CONTINUE_PARAM] = next_token
+        return api.success_response(data_field, projected(page), etag=etag,
+                                    **fields)
+
+    snapshot = take_snapshot(list_key, items, key_func)
+    since = request.args["since"]
+    hashes = history.get(history_key(list_key), since) if since else None
+    if hashes is None:
+        # Unknown or too old version, send the full list
+        return api.success_response(data_field, projected(items),
+                                    delta=False, version=snapshot.version,
+                                    **fields)
+
+    changes = snapshot.changes_since(hashes)
+    return api.success_response(
+        data_field,
+        projected(item for change, _, item in changes if change != DELETED),
+        delta=True,
+        version=snapshot.version,
+        removed=[key for change, key, _ in changes if change == DELETED],
+        **fields
+    )
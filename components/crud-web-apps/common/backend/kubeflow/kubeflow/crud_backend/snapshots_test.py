@@ -0,0 +1,123 @@
+"""Tests for the versioned snapshots of the lists."""
+
+import datetime
+import unittest
+
+from flask import Flask
+
+from . import snapshots
+
+
+def _key(item):
+    return item["name"]
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def test_version_depends_only_on_the_items(self):
+        items = [{"name": "a", "age": datetime.datetime(2024, 1, 1)},
+                 {"name": "b"}]
+
+        first = snapshots.Snapshot(items, _key)
+        second = snapshots.Snapshot(list(reversed(items)), _key)
+        changed = snapshots.Snapshot([{"name": "a"}, {"name": "b"}], _key)
+
+        self.assertEqual(first.version, second.version)
+        self.assertNotEqual(first.version, changed.version)
+
+    def test_changes_since(self):
+        old = snapshots.Snapshot([{"name": "a", "phase": "waiting"},
+                                  {"name": "b"}, {"name": "c"}], _key)
+        new = snapshots.Snapshot([{"name": "a", "phase": "ready"},
+                                  {"name": "b"}, {"name": "d"}], _key)
+
+        changes = new.changes_since(old.hashes)
+
+        self.assertEqual(sorted(changes, key=lambda c: c[1]), [
+            (snapshots.MODIFIED, "a", {"name": "a", "phase": "ready"}),
+            (snapshots.DELETED, "c", None),
+            (snapshots.ADDED, "d", {"name": "d"}),
+        ])
+
+
+class SnapshotHistoryTest(unittest.TestCase):
+
+    def test_keeps_the_latest_versions(self):
+        history = snapshots.SnapshotHistory(maxsize=2, versions=2)
+        versions = []
+        for i in range(3):
+            snapshot = snapshots.Snapshot([{"name": str(i)}], _key)
+            history.record(("team-a",), snapshot)
+            versions.append(snapshot.version)
+
+        self.assertIsNone(history.get(("team-a",), versions[0]))
+        self.assertEqual(history.get(("team-a",), versions[2]), {
+            "2": snapshots.item_hash({"name": "2"}),
+        })
+        self.assertIsNone(history.get(("team-b",), versions[2]))
+
+
+class ListResponseTest(unittest.TestCase):
+
+    def setUp(self):
+        snapshots.history = snapshots.SnapshotHistory(maxsize=8, versions=4)
+        self.app = Flask(__name__)
+
+    def _get(self, items, query_string=None):
+        with self.app.test_request_context("/", query_string=query_string):
+            return snapshots.list_response("items", items, ("items",),
+                                           _key).get_json()
+
+    def test_without_since_the_response_is_unchanged(self):
+        resp = self._get([{"name": "a"}])
+
+        self.assertEqual(resp["items"], [{"name": "a"}])
+        self.assertNotIn("version", resp)
+
+    def test_delta_since_a_known_version(self):
+        first = self._get([{"name": "a"}, {"name": "b"}], {"since": ""})
+        delta = self._get([{"name": "b"}, {"name": "c"}],
+                          {"since": first["version"]})
+
+        self.assertFalse(first["delta"])
+        self.assertEqual(len(first["items"]), 2)
+        self.assertTrue(delta["delta"])
+        self.assertEqual(delta["items"], [{"name": "c"}])
+        self.assertEqual(delta["removed"], ["a"])
+        self.assertNotEqual(delta["version"], first["version"])
+
+    def test_pages_of_the_processed_list(self):
+        items = [{"name": name} for name in "abcde"]
+
+        first = self._get(items, {"limit": "2"})
+        second = self._get(items, {"limit": "2",
+                                   "continue": first["continue"]})
+        last = self._get(items, {"limit": "2",
+                                 "continue": second["continue"]})
+
+        self.assertEqual(first["items"], [{"name": "a"}, {"name": "b"}])
+        self.assertEqual(second["items"], [{"name": "c"}, {"name": "d"}])
+        self.assertEqual(last["items"], [{"name": "e"}])
+        self.assertIsNone(last["continue"])
+
+    def test_filters_are_applied_before_the_pages(self):
+        items = [{"name": name, "status": {"phase": phase}}
+                 for name, phase in [("a", "error"), ("b", "ready"),
+                                     ("c", "error"), ("d", "error")]]
+
+        resp = self._get(items, {"status": "error", "sort": "-name",
+                                 "limit": "2"})
+
+        self.assertEqual([item["name"] for item in resp["items"]],
+                         ["d", "c"])
+        self.assertIsNotNone(resp["continue"])
+
+    def test_unknown_version_returns_the_full_list(self):
+        resp = self._get([{"name": "a"}], {"since": "unknown"})
+
+        self.assertFalse(resp["delta"])
+        self.assertEqual(resp["items"], [{"name": "a"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,237 @@
+"""
+Server-Sent Events streams of the processed lists.
+
+A stream sends a snapshot of the list, as the list endpoint would return it,
+and then an ADDED, MODIFIED or DELETED event for each item that changes. The
+list is processed again when a cached collection of the namespace changes,
+see cache.wait_for_change. While no Informer watches the namespace, i.e. the
+cache is disabled or its initial LIST failed, the list is processed again
+every APP_STREAM_POLL_INTERVAL seconds instead.
+
+The id of each batch of events is the version of the list. A client that
+reconnects with the Last-Event-ID header only receives the changes since
+that version, if it is still in the history of the worker.
+
+The list is processed with the same api functions, in the context of the
+request, so the permissions of the user are checked every time. A stream is
+closed after APP_STREAM_MAX_DURATION seconds, or when the user is no longer
+authorized, and the clients are expected to reconnect.
+
+Each open stream occupies a worker thread or greenlet for its whole
+duration. Without the gevent worker class, a worker keeps at most
+MAX_BLOCKING_STREAMS streams open and refuses the others with a 503, so that
+the streams don't take all of its threads. The clients then poll the list
+endpoint instead.
+"""
+import logging
+import threading
+import time
+
+from flask import current_app, request, stream_with_context
+from kubernetes.client.rest import ApiException
+from werkzeug.exceptions import HTTPException, ServiceUnavailable
+
+from . import (cache, concurrency, deadlines, memo, queries, settings,
+               snapshots)
+from .errors import utils as error_utils
+
+log = logging.getLogger(__name__)
+
+SNAPSHOT_EVENT = "SNAPSHOT"
+ERROR_EVENT = "ERROR"
+# The reconnection delay of the clients, in milliseconds
+RETRY_MS = 3000
+# Open streams of a worker whose requests block a thread
+MAX_BLOCKING_STREAMS = 1
+
+_blocking_streams = threading.BoundedSemaphore(MAX_BLOCKING_STREAMS)
+
+
+def format_event(event, data, event_id=None):
+    lines = ["event: %s" % event]
+    if event_id is not None:
+        lines.append("id: %s" % event_id)
+    lines.append("data: %s" % current_app.json.dumps(data))
+
+    return "\n".join(lines) + "\n\n"
+
+
+def format_changes(changes, version, fields=None):
+    """
+    Format the changes of a snapshot as events. Only the last event has the
+    id of the version, so that a client which disconnects in the middle of a
+    batch resumes from the previous version.
+    """
+    events = []
+    for i, (event_type, key, item) in enumerate(changes):
+        data = {"key": key, "version": version}
+        if item is not None:
+            data["item"] = queries.project(item, fields)
+
+        event_id = version if i == len(changes) - 1 else None
+        events.append(format_event(event_type, data, event_id))
+
+    return events
+
+
+def _filtered(list_items, query):
+    return lambda: queries.apply(list_items(), query)
+
+
+def _reserve_stream():
+    """
+    Return the function which releases the place of a new stream, or raise a
+    503 if the worker can't keep another stream open.
+    """
+    if concurrency.is_cooperative():
+        return lambda: None
+
+    if not _blocking_streams.acquire(blocking=False):
+        raise ServiceUnavailable(
+            "The server can't keep another event stream open, poll the list"
+            " instead."
+        )
+
+    return _blocking_streams.release
+
+
+def _initial_events(snapshot, hashes, fields):
+    """
+    Return the first events of a stream: the whole snapshot, or only its
+    changes since the hashes of the version that the client already has.
+    """
+    if hashes is None:
+        data = {"version": snapshot.version,
+                "items": [queries.project(item, fields)
+                          for item in snapshot.items.values()]}
+        return [format_event(SNAPSHOT_EVENT, data, snapshot.version)]
+
+    return format_changes(snapshot.changes_since(hashes), snapshot.version,
+                          fields)
+
+
+def _process(list_key, list_items, key_func):
+    """
+    Process the list again. Return its snapshot, or the ERROR event which
+    closes the stream.
+    """
+    try:
+        # The results of the previous iterations are stale
+        memo.invalidate()
+        deadlines.renew()
+        return snapshots.take_snapshot(list_key, list_items(), key_func), None
+    except HTTPException as e:
+        return None, format_event(ERROR_EVENT, {"status": e.code,
+                                                "log": e.description})
+    except ApiException as e:
+        log.error("Stopping the event stream of %s: %s", list_key, e)
+        return None, format_event(ERROR_EVENT, {
+            "status": e.status,
+            "log": error_utils.parse_error_message(e),
+        })
+
+
+def _wait_for_update(namespace, generation, last_update, timeout):
+    """
+    Wait for a change of the namespace, or until the list must be polled.
+    Return the current generation of the namespace, and True if the list
+    must be processed again.
+    """
+    watched = cache.is_watched(namespace)
+    if not watched:
+        poll_at = last_update + settings.STREAM_POLL_INTERVAL
+        timeout = min(timeout, max(0, poll_at - time.monotonic()))
+
+    current = cache.wait_for_change(namespace, generation, timeout)
+    if current != generation:
+        return current, True
+
+    elapsed = time.monotonic() - last_update
+    return current, not watched and elapsed >= settings.STREAM_POLL_INTERVAL
+
+
+def _stream_events(namespace, list_key, list_items, key_func, fields,
+                   generation, snapshot):
+    """Yield the events of the changes of the list, see event_stream."""
+    started = last_update = last_sent = time.monotonic()
+    while True:
+        left = settings.STREAM_MAX_DURATION - (time.monotonic() - started)
+        if left <= 0:
+            return
+
+        generation, update = _wait_for_update(
+            namespace, generation, last_update,
+            min(left, settings.STREAM_HEARTBEAT_INTERVAL),
+        )
+        if update:
+            # Coalesce the bursts of changes, i.e. while a Notebook starts
+            delay = last_update + settings.STREAM_MIN_INTERVAL
+            time.sleep(max(0, delay - time.monotonic()))
+            last_update = time.monotonic()
+
+            new_snapshot, error = _process(list_key, list_items, key_func)
+            if error is not None:
+                yield error
+                return
+
+            if new_snapshot.version != snapshot.version:
+                changes = new_snapshot.changes_since(snapshot.hashes)
+                snapshot = new_snapshot
+                last_sent = time.monotonic()
+                yield from format_changes(changes, snapshot.version, fields)
+                continue
+
+        if time.monotonic() - last_sent >= settings.STREAM_HEARTBEAT_INTERVAL:
+            last_sent = time.monotonic()
+            yield ": heartbeat\n\n"
+
+
+def event_stream(namespace, list_key, list_items, key_func):
+    """
+    Return a streaming response with the events of a processed list.
+
+    namespace: The namespace whose cached collections trigger an update
+    list_key: A tuple that identifies the list, i.e. ("notebooks", namespace)
+    list_items: Returns the current items of the list, as the list endpoint
+    key_func: Returns the unique key of an item, i.e. its name
+
+    The items are filtered and projected as in the list endpoint, see the
+    queries module.
+    """
+    fields = queries.get_fields()
+    query = queries.get_query()
+    if query:
+        list_key = tuple(list_key) + query
+        list_items = _filtered(list_items, query)
+
+    history_key = snapshots.history_key(list_key)
+    last_event_id = request.headers.get("Last-Event-ID")
+
+    release = _reserve_stream()
+    try:
+        # The first snapshot is taken before the response starts, so that any
+        # error gets the usual error response
+        generation = cache.generation(namespace)
+        snapshot = snapshots.take_snapshot(list_key, list_items(), key_func)
+    except Exception:
+        release()
+        raise
+
+    def generate():
+        yield "retry: %d\n\n" % RETRY_MS
+
+        hashes = None
+        if last_event_id:
+            hashes = snapshots.history.get(history_key, last_event_id)
+
+        yield from _initial_events(snapshot, hashes, fields)
+        yield from _stream_events(namespace, list_key, list_items, key_func,
+                                  fields, generation, snapshot)
+
+    response = current_app.response_class(stream_with_context(generate()),
+                                          mimetype="text/event-stream")
+    response.call_on_close(release)
+    response.headers["Cache-Control"] = "no-cache"
+    # Don't let the proxies buffer the events
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,141 @@
+"""Tests for the Server-Sent Events streams of the lists."""
+
+import json
+import threading
+import unittest
+from unittest import mock
+
+from flask import Flask
+from werkzeug.exceptions import Forbidden
+
+from . import json_provider, snapshots, sse
+
+
+def _key(item):
+    return item["name"]
+
+
+def _parse_events(data):
+    events = []
+    for block in data.decode().strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n")
+                      if not line.startswith(":") and ": " in line)
+        if "event" in fields:
+            fields["data"] = json.loads(fields["data"])
+            events.append(fields)
+
+    return events
+
+
+def _changed(namespace, since, timeout):
+    return since + 1
+
+
+@mock.patch.object(sse.concurrency, "is_cooperative", return_value=True)
+@mock.patch.object(sse.settings, "STREAM_MIN_INTERVAL", 0)
+class EventStreamTest(unittest.TestCase):
+
+    def setUp(self):
+        snapshots.history = snapshots.SnapshotHistory(maxsize=8, versions=4)
+        self.list_items = mock.Mock(return_value=[{"name": "a"}])
+        self.app = Flask(__name__)
+        self.app.json = json_provider.JSONProvider(self.app)
+        self.app.add_url_rule(
+            "/watch", "watch",
+            lambda: sse.event_stream("team-a", ("test", "team-a"),
+                                     self.list_items, _key),
+        )
+
+    @mock.patch.object(sse.settings, "STREAM_MAX_DURATION", 0)
+    def test_stream_starts_with_a_snapshot(self, is_cooperative):
+        resp = self.app.test_client().get("/watch")
+
+        events = _parse_events(resp.data)
+        self.assertEqual(resp.mimetype, "text/event-stream")
+        self.assertEqual(events[0]["event"], sse.SNAPSHOT_EVENT)
+        self.assertEqual(events[0]["data"]["items"], [{"name": "a"}])
+        self.assertEqual(events[0]["id"], events[0]["data"]["version"])
+
+    @mock.patch.object(sse.settings, "STREAM_MAX_DURATION", 0)
+    def test_resume_sends_only_the_changes(self, is_cooperative):
+        version = _parse_events(
+            self.app.test_client().get("/watch").data)[0]["id"]
+        self.list_items.return_value = [{"name": "a"}, {"name": "b"}]
+
+        resp = self.app.test_client().get(
+            "/watch", headers={"Last-Event-ID": version})
+
+        events = _parse_events(resp.data)
+        self.assertEqual([e["event"] for e in events], [snapshots.ADDED])
+        self.assertEqual(events[0]["data"]["item"], {"name": "b"})
+
+    @mock.patch.object(sse.settings, "STREAM_MAX_DURATION", 0.05)
+    @mock.patch.object(sse.cache, "wait_for_change", _changed)
+    def test_changes_are_streamed(self, is_cooperative):
+        self.list_items.side_effect = [
+            [{"name": "a"}],
+            [{"name": "a", "phase": "ready"}],
+        ] + [Forbidden("denied")] * 100
+
+        resp = self.app.test_client().get("/watch")
+
+        events = _parse_events(resp.data)
+        self.assertEqual([e["event"] for e in events], [
+            sse.SNAPSHOT_EVENT, snapshots.MODIFIED, sse.ERROR_EVENT,
+        ])
+        self.assertEqual(events[1]["data"]["item"]["phase"], "ready")
+        self.assertEqual(events[2]["data"]["status"], 403)
+
+    @mock.patch.object(sse.settings, "STREAM_MAX_DURATION", 0.05)
+    @mock.patch.object(sse.settings, "STREAM_POLL_INTERVAL", 0)
+    @mock.patch.object(sse.cache, "is_watched", return_value=True)
+    def test_watched_list_is_not_processed_without_changes(self, is_watched,
+                                                           is_cooperative):
+        self.app.test_client().get("/watch")
+
+        self.list_items.assert_called_once_with()
+
+    @mock.patch.object(sse.settings, "STREAM_MAX_DURATION", 0.05)
+    @mock.patch.object(sse.settings, "STREAM_POLL_INTERVAL", 0)
+    @mock.patch.object(sse.cache.settings, "CACHE_ENABLED", False)
+    def test_list_is_polled_without_the_cache(self, is_cooperative):
+        self.list_items.side_effect = [
+            [{"name": "a"}],
+            [{"name": "a", "phase": "ready"}],
+        ] + [Forbidden("denied")] * 100
+
+        resp = self.app.test_client().get("/watch")
+
+        events = _parse_events(resp.data)
+        self.assertEqual([e["event"] for e in events], [
+            sse.SNAPSHOT_EVENT, snapshots.MODIFIED, sse.ERROR_EVENT,
+        ])
+
+
+@mock.patch.object(sse.settings, "STREAM_MAX_DURATION", 0)
+@mock.patch.object(sse.concurrency, "is_cooperative", return_value=False)
+class BlockingStreamsTest(unittest.TestCase):
+
+    def setUp(self):
+        snapshots.history = snapshots.SnapshotHistory(maxsize=8, versions=4)
+        sse._blocking_streams = threading.BoundedSemaphore(1)
+        self.app = Flask(__name__)
+        self.app.json = json_provider.JSONProvider(self.app)
+        self.app.add_url_rule(
+            "/watch", "watch",
+            lambda: sse.event_stream("team-a", ("test", "team-a"),
+                                     lambda: [{"name": "a"}], _key),
+        )
+
+    def test_worker_keeps_a_single_stream(self, is_cooperative):
+        client = self.app.test_client()
+
+        first = client.get("/watch")
+        self.assertEqual(client.get("/watch").status_code, 503)
+
+        first.close()
+        self.assertEqual(client.get("/watch").status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,215 @@
+"""
+Client-side rate limiting of the requests to the API Server.
+
+All the requests of the shared ApiClient, see the clients module, go through
+the limiter of the worker, which combines:
+
+    * a token bucket of APP_K8S_QPS requests per second, with bursts of up
+      to APP_K8S_BURST requests
+    * a cap of APP_K8S_MAX_IN_FLIGHT requests waiting for the API Server
+
+The requests that have to wait are served by priority, and in order within
+a priority: first the writes, then the reads of the users' requests, and
+last the background requests, i.e. the LISTs and WATCHes of the informers.
+The initial LIST of an informer is sent as a read, since the requests of the
+users wait for it.
+When every user hits refresh at once the writes and the pages the users are
+looking at go first, and the API Server never sees more than the configured
+rate from a worker.
+
+A watch only counts as in flight until the API Server starts its stream.
+A request waits at most until the deadline of its route, see the deadlines
+module.
+"""
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import has_request_context
+
+from . import deadlines, metrics, settings
+
+log = logging.getLogger(__name__)
+
+WRITE = 0
+READ = 1
+BACKGROUND = 2
+
+PRIORITY_NAMES = {WRITE: "write", READ: "read", BACKGROUND: "background"}
+
+_local = threading.local()
+
+
+def priority(method):
+    """Return the priority of a request to the API Server."""
+    if method.upper() not in ("GET", "HEAD", "OPTIONS"):
+        return WRITE
+
+    read_priority = getattr(_local, "read_priority", None)
+    if read_priority is not None:
+        return read_priority
+
+    if has_request_context():
+        return READ
+
+    return BACKGROUND
+
+
+@contextmanager
+def reads_as(read_priority):
+    """
+    Send the reads of the current thread with the priority, i.e. the reads
+    of a background thread that the requests of the users wait for.
+    """
+    previous = getattr(_local, "read_priority", None)
+    _local.read_priority = read_priority
+    try:
+        yield
+    finally:
+        _local.read_priority = previous
+
+
+class Limiter(object):
+    """
+    Token bucket and in-flight cap, whose waiters are served by priority.
+
+    qps: Requests per second, 0 for no rate limit
+    burst: Requests that can be sent at once after an idle period
+    max_in_flight: Requests that can wait for the API Server at the same
+                   time, 0 for no cap
+    """
+
+    def __init__(self, qps, burst, max_in_flight, clock=time.monotonic):
+        self.qps = qps
+        self.burst = max(burst, 1)
+        self.max_in_flight = max_in_flight
+        self.clock = clock
+
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._in_flight = 0
+        self._waiters = []
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+
+    @property
+    def enabled(self):
+        return self.qps > 0 or self.max_in_flight > 0
+
+    def _refill(self):
+        now = self.clock()
+        if self.qps > 0:
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._updated) * self.qps)
+        self._updated = now
+
+    def _delay(self):
+        """
+        Seconds until the first waiter can be sent, or None if it waits for
+        a request in flight to finish.
+        """
+        if self.max_in_flight > 0 and self._in_flight >= self.max_in_flight:
+            return None
+
+        if self.qps <= 0 or self._tokens >= 1:
+            return 0
+
+        return (1 - self._tokens) / self.qps
+
+    def _give_up(self, waiter):
+        self._waiters.remove(waiter)
+        heapq.heapify(self._waiters)
+        self._cond.notify_all()
+
+    def acquire(self, priority, timeout=None):
+        """
+        Wait until a request of the priority can be sent, and return the
+        seconds it waited, or None if it couldn't be sent in timeout seconds.
+        """
+        start = self.clock()
+        waiter = (priority, next(self._order))
+        with self._cond:
+            heapq.heappush(self._waiters, waiter)
+            try:
+                while True:
+                    self._refill()
+                    delay = None
+                    if self._waiters[0] == waiter:
+                        delay = self._delay()
+                    if delay == 0:
+                        break
+
+                    if timeout is not None:
+                        left = start + timeout - self.clock()
+                        if left <= 0:
+                            self._give_up(waiter)
+                            return None
+                        delay = left if delay is None else min(delay, left)
+
+                    self._cond.wait(delay)
+            except BaseException:
+                self._give_up(waiter)
+                raise
+
+            heapq.heappop(self._waiters)
+            if self.qps > 0:
+                self._tokens -= 1
+            self._in_flight += 1
+
+            # The next waiter may be sent as well
+            self._cond.notify_all()
+
+        return self.clock() - start
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def limit(self, priority):
+        waited = self.acquire(priority, deadlines.remaining())
+        if waited is None:
+            raise deadlines.exceeded()
+
+        metrics.K8S_CLIENT_THROTTLE_SECONDS.labels(
+            priority=PRIORITY_NAMES[priority]
+        ).observe(waited)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+def new_limiter():
+    return Limiter(settings.K8S_QPS, settings.K8S_BURST,
+                   settings.K8S_MAX_IN_FLIGHT)
+
+
+limiter = new_limiter()
+
+
+def _reset_after_fork():
+    global limiter
+
+    # The requests in flight of the parent are not copied in a forked worker
+    limiter = new_limiter()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@contextmanager
+def limit(method):
+    """Wait until the request can be sent to the API Server."""
+    if not limiter.enabled:
+        yield
+        return
+
+    with limiter.limit(priority(method)):
+        yield
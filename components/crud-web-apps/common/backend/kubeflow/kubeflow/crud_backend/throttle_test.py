@@ -0,0 +1,114 @@
+"""Tests for the rate limiting of the requests to the API Server."""
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+from . import clients, throttle
+
+
+class PriorityTest(unittest.TestCase):
+
+    def test_writes_go_first(self):
+        self.assertEqual(throttle.priority("PATCH"), throttle.WRITE)
+
+    def test_reads_of_the_users(self):
+        with Flask(__name__).test_request_context("/"):
+            self.assertEqual(throttle.priority("GET"), throttle.READ)
+
+    def test_reads_of_the_informers(self):
+        self.assertEqual(throttle.priority("GET"), throttle.BACKGROUND)
+
+    def test_reads_that_the_users_wait_for(self):
+        with throttle.reads_as(throttle.READ):
+            self.assertEqual(throttle.priority("GET"), throttle.READ)
+            self.assertEqual(throttle.priority("PATCH"), throttle.WRITE)
+
+        self.assertEqual(throttle.priority("GET"), throttle.BACKGROUND)
+
+
+class LimiterTest(unittest.TestCase):
+
+    def test_burst_is_sent_at_once(self):
+        limiter = throttle.Limiter(qps=1, burst=3, max_in_flight=0)
+
+        waits = [limiter.acquire(throttle.READ) for _ in range(3)]
+
+        self.assertLess(max(waits), 0.05)
+
+    def test_requests_wait_for_tokens(self):
+        limiter = throttle.Limiter(qps=20, burst=1, max_in_flight=0)
+
+        limiter.acquire(throttle.READ)
+        waited = limiter.acquire(throttle.READ)
+
+        self.assertGreater(waited, 0.03)
+
+    def test_requests_in_flight_are_capped(self):
+        limiter = throttle.Limiter(qps=0, burst=1, max_in_flight=1)
+        limiter.acquire(throttle.READ)
+        acquired = threading.Event()
+
+        def send():
+            limiter.acquire(throttle.READ)
+            acquired.set()
+
+        threading.Thread(target=send, daemon=True).start()
+
+        self.assertFalse(acquired.wait(0.1))
+        limiter.release()
+        self.assertTrue(acquired.wait(5))
+
+    def test_requests_give_up_after_the_timeout(self):
+        limiter = throttle.Limiter(qps=0, burst=1, max_in_flight=1)
+        limiter.acquire(throttle.READ)
+
+        self.assertIsNone(limiter.acquire(throttle.READ, timeout=0.05))
+        self.assertEqual(limiter._waiters, [])
+
+    def test_waiters_are_served_by_priority(self):
+        limiter = throttle.Limiter(qps=0, burst=1, max_in_flight=1)
+        limiter.acquire(throttle.READ)
+        order = []
+
+        def send(priority):
+            limiter.acquire(priority)
+            order.append(priority)
+            limiter.release()
+
+        threads = []
+        for priority in [throttle.BACKGROUND, throttle.READ, throttle.WRITE]:
+            thread = threading.Thread(target=send, args=(priority,))
+            thread.start()
+            threads.append(thread)
+            while len(limiter._waiters) < len(threads):
+                time.sleep(0.01)
+
+        limiter.release()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(order, [throttle.WRITE, throttle.READ,
+                                 throttle.BACKGROUND])
+
+
+class ApiClientTest(unittest.TestCase):
+
+    @mock.patch.object(clients, "load_config")
+    def test_requests_go_through_the_limiter(self, load_config):
+        api_client = clients.get_api_client()
+        rest_client = mock.Mock()
+
+        with mock.patch.object(api_client, "rest_client", rest_client), \
+                mock.patch.object(throttle, "limit") as limit:
+            api_client.request("GET", "https://k8s/api/v1/pods")
+
+        limit.assert_called_once_with("GET")
+        rest_client.GET.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import setuptools
 
 REQUIRES = [
-    "Flask >= 1.1.1",
+    "Flask >= 2.2.0",
     "Flask-API >= 2.0",
     "kubernetes == 22.6.0",
     "requests >= 2.22.0",
@@ -10,6 +10,8 @@ REQUIRES = [
     "Flask-Cors >= 3.0.8",
     "gevent",
     "prometheus-flask-exporter >= 0.23.1",
+    "cachetools >= 5.3.0",
+    "orjson >= 3.6.0",
     "importlib-metadata >= 1.0;python_version<'3.8'",
 ]
 
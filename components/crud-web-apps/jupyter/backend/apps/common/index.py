@@ -0,0 +1,87 @@
+"""Index of a namespace's Pods by label and owner."""
+
+import threading
+
+from cachetools import LRUCache
+from kubeflow.kubeflow.crud_backend import api
+
+NOTEBOOK_NAME_LABEL = "notebook-name"
+APP_LABEL = "app"
+INDEXED_LABELS = [NOTEBOOK_NAME_LABEL, APP_LABEL]
+
+# Indexes of the latest Pod lists, keyed by (namespace, resourceVersion).
+# Since a Pod list with the same resourceVersion has the same contents, the
+# index is only rebuilt when the Pods of the namespace change.
+_indexes = LRUCache(maxsize=128)
+_indexes_lock = threading.Lock()
+
+
+class PodIndex(object):
+    """
+    Maps the notebook-name/app labels and the owner uids to the Pods that
+    have them, preserving the order of the Pod list.
+    """
+
+    def __init__(self, pods):
+        self.pods = list(pods)
+        self._labels = {}
+        self._owners = {}
+
+        for pod in self.pods:
+            labels = pod.metadata.labels or {}
+            for key in INDEXED_LABELS:
+                if key in labels:
+                    self._labels.setdefault((key, labels[key]), []).append(
+                        pod
+                    )
+
+            for owner in pod.metadata.owner_references or []:
+                self._owners.setdefault(owner.uid, []).append(pod)
+
+    def with_label(self, key, value):
+        return list(self._labels.get((key, value), []))
+
+    def owned_by(self, uid):
+        return list(self._owners.get(uid, []))
+
+    def notebook_pods(self, name):
+        """Return the Pods of a Notebook or custom container."""
+        return self.with_label(NOTEBOOK_NAME_LABEL, name)
+
+    def workload_pods(self, workload):
+        """
+        Return the Pods of a custom-container StatefulSet or Deployment,
+        oldest first. StatefulSet Pods are matched by their owner, while
+        Deployment Pods, which are owned by ReplicaSets, by the app label.
+        """
+        pods = self.owned_by(workload.metadata.uid)
+        seen = {pod.metadata.uid for pod in pods}
+        pods.extend(
+            pod for pod in self.with_label(APP_LABEL, workload.metadata.name)
+            if pod.metadata.uid not in seen
+        )
+
+        return sorted(pods, key=lambda pod: (
+            pod.metadata.creation_timestamp.isoformat()
+            if pod.metadata.creation_timestamp else "",
+            pod.metadata.name or "",
+        ))
+
+
+def get_pod_index(namespace):
+    """Return the PodIndex for all the Pods of the namespace."""
+    pod_list = api.list_pods(namespace=namespace)
+    resource_version = getattr(pod_list.metadata, "resource_version", None)
+    if resource_version is None:
+        return PodIndex(pod_list.items or [])
+
+    key = (namespace, resource_version)
+    with _indexes_lock:
+        pod_index = _indexes.get(key)
+
+    if pod_index is None:
+        pod_index = PodIndex(pod_list.items or [])
+        with _indexes_lock:
+            _indexes[key] = pod_index
+
+    return pod_index
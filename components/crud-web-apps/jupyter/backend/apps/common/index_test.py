@@ -0,0 +1,87 @@
+import datetime as dt
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from apps.common import index
+
+
+def _pod(name, labels=None, owners=None, minute=0):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(
+            name=name,
+            uid="uid-" + name,
+            labels=labels,
+            owner_references=[
+                SimpleNamespace(uid=uid) for uid in owners or []
+            ],
+            creation_timestamp=dt.datetime(2024, 1, 1, 0, minute),
+        ),
+    )
+
+
+def _workload(name, uid):
+    return SimpleNamespace(metadata=SimpleNamespace(name=name, uid=uid))
+
+
+class TestPodIndex(unittest.TestCase):
+    """Test the matching of Pods to Notebooks and workloads"""
+
+    def setUp(self):
+        self.pods = [
+            _pod("nb-0", {"notebook-name": "nb"}),
+            _pod("nb2-0", {"notebook-name": "nb2"}),
+            _pod("web-1", {"app": "web"}, ["sts-uid"], minute=2),
+            _pod("web-0", {"app": "web"}, ["sts-uid"], minute=1),
+            _pod("api-abc", {"app": "api"}, ["rs-uid"]),
+            _pod("unlabeled", None),
+        ]
+        self.pod_index = index.PodIndex(self.pods)
+
+    def test_notebook_name_is_not_a_prefix_match(self):
+        pods = self.pod_index.notebook_pods("nb")
+
+        self.assertEqual([pod.metadata.name for pod in pods], ["nb-0"])
+
+    def test_statefulset_pods_are_sorted_by_age(self):
+        pods = self.pod_index.workload_pods(_workload("web", "sts-uid"))
+
+        self.assertEqual(
+            [pod.metadata.name for pod in pods], ["web-0", "web-1"]
+        )
+
+    def test_deployment_pods_are_matched_by_app_label(self):
+        pods = self.pod_index.workload_pods(_workload("api", "deploy-uid"))
+
+        self.assertEqual([pod.metadata.name for pod in pods], ["api-abc"])
+
+    def test_unknown_names_have_no_pods(self):
+        self.assertEqual(self.pod_index.notebook_pods("missing"), [])
+
+
+class TestGetPodIndex(unittest.TestCase):
+    """Test the reuse of the index for the same Pod list"""
+
+    def _pod_list(self, resource_version):
+        return SimpleNamespace(
+            metadata=SimpleNamespace(resource_version=resource_version),
+            items=[_pod("nb-0", {"notebook-name": "nb"})],
+        )
+
+    @mock.patch.object(index.api, "list_pods")
+    def test_index_is_reused_for_the_same_resource_version(self, list_pods):
+        index._indexes.clear()
+        list_pods.side_effect = [
+            self._pod_list("1"), self._pod_list("1"), self._pod_list("2"),
+        ]
+
+        first = index.get_pod_index("team-a")
+        second = index.get_pod_index("team-a")
+        third = index.get_pod_index("team-a")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+
+
+if __name__ == "__main__":
+    unittest.main()
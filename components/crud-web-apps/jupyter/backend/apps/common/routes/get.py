@@ -1,10 +1,13 @@
 """GET request handlers."""
 
 from flask import request
-from kubeflow.kubeflow.crud_backend import api, logging
+from kubeflow.kubeflow.crud_backend import (aggregation, api, concurrency,
+                                            deadlines, logging, pagination,
+                                            snapshots, sse)
 from kubernetes import client
 from werkzeug.exceptions import NotFound
 
+from .. import index
 from .. import utils
 from .. import status
 from ..services import networking, workloads
@@ -58,39 +61,67 @@ def get_poddefaults(namespace):
 
 @bp.route("/api/namespaces/<namespace>/notebooks")
 def get_notebooks(namespace):
+    contents = list_notebook_items(namespace)
+
+    return snapshots.list_response("notebooks", contents,
+                                   ("notebooks", namespace),
+                                   notebook_item_key)
+
+
+@bp.route("/api/notebooks")
+@deadlines.route_class(deadlines.AGGREGATE)
+def get_all_namespaces_notebooks():
+    return aggregation.list_response(
+        "notebooks", ("kubeflow.org", "v1beta1", "notebooks"),
+        list_notebook_items, notebook_item_key,
+    )
+
+
+@bp.route("/api/watch/namespaces/<namespace>/notebooks")
+def watch_notebooks(namespace):
+    return sse.event_stream(
+        namespace, ("notebooks", namespace),
+        lambda: list_notebook_items(namespace), notebook_item_key,
+    )
+
+
+def notebook_item_key(item):
+    # Notebooks and custom containers can have the same name
+    return "%s/%s" % (item.get("workloadKind", "Notebook"), item["name"])
+
+
+def list_notebook_items(namespace):
+    """Return the Notebooks and custom containers as the UI shows them."""
+    notebooks, pod_index, container_workloads = concurrency.gather(
+        lambda: api.list_notebooks(namespace),
+        lambda: index.get_pod_index(namespace),
+        lambda: workloads.list_container_workloads(namespace),
+    )
+
     # notebook 목록
-    notebook_list = api.list_notebooks(namespace)["items"]
-    pod_list = api.list_pods(namespace=namespace)
-    notebook_items = [utils.notebook_dict_from_k8s_obj(nb, pod_list) for nb in notebook_list]
+    notebook_list = notebooks["items"]
+    events_index = status.NotebookEventsIndex(namespace)
+    notebook_items = [
+        utils.notebook_dict_from_k8s_obj(nb, pod_index, events_index)
+        for nb in notebook_list
+    ]
 
     # container 목록
     container_items = []
-    for workload in workloads.list_container_workloads(namespace):
-        matching_pods = sorted(
-            [
-                pod for pod in pod_list.items
-                if pod.metadata.labels.get("app") == workload.metadata.name
-            ],
-            key=lambda pod: (
-                pod.metadata.creation_timestamp.isoformat()
-                if pod.metadata.creation_timestamp else "",
-                pod.metadata.name or "",
-            ),
-        )
+    for workload in container_workloads:
+        matching_pods = pod_index.workload_pods(workload.obj)
         matching_pod = matching_pods[0] if matching_pods else None
         container_item = utils.container_dict_from_k8s_obj(
-            workload, matching_pod
+            workload.obj, matching_pod
         )
-        container_item["workloadKind"] = workloads.workload_kind(workload)
+        container_item["workloadKind"] = workload.kind
         container_item["pods"] = [
-            utils.container_pod_dict_from_k8s_obj(workload, pod)
+            utils.container_pod_dict_from_k8s_obj(workload.obj, pod)
             for pod in matching_pods
         ]
         container_items.append(container_item)
 
-    contents = notebook_items + container_items
-
-    return api.success_response("notebooks", contents)
+    return notebook_items + container_items
 
 
 @bp.route("/api/namespaces/<namespace>/notebooks/<name>")
@@ -103,12 +134,11 @@ def get_notebook(name, namespace):
 
 @bp.route("/api/namespaces/<namespace>/notebooks/<notebook_name>/pod")
 def get_notebook_pod(notebook_name, namespace):
-    label_selector = "notebook-name=" + notebook_name
     # There should be only one Pod for each Notebook,
     # so we expect items to have length = 1
-    pods = api.list_pods(namespace=namespace, label_selector=label_selector)
-    if pods.items:
-        pod = pods.items[0]
+    pods = index.get_pod_index(namespace).notebook_pods(notebook_name)
+    if pods:
+        pod = pods[0]
         return api.success_response(
             "pod", api.serialize(pod),
         )
@@ -138,11 +168,11 @@ def get_pod_logs(namespace, notebook_name, pod_name):
 
 @bp.route("/api/namespaces/<namespace>/notebooks/<notebook_name>/events")
 def get_notebook_events(notebook_name, namespace):
-    events = api.list_notebook_events(notebook_name, namespace).items
+    limit, token = pagination.get_page_params()
+    events = api.list_notebook_events(notebook_name, namespace, raw=True,
+                                      limit=limit, continue_token=token)
 
-    return api.success_response(
-        "events", api.serialize(events),
-    )
+    return pagination.raw_list_response("events", events)
 
 
 @bp.route("/api/namespaces/<namespace>/notebooks/<notebook_name>/ports")
@@ -183,18 +213,22 @@ def get_gpu_vendors():
 
 @bp.route("/api/namespaces/<namespace>/containers/<name>")
 def get_container(namespace, name):
-    workload = workloads.get_container_workload(namespace, name)
+    workload, pod_index = concurrency.gather(
+        lambda: workloads.get_container_workload(namespace, name),
+        lambda: index.get_pod_index(namespace),
+    )
     if workload is None:
         raise NotFound("No container detected.")
 
-    pods = api.list_pods(namespace=namespace, label_selector=f"app={name}")
-    pod = pods.items[0] if pods.items else None
+    # Pick the same Pod as the notebooks list, the oldest one
+    pods = pod_index.workload_pods(workload.obj)
+    pod = pods[0] if pods else None
 
-    container_summary = utils.container_dict_from_k8s_obj(workload, pod)
-    kind = workloads.workload_kind(workload)
+    container_summary = utils.container_dict_from_k8s_obj(workload.obj, pod)
+    kind = workload.kind
     container_summary["workloadKind"] = kind
-    container_status = status.process_container_status(workload, pod)
-    serialized_workload = api.serialize(workload)
+    container_status = status.process_container_status(workload.obj, pod)
+    serialized_workload = api.serialize(workload.obj)
 
     response = {
         "summary": container_summary,
@@ -4,9 +4,9 @@ import shlex
 from flask import request
 from werkzeug import exceptions
 
-from kubeflow.kubeflow.crud_backend import api, decorators, logging
+from kubeflow.kubeflow.crud_backend import api, decorators, logging, retry
 
-from .. import status, utils, volumes
+from .. import index, status, utils, volumes
 from ..services import networking, workloads
 from ..services.containers import LAST_REPLICAS_ANNOTATION
 from . import bp
@@ -67,6 +67,18 @@ def patch_notebook(namespace, notebook):
     if not any(attr in SETTINGS_ATTRIBUTES for attr in request_body.keys()):
         return api.success_response()
 
+    # Raises a 404 before creating the new PVCs
+    api.get_notebook(notebook, namespace)
+    request_body = _create_new_pvcs(request_body, namespace)
+    retry.read_modify_write(
+        _patch_notebook_settings, namespace, notebook, request_body
+    )
+
+    return api.success_response()
+
+
+# helper functions
+def _patch_notebook_settings(namespace, notebook, request_body):
     notebook_obj = api.get_notebook(notebook, namespace)
     existing_container = (
         notebook_obj.get("spec", {})
@@ -93,12 +105,13 @@ def patch_notebook(namespace, notebook):
             notebook,
             patch_body,
         )
-        api.patch_notebook(notebook, namespace, patch_body)
-
-    return api.success_response()
+        api.patch_notebook(
+            notebook,
+            namespace,
+            retry.with_resource_version(patch_body, notebook_obj),
+        )
 
 
-# helper functions
 def start_stop_notebook(namespace, notebook, request_body):
     stop = request_body[STOP_ATTR]
 
@@ -149,12 +162,33 @@ def patch_container(namespace, name):
             % list(ATTRIBUTES)
         )
 
+    if workloads.get_container_workload(namespace, name) is None:
+        return api.failed_response("No container detected.", 404)
+
+    body = _create_new_pvcs(body, namespace)
+    try:
+        result = retry.read_modify_write(
+            _patch_container_workload, namespace, name, body
+        )
+        if result is None:
+            return api.failed_response("No container detected.", 404)
+        if REPLICAS_ATTR in body:
+            _reconcile_per_replica_exposures(namespace, result)
+        return api.success_response("container", result.obj.to_dict())
+    except exceptions.HTTPException:
+        # The errors of the request body, while building the patch
+        raise
+    except Exception as e:
+        return api.failed_response(f"Failed to patch container: {e}", 500)
+
+
+def _patch_container_workload(namespace, name, body):
     workload = workloads.get_container_workload(namespace, name)
     if workload is None:
-        return api.failed_response("No container detected.", 404)
+        return None
 
-    annotations = workload.metadata.annotations or {}
-    current_replicas = workload.spec.replicas or 0
+    annotations = workload.obj.metadata.annotations or {}
+    current_replicas = workload.obj.spec.replicas or 0
     desired_replicas = _get_desired_replicas(annotations, current_replicas)
 
     patch_body = {}
@@ -172,22 +206,17 @@ def patch_container(namespace, name):
         }
 
     if any(attr in SETTINGS_ATTRIBUTES for attr in body.keys()):
-        settings_patch = _build_deployment_patch(body, workload, namespace)
+        settings_patch = _build_deployment_patch(body, workload.obj,
+                                                 namespace)
         if settings_patch:
             patch_body = _deep_merge(patch_body, settings_patch)
 
-    try:
-        result = workloads.patch_container_workload(
-            name=name,
-            namespace=namespace,
-            body=patch_body,
-            workload=workload,
-        )
-        if REPLICAS_ATTR in body:
-            _reconcile_per_replica_exposures(namespace, result)
-        return api.success_response("container", result.to_dict())
-    except Exception as e:
-        return api.failed_response(f"Failed to patch container: {e}", 500)
+    return workloads.patch_container_workload(
+        name=name,
+        namespace=namespace,
+        body=retry.with_resource_version(patch_body, workload.obj),
+        workload=workload,
+    )
 
 
 @bp.route(
@@ -212,12 +241,10 @@ def patch_notebook_port(namespace, notebook, service_name):
 
     selector = {"notebook-name": notebook}
     if access_type == "Gateway":
-        pods = api.list_pods(
-            namespace=namespace, label_selector=f"notebook-name={notebook}"
-        )
-        if not pods.items:
+        pods = index.get_pod_index(namespace).notebook_pods(notebook)
+        if not pods:
             return api.failed_response("No pod detected.", 404)
-        pod = pods.items[0]
+        pod = pods[0]
         try:
             kwargs = dict(
                 workload_name=notebook,
@@ -248,9 +275,7 @@ def patch_notebook_port(namespace, notebook, service_name):
 
     try:
         if service_name.startswith("gateway-"):
-            pod = api.list_pods(
-                namespace=namespace, label_selector=f"notebook-name={notebook}"
-            ).items[0]
+            pod = index.get_pod_index(namespace).notebook_pods(notebook)[0]
             handle = networking.create_service(
                 namespace, pod.metadata.name, selector,
                 pod.metadata.owner_references, port, "NodePort", node_port,
@@ -311,7 +336,7 @@ def patch_container_port(namespace, name, service_name):
                 port=port,
                 domain=domain,
                 per_replica=per_replica,
-                replicas=_desired_replicas(workload),
+                replicas=_desired_replicas(workload.obj),
                 **_gateway_config(),
             )
             if service_name.startswith("gateway-"):
@@ -333,13 +358,11 @@ def patch_container_port(namespace, name, service_name):
 
     try:
         if service_name.startswith("gateway-"):
-            pods = api.list_pods(
-                namespace=namespace, label_selector=f"notebook-name={name}"
-            )
-            if not pods.items:
+            pods = index.get_pod_index(namespace).notebook_pods(name)
+            if not pods:
                 return api.failed_response("No pod detected.", 404)
             handle = networking.create_service(
-                namespace, pods.items[0].metadata.name, selector,
+                namespace, pods[0].metadata.name, selector,
                 owner_references, port, "NodePort", node_port, protocol,
             )
             if handle is None:
@@ -364,7 +387,7 @@ def patch_container_port(namespace, name, service_name):
 
 
 def _reconcile_per_replica_exposures(namespace, workload):
-    selector = {"notebook-name": workload.metadata.name}
+    selector = {"notebook-name": workload.obj.metadata.name}
     exposures = networking.list_port_exposures(namespace, selector)
     for exposure in exposures:
         if exposure.get("accessType") != "Gateway" or not exposure.get("perReplica"):
@@ -372,13 +395,13 @@ def _reconcile_per_replica_exposures(namespace, workload):
         networking.replace_gateway_exposure(
             namespace=namespace,
             old_exposure_id=exposure["name"],
-            workload_name=workload.metadata.name,
+            workload_name=workload.obj.metadata.name,
             selector=selector,
             owner_references=[workloads.owner_reference(workload)],
             port=exposure["port"],
             domain=exposure["domain"],
             per_replica=True,
-            replicas=_desired_replicas(workload),
+            replicas=_desired_replicas(workload.obj),
             **_gateway_config(),
         )
 
@@ -592,6 +615,34 @@ def _build_container_patch(
     return patch
 
 
+def _create_new_pvcs(body, namespace):
+    """
+    Create the new PVCs of the body's datavols and return a body which mounts
+    them as existing PVCs, so that the patch can be built again on a conflict
+    without creating them twice.
+    """
+    api_volumes = body.get(DATAVOLS_ATTR)
+    if not isinstance(api_volumes, list):
+        return body
+
+    existing_volumes = []
+    for api_volume in api_volumes:
+        pvc = volumes.get_new_pvc(api_volume)
+        if pvc is None:
+            existing_volumes.append(api_volume)
+            continue
+
+        pvc = api.create_pvc(pvc, namespace)
+        existing_volumes.append({
+            volumes.MOUNT: api_volume[volumes.MOUNT],
+            volumes.EXISTING_SOURCE: {
+                volumes.PVC_SOURCE: {"claimName": pvc.metadata.name},
+            },
+        })
+
+    return {**body, DATAVOLS_ATTR: existing_volumes}
+
+
 def _build_volumes_patch(api_volumes, existing_pod_spec, existing_container,
                          namespace, use_delete_directives):
     if api_volumes is None:
@@ -5,7 +5,7 @@ import re
 from flask import request
 from kubeflow.kubeflow.crud_backend import api
 
-from .. import utils
+from .. import index, utils
 from ..services import cloudshell, containers, networking, workloads
 from . import bp
 
@@ -185,7 +185,7 @@ def create_container_port(namespace, name):
                 port=port,
                 domain=domain,
                 per_replica=per_replica,
-                replicas=_desired_replicas(workload),
+                replicas=_desired_replicas(workload.obj),
                 **_gateway_config(),
             )
             return api.success_response("port", created_port)
@@ -230,21 +230,20 @@ def create_container(namespace):
 
 
 def _get_notebook_pod(namespace: str, notebook_name: str, pod_name: str = None):
-    label_selector = "notebook-name=" + notebook_name
-    pods = api.list_pods(namespace=namespace, label_selector=label_selector)
+    pods = index.get_pod_index(namespace).notebook_pods(notebook_name)
     if pod_name:
-        for pod in pods.items:
+        for pod in pods:
             if pod.metadata.name == pod_name:
                 return pod
         return None
-    if pods.items:
-        return pods.items[0]
+    if pods:
+        return pods[0]
     return None
 
 
 def _get_container_pod(namespace: str, name: str):
-    pods = api.list_pods(namespace=namespace, label_selector=f"notebook-name={name}")
-    return pods.items[0] if pods.items else None
+    pods = index.get_pod_index(namespace).notebook_pods(name)
+    return pods[0] if pods else None
 
 
 def _get_port_request_values(body):
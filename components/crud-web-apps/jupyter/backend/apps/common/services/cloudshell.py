@@ -3,7 +3,7 @@
 import time
 from typing import Optional
 
-from kubeflow.kubeflow.crud_backend import logging
+from kubeflow.kubeflow.crud_backend import api, logging
 from kubernetes import client
 
 log = logging.getLogger(__name__)
@@ -16,10 +16,9 @@ def get_cloudshell_name(pod_name: str) -> str:
 def delete_existing_cloudshell(namespace: str, pod_name: str) -> None:
     """Delete any previously created CloudShell for the pod."""
     cloudshell_name = get_cloudshell_name(pod_name)
-    custom_api = client.CustomObjectsApi()
 
     try:
-        custom_api.delete_namespaced_custom_object(
+        api.custom_api.delete_namespaced_custom_object(
             group="cloudshell.cloudtty.io",
             version="v1alpha1",
             namespace=namespace,
@@ -30,7 +29,7 @@ def delete_existing_cloudshell(namespace: str, pod_name: str) -> None:
 
         for _ in range(20):
             try:
-                custom_api.get_namespaced_custom_object(
+                api.custom_api.get_namespaced_custom_object(
                     group="cloudshell.cloudtty.io",
                     version="v1alpha1",
                     namespace=namespace,
@@ -81,7 +80,7 @@ def create_cloudshell(namespace, target_pod, command):
     }
 
     try:
-        result = client.CustomObjectsApi().create_namespaced_custom_object(
+        result = api.custom_api.create_namespaced_custom_object(
             group="cloudshell.cloudtty.io",
             version="v1alpha1",
             namespace=namespace,
@@ -104,9 +103,8 @@ def wait_for_target_service(namespace: str,
                             max_retries: int = 30,
                             sleep_seconds: int = 1) -> Optional[str]:
     """Poll the CloudShell CR until the backing service label is populated."""
-    custom_api = client.CustomObjectsApi()
     for _ in range(max_retries):
-        full_cloudshell = custom_api.get_namespaced_custom_object(
+        full_cloudshell = api.custom_api.get_namespaced_custom_object(
             group="cloudshell.cloudtty.io",
             version="v1alpha1",
             namespace=namespace,
@@ -4,7 +4,7 @@ import hashlib
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional
 
-from kubeflow.kubeflow.crud_backend import api, logging
+from kubeflow.kubeflow.crud_backend import api, logging, retry
 from kubernetes import client
 
 log = logging.getLogger(__name__)
@@ -283,6 +283,36 @@ def patch_node_port_service(namespace: str,
                             protocol: str = "TCP",
                             selector: Optional[Dict[str, str]] = None) -> Dict:
     """Patch the first Service port on a NodePort Service."""
+    result, old_port = retry.read_modify_write(
+        _patch_node_port, namespace, service_name, port, node_port, protocol,
+        selector,
+    )
+
+    selector = result.spec.selector or {}
+    owner_references = result.metadata.owner_references or []
+    pod_name = _pod_name_from_service_name(service_name, old_port)
+    if old_port is not None and old_port != port:
+        _delete_authorization_policy(namespace, "NodePort", pod_name, old_port)
+    _create_authorization_policy(
+        namespace,
+        "NodePort",
+        pod_name,
+        owner_references,
+        selector,
+        port,
+    )
+
+    serialized = _serialize_service_ports(result)
+    return serialized[0] if serialized else {}
+
+
+def _patch_node_port(namespace: str,
+                     service_name: str,
+                     port: int,
+                     node_port: Optional[int],
+                     protocol: str,
+                     selector: Optional[Dict[str, str]]):
+    """Read the Service and replace its ports, return it and its old port."""
     service = api.get_service(namespace=namespace, service_name=service_name)
     if selector and not _selector_matches(service.spec.selector or {}, selector):
         raise ValueError("Service does not belong to the requested workload.")
@@ -305,25 +335,9 @@ def patch_node_port_service(namespace: str,
     result = api.patch_service(
         namespace=namespace,
         service_name=service_name,
-        body=body,
+        body=retry.with_resource_version(body, service),
     )
-
-    selector = result.spec.selector or {}
-    owner_references = result.metadata.owner_references or []
-    pod_name = _pod_name_from_service_name(service_name, old_port)
-    if old_port is not None and old_port != port:
-        _delete_authorization_policy(namespace, "NodePort", pod_name, old_port)
-    _create_authorization_policy(
-        namespace,
-        "NodePort",
-        pod_name,
-        owner_references,
-        selector,
-        port,
-    )
-
-    serialized = _serialize_service_ports(result)
-    return serialized[0] if serialized else {}
+    return result, old_port
 
 
 def delete_node_port_service(namespace: str,
@@ -379,7 +393,7 @@ def _create_authorization_policy(namespace: str,
     }
 
     try:
-        client.CustomObjectsApi().create_namespaced_custom_object(
+        api.custom_api.create_namespaced_custom_object(
             group="security.istio.io",
             version="v1beta1",
             namespace=namespace,
@@ -399,7 +413,7 @@ def _delete_authorization_policy(namespace: str,
                                  port: int) -> None:
     policy_name = f"allow-{service_type}-{pod_name}-{port}".lower()
     try:
-        client.CustomObjectsApi().delete_namespaced_custom_object(
+        api.custom_api.delete_namespaced_custom_object(
             group="security.istio.io",
             version="v1beta1",
             namespace=namespace,
@@ -494,7 +508,7 @@ def create_host_virtual_service(namespace: str,
         },
     }
     try:
-        client.CustomObjectsApi().create_namespaced_custom_object(
+        api.custom_api.create_namespaced_custom_object(
             group="networking.istio.io",
             version="v1beta1",
             namespace=namespace,
@@ -563,7 +577,7 @@ def _ensure_hostnames_available(namespace: str,
                                 gateway: str,
                                 exclude_exposure_id: Optional[str]) -> None:
     try:
-        result = client.CustomObjectsApi().list_cluster_custom_object(
+        result = api.custom_api.list_cluster_custom_object(
             group="networking.istio.io",
             version="v1beta1",
             plural="virtualservices",
@@ -634,8 +648,7 @@ def _ensure_exposure_available(namespace: str,
 
 def _delete_virtual_services_for_exposure(namespace: str,
                                            exposure_id: str) -> None:
-    custom_api = client.CustomObjectsApi()
-    result = custom_api.list_namespaced_custom_object(
+    result = api.custom_api.list_namespaced_custom_object(
         group="networking.istio.io",
         version="v1beta1",
         namespace=namespace,
@@ -645,7 +658,7 @@ def _delete_virtual_services_for_exposure(namespace: str,
         annotations = virtual_service.get("metadata", {}).get("annotations", {})
         if annotations.get(EXPOSURE_ID_ANNOTATION) != exposure_id:
             continue
-        custom_api.delete_namespaced_custom_object(
+        api.custom_api.delete_namespaced_custom_object(
             group="networking.istio.io",
             version="v1beta1",
             namespace=namespace,
@@ -657,10 +670,9 @@ def _delete_virtual_services_for_exposure(namespace: str,
 def _rollback_gateway_resources(namespace: str,
                                 service_names: List[str],
                                 virtual_service_names: List[str]) -> None:
-    custom_api = client.CustomObjectsApi()
     for vs_name in virtual_service_names:
         try:
-            custom_api.delete_namespaced_custom_object(
+            api.custom_api.delete_namespaced_custom_object(
                 group="networking.istio.io", version="v1beta1",
                 namespace=namespace, plural="virtualservices", name=vs_name,
             )
@@ -720,7 +732,7 @@ def create_virtual_service(namespace: str,
     }
 
     try:
-        client.CustomObjectsApi().create_namespaced_custom_object(
+        api.custom_api.create_namespaced_custom_object(
             group="networking.istio.io",
             version="v1beta1",
             namespace=namespace,
@@ -10,7 +10,7 @@ from . import networking
 class GatewayExposureTest(unittest.TestCase):
 
     @mock.patch.object(networking.api, "list_services")
-    @mock.patch.object(networking.client, "CustomObjectsApi")
+    @mock.patch.object(networking.api, "custom_api")
     @mock.patch.object(networking, "list_port_exposures")
     @mock.patch.object(networking, "create_host_virtual_service")
     @mock.patch.object(networking, "create_service")
@@ -18,7 +18,7 @@ class GatewayExposureTest(unittest.TestCase):
             self, create_service, create_vs, list_exposures, custom_api,
             list_services):
         list_services.return_value = SimpleNamespace(items=[])
-        custom_api.return_value.list_cluster_custom_object.return_value = {
+        custom_api.list_cluster_custom_object.return_value = {
             "items": []
         }
         create_service.return_value = networking.ServiceHandle("service")
@@ -48,7 +48,7 @@ class GatewayExposureTest(unittest.TestCase):
         )
 
     @mock.patch.object(networking.api, "list_services")
-    @mock.patch.object(networking.client, "CustomObjectsApi")
+    @mock.patch.object(networking.api, "custom_api")
     @mock.patch.object(networking, "list_port_exposures")
     @mock.patch.object(networking, "create_host_virtual_service")
     @mock.patch.object(networking, "create_service")
@@ -56,7 +56,7 @@ class GatewayExposureTest(unittest.TestCase):
             self, create_service, create_vs, list_exposures, custom_api,
             list_services):
         list_services.return_value = SimpleNamespace(items=[])
-        custom_api.return_value.list_cluster_custom_object.return_value = {
+        custom_api.list_cluster_custom_object.return_value = {
             "items": []
         }
         create_service.return_value = networking.ServiceHandle("service")
@@ -90,9 +90,9 @@ class GatewayExposureTest(unittest.TestCase):
             "abc-1.knu-kubeflow.duckdns.org",
         ])
 
-    @mock.patch.object(networking.client, "CustomObjectsApi")
+    @mock.patch.object(networking.api, "custom_api")
     def test_rejects_an_existing_hostname(self, custom_api):
-        custom_api.return_value.list_cluster_custom_object.return_value = {
+        custom_api.list_cluster_custom_object.return_value = {
             "items": [{
                 "metadata": {},
                 "spec": {
@@ -110,10 +110,10 @@ class GatewayExposureTest(unittest.TestCase):
                 None,
             )
 
-    @mock.patch.object(networking.client, "CustomObjectsApi")
+    @mock.patch.object(networking.api, "custom_api")
     def test_same_exposure_id_in_another_namespace_is_not_excluded(
             self, custom_api):
-        custom_api.return_value.list_cluster_custom_object.return_value = {
+        custom_api.list_cluster_custom_object.return_value = {
             "items": [{
                 "metadata": {
                     "namespace": "team-b",
@@ -136,9 +136,9 @@ class GatewayExposureTest(unittest.TestCase):
                 "gateway-demo-8000",
             )
 
-    @mock.patch.object(networking.client, "CustomObjectsApi")
+    @mock.patch.object(networking.api, "custom_api")
     def test_current_exposure_in_same_namespace_is_excluded(self, custom_api):
-        custom_api.return_value.list_cluster_custom_object.return_value = {
+        custom_api.list_cluster_custom_object.return_value = {
             "items": [{
                 "metadata": {
                     "namespace": "team-a",
@@ -160,10 +160,10 @@ class GatewayExposureTest(unittest.TestCase):
             "gateway-demo-8000",
         )
 
-    @mock.patch.object(networking.client, "CustomObjectsApi")
+    @mock.patch.object(networking.api, "custom_api")
     def test_unrelated_wildcard_virtual_service_does_not_block_domain(
             self, custom_api):
-        custom_api.return_value.list_cluster_custom_object.return_value = {
+        custom_api.list_cluster_custom_object.return_value = {
             "items": [{
                 "metadata": {"namespace": "platform"},
                 "spec": {
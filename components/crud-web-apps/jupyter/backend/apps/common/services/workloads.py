@@ -1,94 +1,93 @@
 """Compatibility helpers for custom-container workloads."""
 
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Any, List, Optional
 
 from kubeflow.kubeflow.crud_backend import api
 from kubernetes import client
+from kubernetes.client.rest import ApiException
 
 
-def list_container_workloads(namespace: str) -> List:
+@dataclass
+class ContainerWorkload:
+    """
+    A custom-container StatefulSet, or legacy Deployment, and its kind. The
+    object might be shared with the cache, and the list items don't have a
+    kind, so the kind is kept next to the object instead of being set on it.
+    """
+
+    obj: Any
+    kind: str
+
+
+def list_container_workloads(namespace: str) -> List[ContainerWorkload]:
     """List StatefulSets and legacy Deployments, preferring StatefulSets."""
     statefulsets = []
     for item in api.list_statefulsets(namespace=namespace).items:
         if not _is_custom_container(item):
             continue
-        _set_workload_kind(item, "StatefulSet")
-        statefulsets.append(item)
-    statefulset_names = {item.metadata.name for item in statefulsets}
+        statefulsets.append(ContainerWorkload(item, "StatefulSet"))
+    statefulset_names = {w.obj.metadata.name for w in statefulsets}
     deployments = []
     for item in api.list_deployments(namespace=namespace).items:
         if not _is_custom_container(item):
             continue
         if item.metadata.name in statefulset_names:
             continue
-        _set_workload_kind(item, "Deployment")
-        deployments.append(item)
+        deployments.append(ContainerWorkload(item, "Deployment"))
     return statefulsets + deployments
 
 
-def get_container_workload(namespace: str, name: str) -> Optional[object]:
-    return next(
-        (item for item in list_container_workloads(namespace)
-         if item.metadata.name == name),
-        None,
-    )
+def get_container_workload(namespace: str,
+                           name: str) -> Optional[ContainerWorkload]:
+    """Read a StatefulSet by name, falling back to a legacy Deployment."""
+    readers = [
+        ("StatefulSet", api.get_statefulset),
+        ("Deployment", api.get_deployment),
+    ]
+    for kind, read in readers:
+        try:
+            item = read(name, namespace)
+        except ApiException as exc:
+            if exc.status == 404:
+                continue
+            raise
+        if not _is_custom_container(item):
+            continue
+        return ContainerWorkload(item, kind)
+    return None
 
 
-def patch_container_workload(namespace: str, name: str, body, workload=None):
+def patch_container_workload(namespace: str, name: str, body,
+                             workload=None) -> Optional[ContainerWorkload]:
     workload = workload or get_container_workload(namespace, name)
     if workload is None:
         return None
-    if workload_kind(workload) == "StatefulSet":
-        return api.patch_statefulset(name=name, namespace=namespace, body=body)
-    return api.patch_deployment(name=name, namespace=namespace, body=body)
+    if workload.kind == "StatefulSet":
+        item = api.patch_statefulset(name=name, namespace=namespace, body=body)
+    else:
+        item = api.patch_deployment(name=name, namespace=namespace, body=body)
+    return ContainerWorkload(item, workload.kind)
 
 
 def delete_container_workload(namespace: str, name: str, workload=None):
     workload = workload or get_container_workload(namespace, name)
     if workload is None:
         return None
-    if workload_kind(workload) == "StatefulSet":
+    if workload.kind == "StatefulSet":
         return api.delete_statefulset(name=name, namespace=namespace)
     return api.delete_deployment(name=name, namespace=namespace)
 
 
-def owner_reference(workload):
-    kind = workload_kind(workload)
+def owner_reference(workload: ContainerWorkload):
     return client.V1OwnerReference(
-        api_version=workload.api_version or "apps/v1",
-        kind=kind,
-        name=workload.metadata.name,
-        uid=workload.metadata.uid,
+        api_version=workload.obj.api_version or "apps/v1",
+        kind=workload.kind,
+        name=workload.obj.metadata.name,
+        uid=workload.obj.metadata.uid,
     )
 
 
 def _is_custom_container(workload) -> bool:
     labels = workload.metadata.labels or {}
     return labels.get("container-type") == "custom-container"
-
-
-def workload_kind(workload) -> str:
-    """Return the concrete apps/v1 workload kind for a typed API object."""
-    recorded_kind = getattr(workload, "_kubeflow_workload_kind", None)
-    if recorded_kind in ("StatefulSet", "Deployment"):
-        return recorded_kind
-    kind = getattr(workload, "kind", None)
-    if kind in ("StatefulSet", "Deployment"):
-        return kind
-    if isinstance(workload, client.V1StatefulSet):
-        return "StatefulSet"
-    if isinstance(workload, client.V1Deployment):
-        return "Deployment"
-    raise ValueError("Unsupported container workload type.")
-
-
-def _set_workload_kind(workload, kind: str) -> None:
-    if getattr(workload, "kind", None) is None:
-        try:
-            workload.kind = kind
-        except (AttributeError, TypeError):
-            pass
-    try:
-        setattr(workload, "_kubeflow_workload_kind", kind)
-    except (AttributeError, TypeError):
-        pass
@@ -4,6 +4,8 @@ import unittest
 from types import SimpleNamespace
 from unittest import mock
 
+from kubernetes.client.rest import ApiException
+
 from . import workloads
 
 
@@ -38,7 +40,7 @@ class ContainerWorkloadsTest(unittest.TestCase):
         result = workloads.list_container_workloads("team-a")
 
         self.assertEqual(
-            [(item.metadata.name, item.kind) for item in result],
+            [(item.obj.metadata.name, item.kind) for item in result],
             [
                 ("new", "StatefulSet"),
                 ("same", "StatefulSet"),
@@ -50,8 +52,12 @@ class ContainerWorkloadsTest(unittest.TestCase):
     @mock.patch.object(workloads.api, "patch_statefulset")
     def test_patches_the_actual_workload_kind(
             self, patch_statefulset, patch_deployment):
-        statefulset = _workload("new", "StatefulSet")
-        deployment = _workload("legacy", "Deployment")
+        statefulset = workloads.ContainerWorkload(
+            _workload("new", None), "StatefulSet"
+        )
+        deployment = workloads.ContainerWorkload(
+            _workload("legacy", None), "Deployment"
+        )
 
         workloads.patch_container_workload(
             "team-a", "new", {"spec": {"replicas": 2}}, statefulset
@@ -65,7 +71,9 @@ class ContainerWorkloadsTest(unittest.TestCase):
 
     def test_owner_reference_preserves_workload_kind(self):
         reference = workloads.owner_reference(
-            _workload("new", "StatefulSet")
+            workloads.ContainerWorkload(
+                _workload("new", "StatefulSet"), "StatefulSet"
+            )
         )
 
         self.assertEqual(reference.kind, "StatefulSet")
@@ -82,15 +90,62 @@ class ContainerWorkloadsTest(unittest.TestCase):
 
         result = workloads.list_container_workloads("team-a")
 
-        self.assertEqual(workloads.workload_kind(result[0]), "StatefulSet")
-        self.assertEqual(workloads.workload_kind(result[1]), "Deployment")
+        self.assertEqual(result[0].kind, "StatefulSet")
+        self.assertEqual(result[1].kind, "Deployment")
+        # The items might be shared with the cache, and are not modified
+        self.assertIsNone(statefulset.kind)
+        self.assertIsNone(deployment.kind)
+
+    @mock.patch.object(workloads.api, "get_deployment")
+    @mock.patch.object(workloads.api, "get_statefulset")
+    def test_gets_legacy_deployment_when_statefulset_is_missing(
+            self, get_statefulset, get_deployment):
+        get_statefulset.side_effect = ApiException(status=404)
+        get_deployment.return_value = _workload("legacy", None)
+
+        result = workloads.get_container_workload("team-a", "legacy")
+
+        get_deployment.assert_called_once_with("legacy", "team-a")
+        self.assertEqual(result.kind, "Deployment")
+
+    @mock.patch.object(workloads.api, "get_deployment")
+    @mock.patch.object(workloads.api, "get_statefulset")
+    def test_gets_the_kind_of_read_only_views(
+            self, get_statefulset, get_deployment):
+        get_statefulset.return_value = workloads.api.view({
+            "metadata": {
+                "name": "new",
+                "uid": "new-uid",
+                "labels": {"container-type": "custom-container"},
+            },
+        }, "V1StatefulSet")
+
+        result = workloads.get_container_workload("team-a", "new")
+
+        get_deployment.assert_not_called()
+        self.assertEqual(result.kind, "StatefulSet")
+        self.assertEqual(
+            workloads.owner_reference(result).kind, "StatefulSet"
+        )
+
+    @mock.patch.object(workloads.api, "get_deployment")
+    @mock.patch.object(workloads.api, "get_statefulset")
+    def test_get_ignores_workloads_that_are_not_custom_containers(
+            self, get_statefulset, get_deployment):
+        get_statefulset.return_value = _workload(
+            "other", "StatefulSet", custom=False
+        )
+        get_deployment.side_effect = ApiException(status=404)
+
+        self.assertIsNone(workloads.get_container_workload("team-a", "other"))
 
     @mock.patch.object(workloads.api, "delete_deployment")
     @mock.patch.object(workloads.api, "delete_statefulset")
     def test_deletes_kindless_statefulset_using_recorded_kind(
             self, delete_statefulset, delete_deployment):
-        statefulset = _workload("new", None)
-        workloads._set_workload_kind(statefulset, "StatefulSet")
+        statefulset = workloads.ContainerWorkload(
+            _workload("new", None), "StatefulSet"
+        )
 
         workloads.delete_container_workload(
             "team-a", "new", workload=statefulset
@@ -102,12 +157,14 @@ class ContainerWorkloadsTest(unittest.TestCase):
         delete_deployment.assert_not_called()
 
     def test_kindless_statefulset_owner_reference_uses_recorded_kind(self):
-        statefulset = _workload("new", None)
-        workloads._set_workload_kind(statefulset, "StatefulSet")
+        statefulset = workloads.ContainerWorkload(
+            _workload("new", None), "StatefulSet"
+        )
 
         reference = workloads.owner_reference(statefulset)
 
         self.assertEqual(reference.kind, "StatefulSet")
 
+
 if __name__ == "__main__":
     unittest.main()
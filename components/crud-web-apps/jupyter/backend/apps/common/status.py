@@ -34,10 +34,14 @@ IMAGE_PULL_MESSAGE_TOKENS = {
 }
 
 
-def process_status(notebook):
+def process_status(notebook, events_index=None):
     """
     Return status and reason. Status may be:
     [ready|waiting|warning|terminating|stopped]
+
+    events_index: A NotebookEventsIndex for the Notebook's namespace. If it
+                  is not provided, the events of the Notebook will be
+                  requested from the API Server.
     """
     # In case the Notebook has no status
     status_phase, status_message = get_empty_status(notebook)
@@ -73,7 +77,7 @@ def process_status(notebook):
 
     # Try to extract information about why the notebook is not starting
     # from the notebook's events (see find_error_event)
-    notebook_events = get_notebook_events(notebook)
+    notebook_events = get_notebook_events(notebook, events_index)
     status_event, reason_event = get_status_from_events(notebook_events)
     if status_event is not None:
         status_phase, status_message = status_event, reason_event
@@ -236,7 +240,36 @@ def get_status_from_conditions(notebook):
     return None, None
 
 
-def get_notebook_events(notebook):
+class NotebookEventsIndex(object):
+    """
+    The events of all the Notebooks in a namespace, indexed by the name of
+    the involved Notebook. The events are requested once, the first time the
+    events of a Notebook are needed, instead of once per Notebook, and they
+    are read one page at a time.
+    """
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self._events = None
+
+    def get(self, name, uid=None):
+        if self._events is None:
+            self._events = {}
+            events = api.iter_notebooks_events(self.namespace)
+            for event in (api.view(e, "CoreV1Event") for e in events):
+                involved_object = event.involved_object
+                self._events.setdefault(involved_object.name, []).append(
+                    event
+                )
+
+        return [
+            event for event in self._events.get(name, [])
+            if not uid or not event.involved_object.uid
+            or event.involved_object.uid == uid  # noqa: W503
+        ]
+
+
+def get_notebook_events(notebook, events_index=None):
     name = notebook["metadata"]["name"]
     namespace = notebook["metadata"]["namespace"]
 
@@ -244,7 +277,12 @@ def get_notebook_events(notebook):
         notebook["metadata"]["creationTimestamp"], "%Y-%m-%dT%H:%M:%SZ"
     )
 
-    nb_events = api.list_notebook_events(name, namespace).items
+    if events_index is not None:
+        nb_events = events_index.get(name, notebook["metadata"].get("uid"))
+    else:
+        nb_events = views_of_events(
+            api.list_notebook_events(name, namespace, raw=True)
+        )
     # User can delete and then create a nb server with the same name
     # Make sure previous events are not taken into account
     nb_events = filter(
@@ -286,6 +324,12 @@ def event_timestamp(event):
     return event.metadata.creation_timestamp.replace(tzinfo=None)
 
 
+def views_of_events(events):
+    """Return ModelViews of the items of a raw CoreV1EventList."""
+    return [api.view(event, "CoreV1Event")
+            for event in events.get("items") or []]
+
+
 def get_container_restarting_status(deployment, pod):
     desired_replicas = int(deployment.spec.replicas or 0)
     if desired_replicas == 0:
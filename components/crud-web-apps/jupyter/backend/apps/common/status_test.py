@@ -1,5 +1,6 @@
 import unittest
 from types import SimpleNamespace
+from unittest import mock
 
 from apps.common import status
 
@@ -124,6 +125,60 @@ class TestStatusFromEvents(unittest.TestCase):
         )
 
 
+def _notebook_event(name, uid, reason="FailedScheduling"):
+    return {
+        "type": "Warning",
+        "reason": reason,
+        "message": "%s: 0/1 nodes are available." % name,
+        "involvedObject": {"name": name, "uid": uid},
+        "metadata": {"creationTimestamp": "2026-01-01T00:01:00Z"},
+    }
+
+
+def _pending_notebook(name, uid):
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": "team-a",
+            "uid": uid,
+            "creationTimestamp": "2026-01-01T00:00:00Z",
+        },
+        "status": {
+            "conditions": [],
+            "containerState": {},
+            "readyReplicas": 0,
+        },
+    }
+
+
+class TestNotebookEventsIndex(unittest.TestCase):
+    @mock.patch.object(status.api, "iter_notebooks_events")
+    def test_events_are_requested_once_per_namespace(self, list_events):
+        list_events.return_value = iter([
+            _notebook_event("nb", "uid-1"),
+            _notebook_event("nb2", "uid-2"),
+            _notebook_event("nb", "old-uid", reason="Killing"),
+        ])
+        events_index = status.NotebookEventsIndex("team-a")
+
+        statuses = [
+            status.process_status(_pending_notebook(name, uid), events_index)
+            for name, uid in [("nb", "uid-1"), ("nb2", "uid-2"),
+                              ("nb3", "uid-3")]
+        ]
+
+        list_events.assert_called_once_with("team-a")
+        self.assertEqual(
+            [s["message"] for s in statuses],
+            [
+                "nb: 0/1 nodes are available.",
+                "nb2: 0/1 nodes are available.",
+                "Couldn't find any information for the status of this"
+                " notebook.",
+            ],
+        )
+
+
 class TestContainerRestartingStatus(unittest.TestCase):
     def test_rollout_in_progress_marks_container_waiting(self):
         deployment = SimpleNamespace(
@@ -129,7 +129,7 @@ def get_notebook_last_activity(notebook):
     return annotations.get(LAST_ACTIVITY_ANNOTATION, "")
 
 
-def notebook_dict_from_k8s_obj(notebook, pods):
+def notebook_dict_from_k8s_obj(notebook, pod_index, events_index=None):
     cntr = notebook["spec"]["template"]["spec"]["containers"][0]
     server_type = None
     owner = None
@@ -139,12 +139,7 @@ def notebook_dict_from_k8s_obj(notebook, pods):
         server_type = annotations.get("notebooks.kubeflow.org/server-type")
         owner = annotations.get("notebooks.kubeflow.org/creator")
 
-    nb_name = notebook["metadata"]["name"]
-    nb_namespace = notebook["metadata"]["namespace"]
-    matching_pods = [
-        pod for pod in pods.items
-        if pod.metadata.name.startswith(nb_name) and pod.metadata.namespace == nb_namespace
-    ]
+    matching_pods = pod_index.notebook_pods(notebook["metadata"]["name"])
     if matching_pods:
         ip = matching_pods[0].status.pod_ip
 
@@ -162,7 +157,7 @@ def notebook_dict_from_k8s_obj(notebook, pods):
         "gpus": process_gpus(cntr),
         "memory": cntr["resources"]["requests"]["memory"],
         "volumes": [v["name"] for v in cntr["volumeMounts"]],
-        "status": status.process_status(notebook),
+        "status": status.process_status(notebook, events_index),
         "metadata": notebook["metadata"],
     }
 
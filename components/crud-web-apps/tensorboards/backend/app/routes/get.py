@@ -1,4 +1,5 @@
-from kubeflow.kubeflow.crud_backend import api, logging
+from kubeflow.kubeflow.crud_backend import (aggregation, api, deadlines,
+                                            logging, snapshots, sse)
 
 from .. import utils
 from . import bp
@@ -9,15 +10,48 @@ log = logging.getLogger(__name__)
 @bp.route("/api/namespaces/<namespace>/tensorboards")
 def get_tensorboards(namespace):
 
-    tensorboards = api.list_custom_rsrc(
-        "tensorboard.kubeflow.org", "v1alpha1", "tensorboards", namespace
-    )
+    tensorboards = list_tensorboards(namespace)
     content = [
         utils.parse_tensorboard(tensorboard)
         for tensorboard in tensorboards["items"]
     ]
 
-    return api.success_response("tensorboards", content)
+    return snapshots.list_response(
+        "tensorboards", content, ("tensorboards", namespace),
+        lambda tensorboard: tensorboard["name"],
+        etag=api.resource_versions_etag(tensorboards),
+    )
+
+
+@bp.route("/api/tensorboards")
+@deadlines.route_class(deadlines.AGGREGATE)
+def get_all_namespaces_tensorboards():
+    return aggregation.list_response(
+        "tensorboards",
+        ("tensorboard.kubeflow.org", "v1alpha1", "tensorboards"),
+        list_tensorboard_items, lambda tensorboard: tensorboard["name"],
+    )
+
+
+@bp.route("/api/watch/namespaces/<namespace>/tensorboards")
+def watch_tensorboards(namespace):
+    return sse.event_stream(
+        namespace, ("tensorboards", namespace),
+        lambda: list_tensorboard_items(namespace),
+        lambda tensorboard: tensorboard["name"],
+    )
+
+
+def list_tensorboards(namespace):
+    return api.list_custom_rsrc(
+        "tensorboard.kubeflow.org", "v1alpha1", "tensorboards", namespace
+    )
+
+
+def list_tensorboard_items(namespace):
+    """Return the Tensorboards as the UI shows them."""
+    return [utils.parse_tensorboard(tensorboard)
+            for tensorboard in list_tensorboards(namespace)["items"]]
 
 
 @bp.route("/api/namespaces/<namespace>/pvcs")
@@ -12,13 +12,14 @@ def pvc_status(pvc):
     if pvc.status.phase == "Bound":
         return status.create_status(status.STATUS_PHASE.READY, "Bound")
 
-    # The PVC is in Pending state, we check the Events to find out why
-    evs = api.v1_core.list_namespaced_event(
-        namespace=pvc.metadata.namespace,
-        field_selector=api.events_field_selector(
-            "PersistentVolumeClaim", pvc.metadata.name
-        ),
-    ).items
+    # The PVC is in Pending state, we check the Events to find out why.
+    # The user might not be allowed to list the Events, so they are read
+    # with the ServiceAccount of the app
+    evs = [
+        api.view(ev, "CoreV1Event") for ev in api.list_pvc_events(
+            pvc.metadata.namespace, pvc.metadata.name, raw=True, auth=False
+        )["items"]
+    ]
 
     # If there are no events, then the PVC was just created
     if len(evs) == 0:
@@ -1,4 +1,6 @@
-from kubeflow.kubeflow.crud_backend import api, logging
+from kubeflow.kubeflow.crud_backend import (aggregation, api, concurrency,
+                                            deadlines, logging, pagination,
+                                            snapshots, sse)
 
 from ...common import utils, status, viewer as viewer_utils
 from . import bp
@@ -8,10 +10,37 @@ log = logging.getLogger(__name__)
 
 @bp.route("/api/namespaces/<namespace>/pvcs")
 def get_pvcs(namespace):
-    # Return the list of PVCs
-    pvcs = api.list_pvcs(namespace)
-    notebooks = api.list_notebooks(namespace)["items"]
-    deployments = api.list_deployments(namespace).items
+    content = list_pvc_items(namespace)
+
+    return snapshots.list_response("pvcs", content, ("pvcs", namespace),
+                                   lambda pvc: pvc["name"])
+
+
+@bp.route("/api/watch/namespaces/<namespace>/pvcs")
+def watch_pvcs(namespace):
+    return sse.event_stream(
+        namespace, ("pvcs", namespace),
+        lambda: list_pvc_items(namespace), lambda pvc: pvc["name"],
+    )
+
+
+@bp.route("/api/pvcs")
+@deadlines.route_class(deadlines.AGGREGATE)
+def get_all_namespaces_pvcs():
+    return aggregation.list_response(
+        "pvcs", ("", "v1", "persistentvolumeclaims"), list_pvc_items,
+        lambda pvc: pvc["name"],
+    )
+
+
+def list_pvc_items(namespace):
+    """Return the PVCs, with their viewers, as the UI shows them."""
+    pvcs, notebooks, deployments, viewers = concurrency.gather(
+        lambda: api.list_pvcs(namespace),
+        lambda: api.list_notebooks(namespace)["items"],
+        lambda: api.list_deployments(namespace).items,
+        lambda: api.list_custom_rsrc(*viewer_utils.VIEWER, namespace)["items"],
+    )
     containers = [
         dep for dep in deployments
         if (dep.metadata.labels or {}).get("container-type") == "custom-container"
@@ -19,10 +48,7 @@ def get_pvcs(namespace):
     content = [utils.parse_pvc(pvc, notebooks, containers) for pvc in pvcs.items]
 
     # Mix-in the viewer status to the response
-    viewers = {
-        v["metadata"]["name"]: v for v in
-        api.list_custom_rsrc(*viewer_utils.VIEWER, namespace)["items"]
-    }
+    viewers = {v["metadata"]["name"]: v for v in viewers}
 
     for pvc in content:
         viewer = viewers.get(pvc["name"], {})
@@ -31,13 +57,13 @@ def get_pvcs(namespace):
             "url": viewer.get("status", {}).get("url", None)
         }
 
-    return api.success_response("pvcs", content)
+    return content
 
 
 @bp.route("/api/namespaces/<namespace>/pvcs/<pvc_name>")
 def get_pvc(namespace, pvc_name):
-    pvc = api.get_pvc(pvc_name, namespace)
-    return api.success_response("pvc", api.serialize(pvc))
+    pvc = api.get_pvc(pvc_name, namespace, raw=True)
+    return api.success_response("pvc", pvc)
 
 
 @bp.route("/api/namespaces/<namespace>/pvcs/<pvc_name>/pods")
@@ -49,6 +75,8 @@ def get_pvc_pods(namespace, pvc_name):
 
 @bp.route("/api/namespaces/<namespace>/pvcs/<pvc_name>/events")
 def get_pvc_events(namespace, pvc_name):
-    events = api.list_pvc_events(namespace, pvc_name).items
+    limit, token = pagination.get_page_params()
+    events = api.list_pvc_events(namespace, pvc_name, raw=True, limit=limit,
+                                 continue_token=token)
 
-    return api.success_response("events", api.serialize(events))
+    return pagination.raw_list_response("events", events)